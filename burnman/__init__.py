@@ -63,6 +63,7 @@ from .version import version as __version__
 from .mineral import Mineral
 from .material import Material
 from .perplex import PerplexMaterial
+from .tabulated import TabulatedMaterial
 from .composite import Composite
 from .solutionmodel import SolutionModel
 from .solidsolution import SolidSolution
@@ -72,6 +73,8 @@ from .mineral_helpers import *
 # high level functions
 from .main import *
 from .model import Model
+from .parallel import ParallelEvaluator
+from .gibbs_minimization import GibbsMinimizer, EquilibriumAssemblage
 
 # mineral library
 from . import minerals
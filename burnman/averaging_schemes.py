@@ -18,8 +18,16 @@ class AveragingScheme(object):
     New averaging schemes should define the functions
     average_bulk_moduli and average_shear_moduli, as
     specified here.
+
+    The averaging schemes in this module also accept 2D arrays
+    of shape (n_points, n_phases), in which case they return
+    an array with the averages at each of the n_points states,
+    and are flagged as vectorized. New averaging schemes which
+    also do this should set vectorized to True.
     """
 
+    vectorized = False
+
     def average_bulk_moduli(self, volumes, bulk_moduli, shear_moduli):
         """
         Average the bulk moduli :math:`K` for a composite. This defines the interface
@@ -86,17 +94,49 @@ class AveragingScheme(object):
         rho : float
            Density :math:`\\rho`. :math:`[kg/m^3]`
         """
-        total_mass = np.sum(np.array(densities) * np.array(volumes))
-        total_vol = np.sum(np.array(volumes))  # should sum to one
+        total_mass = (np.array(densities) * np.array(volumes)).sum(axis=-1)
+        total_vol = np.array(volumes).sum(axis=-1)  # should sum to one
         density = total_mass / total_vol
         return density
 
+    def average_elastic_properties(self, volumes, bulk_moduli, shear_moduli, densities):
+        """
+        Average the bulk moduli, shear moduli and densities of a composite
+        in one call. This is implemented in the base class using
+        :func:`average_bulk_moduli`, :func:`average_shear_moduli` and
+        :func:`average_density`, and may be overridden by averaging schemes
+        which can share work between the averages.
+
+        Parameters
+        ----------
+        volumes : list of floats
+            List of the volume of each phase in the composite. :math:`[m^3]`
+        bulk_moduli : list of floats
+            List of bulk moduli of each phase in the composite. :math:`[Pa]`
+        shear_moduli : list of floats
+            List of shear moduli of each phase in the composite. :math:`[Pa]`
+        densities : list of floats
+            List of densities of each phase in the composite. :math:`[kg/m^3]`
+
+        Returns
+        -------
+        K : float
+            The average bulk modulus :math:`K`. :math:`[Pa]`
+        G : float
+            The average shear modulus :math:`G`. :math:`[Pa]`
+        rho : float
+           Density :math:`\\rho`. :math:`[kg/m^3]`
+        """
+        return (self.average_bulk_moduli(volumes, bulk_moduli, shear_moduli),
+                self.average_shear_moduli(volumes, bulk_moduli, shear_moduli),
+                self.average_density(volumes, densities))
+
     def average_thermal_expansivity(self, volumes, alphas):
         """
         thermal expansion coefficient of the mineral :math:`\\alpha`. :math:`[1/K]`
         """
-        total_vol = np.sum(np.array(volumes))
-        return np.sum(np.array(alphas) * np.array(volumes)) / total_vol
+        total_vol = np.array(volumes).sum(axis=-1)
+        return (np.array(alphas) * np.array(volumes)).sum(axis=-1) / total_vol
 
     def average_heat_capacity_v(self, fractions, c_v):
         # TODO: double-check that the formula we use is appropriate here.
@@ -118,7 +158,7 @@ class AveragingScheme(object):
         c_v : float
           heat capacity at constant volume of the composite :math:`C_V`. :math:`[J/K/mol]`
         """
-        return np.sum(np.array(fractions) * np.array(c_v))
+        return (np.array(fractions) * np.array(c_v)).sum(axis=-1)
 
     def average_heat_capacity_p(self, fractions, c_p):
         # TODO: double-check that the formula we use is correct.
@@ -137,7 +177,7 @@ class AveragingScheme(object):
         c_p : float
           heat capacity at constant pressure :math:`C_P` of the composite. :math:`[J/K/mol]`
         """
-        return np.sum(np.array(fractions) * np.array(c_p))
+        return (np.array(fractions) * np.array(c_p)).sum(axis=-1)
 
 
 class VoigtReussHill(AveragingScheme):
@@ -149,6 +189,8 @@ class VoigtReussHill(AveragingScheme):
     :func:`burnman.averaging_schemes.averaging_scheme.average_shear_moduli` functions.
     """
 
+    vectorized = True
+
     def average_bulk_moduli(self, volumes, bulk_moduli, shear_moduli):
         """
         Average the bulk moduli of a composite with the Voigt-Reuss-Hill average, given by:
@@ -215,6 +257,8 @@ class Voigt(AveragingScheme):
     :func:`burnman.averaging_schemes.averaging_scheme.average_shear_moduli` functions.
     """
 
+    vectorized = True
+
     def average_bulk_moduli(self, volumes, bulk_moduli, shear_moduli):
         """
         Average the bulk moduli of a composite :math:`K` with the Voigt (iso-strain)
@@ -277,6 +321,8 @@ class Reuss(AveragingScheme):
     :func:`burnman.averaging_schemes.averaging_scheme.average_shear_moduli` functions.
     """
 
+    vectorized = True
+
     def average_bulk_moduli(self, volumes, bulk_moduli, shear_moduli):
         """
         Average the bulk moduli of a composite with the Reuss (iso-stress)
@@ -344,6 +390,8 @@ class HashinShtrikmanUpper(AveragingScheme):
     may not be.
     """
 
+    vectorized = True
+
     def average_bulk_moduli(self, volumes, bulk_moduli, shear_moduli):
         """
         Average the bulk moduli of a composite with the upper Hashin-Shtrikman bound.
@@ -364,20 +412,7 @@ class HashinShtrikmanUpper(AveragingScheme):
         K : float
             The upper Hashin-Shtrikman average bulk modulus :math:`K`. :math:`[Pa]`
         """
-
-        K_n = max(bulk_moduli)
-        G_n = max(shear_moduli)
-
-        vol_frac = volumes / sum(volumes)
-
-        alpha_n = -3. / (3. * K_n + 4. * G_n)
-        A_n = 0
-        for i in range(len(vol_frac)):
-            if bulk_moduli[i] != K_n:
-                A_n += vol_frac[i] / (1. / (bulk_moduli[i] - K_n) - alpha_n)
-
-        K_upper = K_n + A_n / (1. + alpha_n * A_n)
-        return K_upper
+        return hashin_shtrikman_bulk_function(volumes, bulk_moduli, shear_moduli, np.max)
 
     def average_shear_moduli(self, volumes, bulk_moduli, shear_moduli):
         """
@@ -399,21 +434,7 @@ class HashinShtrikmanUpper(AveragingScheme):
         G : float
             The upper Hashin-Shtrikman average shear modulus :math:`G`. :math:`[Pa]`
         """
-
-        K_n = max(bulk_moduli)
-        G_n = max(shear_moduli)
-
-        vol_frac = volumes / sum(volumes)
-
-        beta_n = -3. * (K_n + 2. * G_n) / (5. * G_n * (3. * K_n + 4. * G_n))
-        B_n = 0
-        for i in range(len(vol_frac)):
-            if shear_moduli[i] != G_n:
-                B_n += vol_frac[i] / (
-                    1. / (2. * (shear_moduli[i] - G_n)) - beta_n)
-
-        G_upper = G_n + (0.5) * B_n / (1. + beta_n * B_n)
-        return G_upper
+        return hashin_shtrikman_shear_function(volumes, bulk_moduli, shear_moduli, np.max)
 
 
 class HashinShtrikmanLower(AveragingScheme):
@@ -430,6 +451,8 @@ class HashinShtrikmanLower(AveragingScheme):
     may not be.
     """
 
+    vectorized = True
+
     def average_bulk_moduli(self, volumes, bulk_moduli, shear_moduli):
         """
         Average the bulk moduli of a composite with the lower Hashin-Shtrikman bound.
@@ -450,20 +473,7 @@ class HashinShtrikmanLower(AveragingScheme):
         K : float
             The lower Hashin-Shtrikman average bulk modulus :math:`K`. :math:`[Pa]`
         """
-
-        K_1 = min(bulk_moduli)
-        G_1 = min(shear_moduli)
-
-        vol_frac = volumes / sum(volumes)
-
-        alpha_1 = -3. / (3. * K_1 + 4. * G_1)
-        A_1 = 0
-        for i in range(len(vol_frac)):
-            if bulk_moduli[i] != K_1:
-                A_1 += vol_frac[i] / (1. / (bulk_moduli[i] - K_1) - alpha_1)
-
-        K_lower = K_1 + A_1 / (1. + alpha_1 * A_1)
-        return K_lower
+        return hashin_shtrikman_bulk_function(volumes, bulk_moduli, shear_moduli, np.min)
 
     def average_shear_moduli(self, volumes, bulk_moduli, shear_moduli):
         """
@@ -485,21 +495,7 @@ class HashinShtrikmanLower(AveragingScheme):
         G : float
             The lower Hashin-Shtrikman average shear modulus :math:`G`. :math:`[Pa]`
         """
-
-        K_1 = min(bulk_moduli)
-        G_1 = min(shear_moduli)
-
-        vol_frac = volumes / sum(volumes)
-
-        beta_1 = -3. * (K_1 + 2. * G_1) / (5. * G_1 * (3. * K_1 + 4. * G_1))
-        B_1 = 0
-        for i in range(len(vol_frac)):
-            if shear_moduli[i] != G_1:
-                B_1 += vol_frac[i] / (
-                    1. / (2. * (shear_moduli[i] - G_1)) - beta_1)
-
-        G_lower = G_1 + (0.5) * B_1 / (1. + beta_1 * B_1)
-        return G_lower
+        return hashin_shtrikman_shear_function(volumes, bulk_moduli, shear_moduli, np.min)
 
 
 class HashinShtrikmanAverage(AveragingScheme):
@@ -511,6 +507,8 @@ class HashinShtrikmanAverage(AveragingScheme):
     and :func:`burnman.averaging_schemes.averaging_scheme.average_shear_moduli` functions.
     """
 
+    vectorized = True
+
     def __init__(self):
         self.upper = HashinShtrikmanUpper()
         self.lower = HashinShtrikmanLower()
@@ -571,8 +569,8 @@ def voigt_average_function(phase_volume, X):
     voigt_reuss_hill classes, takes a list of
     volumes and moduli, returns a modulus.
     """
-    vol_frac = phase_volume / np.sum(phase_volume)
-    X_voigt = sum(f * x for f, x in zip(vol_frac, X))
+    vol_frac = _volume_fractions(phase_volume)
+    X_voigt = (vol_frac * np.asarray(X, dtype=float)).sum(axis=-1)
     return X_voigt
 
 
@@ -583,12 +581,18 @@ def reuss_average_function(phase_volume, X):
     voigt_reuss_hill classes, takes a list of
     volumes and moduli, returns a modulus.
     """
-    vol_frac = phase_volume / np.sum(phase_volume)
-    for f, x in zip(vol_frac, X):
-        if x <= 0 and np.abs(f) > np.finfo(float).eps:
-            warnings.warn("Oops, called reuss_average with Xi<=0!")
-            return 0.0
-    X_reuss = 1. / sum(f / x for f, x in zip(vol_frac, X))
+    vol_frac = _volume_fractions(phase_volume)
+    X = np.asarray(X, dtype=float)
+    non_rigid = np.logical_and(X <= 0, np.abs(vol_frac) > np.finfo(float).eps).any(axis=-1)
+    if np.any(non_rigid):
+        warnings.warn("Oops, called reuss_average with Xi<=0!")
+        # only the other states are averaged
+        vol_frac, X = np.broadcast_arrays(vol_frac, X)
+        rigid = np.logical_not(non_rigid)
+        X_reuss = np.zeros(non_rigid.shape)
+        X_reuss[rigid] = 1. / (vol_frac[rigid] / X[rigid]).sum(axis=-1)
+        return X_reuss[()]
+    X_reuss = 1. / (vol_frac / X).sum(axis=-1)
     return X_reuss
 
 
@@ -602,3 +606,57 @@ def voigt_reuss_hill_function(phase_volume, X):
     X_vrh = (voigt_average_function(phase_volume, X)
              + reuss_average_function(phase_volume, X)) / 2.0
     return X_vrh
+
+
+def hashin_shtrikman_bulk_function(phase_volume, K, G, extremum):
+    """
+    Do Hashin-Shtrikman bound on the bulk modulus, using the
+    formulas of :cite:`Watt1976`. Called by the Hashin-Shtrikman
+    classes, takes a list of volumes and moduli, and the
+    function (np.max for the upper bound or np.min for the
+    lower bound) selecting the reference phase moduli.
+    """
+    vol_frac = _volume_fractions(phase_volume)
+    K = np.asarray(K, dtype=float)
+    K_n = extremum(K, axis=-1, keepdims=True)
+    G_n = extremum(np.asarray(G, dtype=float), axis=-1, keepdims=True)
+
+    alpha_n = -3. / (3. * K_n + 4. * G_n)
+    # the reference phases do not contribute to the sums
+    different = K != K_n
+    dK = np.where(different, K - K_n, 1.)
+    A_n = np.where(different, vol_frac / (1. / dK - alpha_n), 0.).sum(axis=-1, keepdims=True)
+
+    K_hs = K_n + A_n / (1. + alpha_n * A_n)
+    return K_hs[..., 0]
+
+
+def hashin_shtrikman_shear_function(phase_volume, K, G, extremum):
+    """
+    Do Hashin-Shtrikman bound on the shear modulus, using the
+    formulas of :cite:`Watt1976`. Called by the Hashin-Shtrikman
+    classes, takes a list of volumes and moduli, and the
+    function (np.max for the upper bound or np.min for the
+    lower bound) selecting the reference phase moduli.
+    """
+    vol_frac = _volume_fractions(phase_volume)
+    G = np.asarray(G, dtype=float)
+    K_n = extremum(np.asarray(K, dtype=float), axis=-1, keepdims=True)
+    G_n = extremum(G, axis=-1, keepdims=True)
+
+    beta_n = -3. * (K_n + 2. * G_n) / (5. * G_n * (3. * K_n + 4. * G_n))
+    different = G != G_n
+    dG = np.where(different, G - G_n, 1.)
+    B_n = np.where(different, vol_frac / (1. / (2. * dG) - beta_n), 0.).sum(axis=-1, keepdims=True)
+
+    G_hs = G_n + (0.5) * B_n / (1. + beta_n * B_n)
+    return G_hs[..., 0]
+
+
+def _volume_fractions(phase_volume):
+    """
+    Returns the volume fractions of the phases,
+    normalised along the last axis.
+    """
+    phase_volume = np.asarray(phase_volume, dtype=float)
+    return phase_volume / phase_volume.sum(axis=-1, keepdims=True)
@@ -65,9 +65,17 @@ class CombinedMineral(Mineral):
         self.method = MadeMemberMethod()
 
 
-    def set_state(self, pressure, temperature):
-        self.mixture.set_state(pressure, temperature)
-        Mineral.set_state(self, pressure, temperature)
+    @property
+    def vectorized(self):
+        """
+        True if all the minerals in the combination can be
+        evaluated at arrays of pressures and temperatures.
+        """
+        return self.mixture.vectorized
+
+    def set_state(self, pressure, temperature, properties=None):
+        self.mixture.set_state(pressure, temperature, properties)
+        Mineral.set_state(self, pressure, temperature, properties)
 
 
     @material_property
@@ -107,7 +115,8 @@ class CombinedMineral(Mineral):
         K_T_orig = self.mixture.isothermal_bulk_modulus
 
         return self.molar_volume \
-            / ((self._molar_volume_unmodified / K_T_orig) - self._property_modifiers['d2GdP2'])
+            / ((self._molar_volume_unmodified / K_T_orig)
+               - self._second_order_property_modifiers['d2GdP2'])
 
     @material_property
     def shear_modulus(self):
@@ -124,7 +133,7 @@ class CombinedMineral(Mineral):
         Aliased with self.alpha
         """
         return ((self.mixture.thermal_expansivity * self._molar_volume_unmodified)
-                + self._property_modifiers['d2GdPdT']) / self.molar_volume
+                + self._second_order_property_modifiers['d2GdPdT']) / self.molar_volume
     
     @material_property
     def heat_capacity_p(self):
@@ -132,7 +141,7 @@ class CombinedMineral(Mineral):
         Returns heat capacity at constant pressure of the solid solution [J/K/mol]
         Aliased with self.C_p
         """
-        return self.mixture.heat_capacity_p - self.temperature * self._property_modifiers['d2GdT2']
+        return self.mixture.heat_capacity_p - self.temperature * self._second_order_property_modifiers['d2GdT2']
 
 
     """
@@ -195,7 +204,11 @@ class CombinedMineral(Mineral):
         Returns adiabatic bulk modulus of the solid solution [Pa]
         Aliased with self.K_S
         """
-        if self.temperature < 1.e-10:
+        if np.ndim(self.temperature) > 0:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                K_S = self.isothermal_bulk_modulus * self.heat_capacity_p / self.heat_capacity_v
+            return np.where(self.temperature < 1.e-10, self.isothermal_bulk_modulus, K_S)
+        elif self.temperature < 1.e-10:
             return self.isothermal_bulk_modulus
         else:
             return self.isothermal_bulk_modulus * self.heat_capacity_p / self.heat_capacity_v
@@ -247,7 +260,12 @@ class CombinedMineral(Mineral):
         Returns grueneisen parameter of the solid solution [unitless]
         Aliased with self.gr
         """
-        if self.temperature < 1.e-12:
+        if np.ndim(self.temperature) > 0:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                gr = self.thermal_expansivity * self.isothermal_bulk_modulus \
+                    * self.molar_volume / self.heat_capacity_v
+            return np.where(self.temperature < 1.e-12, 0., gr)
+        elif self.temperature < 1.e-12:
             return 0.
         else:
             return self.thermal_expansivity * self.isothermal_bulk_modulus \
@@ -65,6 +65,7 @@ class Composite(Material):
 
         assert(len(phases) > 0)
         self.phases = phases
+        self._state_shape = None
 
         if fractions is not None:
             self.set_fractions(fractions, fraction_type)
@@ -137,13 +138,30 @@ class Composite(Material):
         # Clear the cache on resetting averaging scheme
         self.reset()
 
-    def set_state(self, pressure, temperature):
+    @property
+    def vectorized(self):
+        """
+        True if all the phases in the composite can be evaluated
+        at arrays of pressures and temperatures.
+        """
+        return all(phase.vectorized for phase in self.phases)
+
+    def set_state(self, pressure, temperature, properties=None):
         """
         Update the material to the given pressure [Pa] and temperature [K].
+        The optional property set is passed on to all the phases
+        (see :func:`burnman.Material.set_state`).
         """
         Material.set_state(self, pressure, temperature)
+        if np.ndim(pressure) == 0 and np.ndim(temperature) == 0:
+            self._state_shape = None
+        else:
+            self._state_shape = np.broadcast(pressure, temperature).shape
         for phase in self.phases:
-            phase.set_state(pressure, temperature)
+            if properties is None:
+                phase.set_state(pressure, temperature)
+            else:
+                phase.set_state(pressure, temperature, properties)
 
     def debug_print(self, indent=""):
         print("%sComposite:" % indent)
@@ -181,9 +199,7 @@ class Composite(Material):
         Returns internal energy of the mineral [J]
         Aliased with self.energy
         """
-        U = sum(phase.internal_energy * molar_fraction for (
-                phase, molar_fraction) in zip(self.phases, self.molar_fractions))
-        return U
+        return self._molar_sum('internal_energy')
 
     @material_property
     def molar_gibbs(self):
@@ -191,9 +207,7 @@ class Composite(Material):
         Returns Gibbs free energy of the composite [J]
         Aliased with self.gibbs
         """
-        G = sum(phase.molar_gibbs * molar_fraction for (phase, molar_fraction)
-                in zip(self.phases, self.molar_fractions))
-        return G
+        return self._molar_sum('molar_gibbs')
 
     @material_property
     def molar_helmholtz(self):
@@ -201,9 +215,7 @@ class Composite(Material):
         Returns Helmholtz free energy of the mineral [J]
         Aliased with self.helmholtz
         """
-        F = sum(phase.molar_helmholtz * molar_fraction for (
-                phase, molar_fraction) in zip(self.phases, self.molar_fractions))
-        return F
+        return self._molar_sum('molar_helmholtz')
 
     @material_property
     def molar_volume(self):
@@ -211,16 +223,14 @@ class Composite(Material):
         Returns molar volume of the composite [m^3/mol]
         Aliased with self.V
         """
-        volumes = np.array(
-            [phase.molar_volume * molar_fraction for (phase, molar_fraction) in zip(self.phases, self.molar_fractions)])
-        return np.sum(volumes)
+        return self._molar_sum('molar_volume')
 
     @material_property
     def molar_mass(self):
         """
         Returns molar mass of the composite [kg/mol]
         """
-        return sum([phase.molar_mass * molar_fraction for (phase, molar_fraction) in zip(self.phases, self.molar_fractions)])
+        return self._molar_sum('molar_mass')
 
     @material_property
     def density(self):
@@ -228,10 +238,9 @@ class Composite(Material):
         Compute the density of the composite based on the molar volumes and masses
         Aliased with self.rho
         """
-        densities = np.array([phase.density for phase in self.phases])
-        volumes = np.array(
-            [phase.molar_volume * molar_fraction for (phase, molar_fraction) in zip(self.phases, self.molar_fractions)])
-        return self.averaging_scheme.average_density(volumes, densities)
+        volumes, densities = self._phase_state(['molar_volume', 'density'])
+        return self._average(self.averaging_scheme.average_density,
+                             volumes * self._fractions, densities)
 
     @material_property
     def molar_entropy(self):
@@ -239,9 +248,7 @@ class Composite(Material):
         Returns enthalpy of the mineral [J]
         Aliased with self.S
         """
-        S = sum(phase.molar_entropy * molar_fraction for (
-                phase, molar_fraction) in zip(self.phases, self.molar_fractions))
-        return S
+        return self._molar_sum('molar_entropy')
 
     @material_property
     def molar_enthalpy(self):
@@ -249,9 +256,7 @@ class Composite(Material):
         Returns enthalpy of the mineral [J]
         Aliased with self.H
         """
-        H = sum(phase.molar_enthalpy * molar_fraction for (
-                phase, molar_fraction) in zip(self.phases, self.molar_fractions))
-        return H
+        return self._molar_sum('molar_enthalpy')
 
     @material_property
     def isothermal_bulk_modulus(self):
@@ -259,13 +264,10 @@ class Composite(Material):
         Returns isothermal bulk modulus of the composite [Pa]
         Aliased with self.K_T
         """
-        V_frac = np.array([phase.molar_volume * molar_fraction for (
-                           phase, molar_fraction) in zip(self.phases, self.molar_fractions)])
-        K_ph = np.array(
-            [phase.isothermal_bulk_modulus for phase in self.phases])
-        G_ph = np.array([phase.shear_modulus for phase in self.phases])
-
-        return self.averaging_scheme.average_bulk_moduli(V_frac, K_ph, G_ph)
+        V_ph, K_ph, G_ph = self._phase_state(['molar_volume', 'isothermal_bulk_modulus',
+                                              'shear_modulus'])
+        return self._average(self.averaging_scheme.average_bulk_moduli,
+                             V_ph * self._fractions, K_ph, G_ph)
 
     @material_property
     def adiabatic_bulk_modulus(self):
@@ -273,13 +275,10 @@ class Composite(Material):
         Returns adiabatic bulk modulus of the mineral [Pa]
         Aliased with self.K_S
         """
-        V_frac = np.array([phase.molar_volume * molar_fraction for (
-                           phase, molar_fraction) in zip(self.phases, self.molar_fractions)])
-        K_ph = np.array(
-            [phase.adiabatic_bulk_modulus for phase in self.phases])
-        G_ph = np.array([phase.shear_modulus for phase in self.phases])
-
-        return self.averaging_scheme.average_bulk_moduli(V_frac, K_ph, G_ph)
+        V_ph, K_ph, G_ph = self._phase_state(['molar_volume', 'adiabatic_bulk_modulus',
+                                              'shear_modulus'])
+        return self._average(self.averaging_scheme.average_bulk_moduli,
+                             V_ph * self._fractions, K_ph, G_ph)
 
     @material_property
     def isothermal_compressibility(self):
@@ -303,13 +302,10 @@ class Composite(Material):
         Returns shear modulus of the mineral [Pa]
         Aliased with self.G
         """
-        V_frac = np.array([phase.molar_volume * molar_fraction for (
-                           phase, molar_fraction) in zip(self.phases, self.molar_fractions)])
-        K_ph = np.array(
-            [phase.adiabatic_bulk_modulus for phase in self.phases])
-        G_ph = np.array([phase.shear_modulus for phase in self.phases])
-
-        return self.averaging_scheme.average_shear_moduli(V_frac, K_ph, G_ph)
+        V_ph, K_ph, G_ph = self._phase_state(['molar_volume', 'adiabatic_bulk_modulus',
+                                              'shear_modulus'])
+        return self._average(self.averaging_scheme.average_shear_moduli,
+                             V_ph * self._fractions, K_ph, G_ph)
 
     @material_property
     def p_wave_velocity(self):
@@ -350,10 +346,9 @@ class Composite(Material):
         Returns thermal expansion coefficient of the composite [1/K]
         Aliased with self.alpha
         """
-        volumes = np.array(
-            [phase.molar_volume * molar_fraction for (phase, molar_fraction) in zip(self.phases, self.molar_fractions)])
-        alphas = np.array([phase.thermal_expansivity for phase in self.phases])
-        return self.averaging_scheme.average_thermal_expansivity(volumes, alphas)
+        volumes, alphas = self._phase_state(['molar_volume', 'thermal_expansivity'])
+        return self._average(self.averaging_scheme.average_thermal_expansivity,
+                             volumes * self._fractions, alphas)
 
     @material_property
     def heat_capacity_v(self):
@@ -361,8 +356,8 @@ class Composite(Material):
         Returns heat capacity at constant volume of the composite [J/K/mol]
         Aliased with self.C_v
         """
-        c_v = np.array([phase.heat_capacity_v for phase in self.phases])
-        return self.averaging_scheme.average_heat_capacity_v(self.molar_fractions, c_v)
+        c_v, = self._phase_state(['heat_capacity_v'])
+        return self._average(self.averaging_scheme.average_heat_capacity_v, self._fractions, c_v)
 
     @material_property
     def heat_capacity_p(self):
@@ -370,8 +365,73 @@ class Composite(Material):
         Returns heat capacity at constant pressure of the composite [J/K/mol]
         Aliased with self.C_p
         """
-        c_p = np.array([phase.heat_capacity_p for phase in self.phases])
-        return self.averaging_scheme.average_heat_capacity_p(self.molar_fractions, c_p)
+        c_p, = self._phase_state(['heat_capacity_p'])
+        return self._average(self.averaging_scheme.average_heat_capacity_p, self._fractions, c_p)
+
+    @property
+    def _fractions(self):
+        return np.array(self.molar_fractions)
+
+    def _phase_state(self, names):
+        """
+        Returns the rows of the state matrix of the phases for the
+        properties given in the list names. Each row has one value per
+        phase. If the composite has been set to arrays of pressures and
+        temperatures, each row is an array of shape (n_states, n_phases),
+        where n_states is the total number of states.
+
+        The properties are collected from the phases only once per state,
+        when they are first needed, so that properties of the composite
+        depending on the same phase properties share them.
+        """
+        state = self._cached.setdefault('_phase_state', {})
+        missing = [name for name in names if name not in state]
+        if len(missing) > 0:
+            shape = self._state_shape
+            if shape is None:
+                matrix = np.array([[getattr(phase, name) for name in missing]
+                                   for phase in self.phases], dtype=float).T
+            else:
+                matrix = np.array([[np.broadcast_to(getattr(phase, name), shape)
+                                    for name in missing]
+                                   for phase in self.phases], dtype=float)
+                matrix = matrix.reshape(len(self.phases), len(missing), -1).transpose(1, 2, 0)
+            for name, row in zip(missing, matrix):
+                state[name] = row
+        return [state[name] for name in names]
+
+    def _molar_sum(self, name):
+        """
+        Returns the sum of a property of the phases weighted by
+        their molar fractions.
+        """
+        values, = self._phase_state([name])
+        return self._reshape((values * self._fractions).sum(axis=-1))
+
+    def _reshape(self, values):
+        """
+        Reshapes an array with one value per state to the shape of the
+        arrays of pressures and temperatures the composite has been set to.
+        """
+        if self._state_shape is None:
+            return values
+        return values.reshape(self._state_shape)
+
+    def _average(self, averaging_function, *phase_properties):
+        """
+        Applies one of the functions of the averaging scheme to rows of
+        the state matrix created by _phase_state.
+        If the composite has been set to arrays of pressures and
+        temperatures, vectorized averaging schemes are called once for
+        all the states, and other schemes once for each state.
+        """
+        if self._state_shape is None:
+            return averaging_function(*phase_properties)
+        if getattr(self.averaging_scheme, 'vectorized', False):
+            return self._reshape(averaging_function(*phase_properties))
+        return self._reshape(np.array([averaging_function(*state_properties)
+                                       for state_properties in
+                                       zip(*np.broadcast_arrays(*phase_properties))]))
 
     def _mass_to_molar_fractions(self, phases, mass_fractions):
         """
@@ -22,5 +22,6 @@ from .vinet import Vinet
 from .birch_murnaghan_4th import BM4
 
 from .property_modifiers import calculate_property_modifications
+from .property_modifiers import compile_property_modifiers
 
 from .helper import create
@@ -120,13 +120,65 @@ def debye_fn_cheb(x):
         return ((val_infinity / x) / x) / x
 
 
-@jit
-def thermal_energy(T, debye_T, n):
+def _debye_fn_cheb_array(x):
     """
-    calculate the thermal energy of a substance.  Takes the temperature,
-    the Debye temperature, and n, the number of atoms per molecule.
-    Returns thermal energy in J/mol
+    Array version of :func:`debye_fn_cheb`. Each element of x is evaluated
+    with exactly the same sequence of operations as the scalar function,
+    so that both functions return identical results.
     """
+    x = np.asarray(x, dtype=float)
+    val_infinity = 19.4818182068004875
+    xcut = -log_eps
+
+    assert(np.all(x > 0.0))  # check for invalid x
+
+    out = np.empty_like(x)
+
+    mask = x < 2.0 * np.sqrt(2.0) * sqrt_eps
+    xi = x[mask]
+    out[mask] = 1.0 - 3.0 * xi / 8.0 + xi * xi / 20.0
+
+    remaining = ~mask
+    mask = remaining & (x <= 4.0)
+    xi = x[mask]
+    t = xi * xi / 8.0 - 1.0
+    out[mask] = _chebval(t, chebyshev_representation) - 0.375 * xi
+
+    remaining &= ~mask
+    mask = remaining & (x < -(np.log(2.0) + log_eps))
+    xi = x[mask]
+    if xi.size > 0:
+        nexp = np.floor(xcut / xi).astype(int)
+        ex = np.exp(-xi)
+        xk = nexp * xi
+        rk = nexp.astype(float)
+        sum = np.zeros_like(xi)
+        # each element runs through its own nexp terms of the series,
+        # in the same order as in the scalar function
+        for i in range(nexp.max(), 0, -1):
+            active = nexp >= i
+            xk_inv = 1.0 / xk[active]
+            sum[active] = sum[active] * ex[active] + \
+                (((6.0 * xk_inv + 6.0) * xk_inv + 3.0) * xk_inv + 1.0) / rk[active]
+            rk[active] -= 1.0
+            xk[active] -= xi[active]
+        out[mask] = val_infinity / (xi * xi * xi) - 3.0 * sum * ex
+
+    remaining &= ~mask
+    mask = remaining & (x < xcut)
+    xi = x[mask]
+    x3 = xi * xi * xi
+    sum = 6.0 + 6.0 * xi + 3.0 * xi * xi + x3
+    out[mask] = (val_infinity - 3.0 * sum * np.exp(-xi)) / x3
+
+    remaining &= ~mask
+    xi = x[remaining]
+    out[remaining] = ((val_infinity / xi) / xi) / xi
+    return out
+
+
+@jit
+def _thermal_energy(T, debye_T, n):
     if T <= eps:
         return 0.
     E_th = 3. * n * constants.gas_constant * T * debye_fn_cheb(debye_T / T)
@@ -134,10 +186,7 @@ def thermal_energy(T, debye_T, n):
 
 
 @jit
-def heat_capacity_v(T, debye_T, n):
-    """
-    Heat capacity at constant volume.  In J/K/mol
-    """
+def _heat_capacity_v(T, debye_T, n):
     if T <= eps:
         return 0.
     x = debye_T / T
@@ -147,14 +196,7 @@ def heat_capacity_v(T, debye_T, n):
 
 
 @jit
-def helmholtz_free_energy(T, debye_T, n):
-    """
-    Helmholtz free energy of lattice vibrations in the Debye model.
-    It is important to note that this does NOT include the zero
-    point energy of vibration for the lattice.  As long as you are
-    calculating relative differences in F, this should cancel anyways.
-    In Joules.
-    """
+def _helmholtz_free_energy(T, debye_T, n):
     if T <= eps:
         return 0.
     x = debye_T / T
@@ -163,13 +205,84 @@ def helmholtz_free_energy(T, debye_T, n):
     return F
 
 
-def entropy(T, debye_T, n):
-    """
-    Entropy due to lattice vibrations in the Debye model [J/K]
-    """
+def _entropy(T, debye_T, n):
     if T <= eps:
         return 0.
     x = debye_T / T
     S = n * constants.gas_constant * \
         (4. * debye_fn_cheb(x) - 3. * np.log(1.0 - np.exp(-x)))
     return S
+
+
+def _broadcast_temperatures(T, debye_T):
+    """
+    Broadcasts T and debye_T against each other, and returns them along
+    with the mask of temperatures which are large enough to evaluate the
+    Debye model (at lower temperatures all the functions are zero).
+    """
+    T, debye_T = np.broadcast_arrays(np.asarray(T, dtype=float),
+                                     np.asarray(debye_T, dtype=float))
+    return T, debye_T, T > eps
+
+
+def thermal_energy(T, debye_T, n):
+    """
+    calculate the thermal energy of a substance.  Takes the temperature,
+    the Debye temperature, and n, the number of atoms per molecule.
+    Returns thermal energy in J/mol. T and debye_T may be arrays.
+    """
+    if np.ndim(T) == 0 and np.ndim(debye_T) == 0:
+        return _thermal_energy(T, debye_T, n)
+    T, debye_T, mask = _broadcast_temperatures(T, debye_T)
+    E_th = np.zeros(T.shape)
+    E_th[mask] = 3. * n * constants.gas_constant * T[mask] \
+        * _debye_fn_cheb_array(debye_T[mask] / T[mask])
+    return E_th
+
+
+def heat_capacity_v(T, debye_T, n):
+    """
+    Heat capacity at constant volume.  In J/K/mol.
+    T and debye_T may be arrays.
+    """
+    if np.ndim(T) == 0 and np.ndim(debye_T) == 0:
+        return _heat_capacity_v(T, debye_T, n)
+    T, debye_T, mask = _broadcast_temperatures(T, debye_T)
+    C_v = np.zeros(T.shape)
+    x = debye_T[mask] / T[mask]
+    C_v[mask] = 3.0 * n * constants.gas_constant * \
+        (4.0 * _debye_fn_cheb_array(x) - 3.0 * x / (np.exp(x) - 1.0))
+    return C_v
+
+
+def helmholtz_free_energy(T, debye_T, n):
+    """
+    Helmholtz free energy of lattice vibrations in the Debye model.
+    It is important to note that this does NOT include the zero
+    point energy of vibration for the lattice.  As long as you are
+    calculating relative differences in F, this should cancel anyways.
+    In Joules. T and debye_T may be arrays.
+    """
+    if np.ndim(T) == 0 and np.ndim(debye_T) == 0:
+        return _helmholtz_free_energy(T, debye_T, n)
+    T, debye_T, mask = _broadcast_temperatures(T, debye_T)
+    F = np.zeros(T.shape)
+    x = debye_T[mask] / T[mask]
+    F[mask] = n * constants.gas_constant * T[mask] * \
+        (3.0 * np.log(1.0 - np.exp(-x)) - _debye_fn_cheb_array(x))
+    return F
+
+
+def entropy(T, debye_T, n):
+    """
+    Entropy due to lattice vibrations in the Debye model [J/K].
+    T and debye_T may be arrays.
+    """
+    if np.ndim(T) == 0 and np.ndim(debye_T) == 0:
+        return _entropy(T, debye_T, n)
+    T, debye_T, mask = _broadcast_temperatures(T, debye_T)
+    S = np.zeros(T.shape)
+    x = debye_T[mask] / T[mask]
+    S[mask] = n * constants.gas_constant * \
+        (4. * _debye_fn_cheb_array(x) - 3. * np.log(1.0 - np.exp(-x)))
+    return S
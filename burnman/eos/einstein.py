@@ -18,11 +18,16 @@ def thermal_energy(T, einstein_T, n):
     """
     calculate the thermal energy of a substance.  Takes the temperature,
     the Einstein temperature, and n, the number of atoms per molecule.
-    Returns thermal energy in J/mol
+    Returns thermal energy in J/mol. T may be an array.
     """
-    if T <= eps:
-        return 3. * n * constants.gas_constant * einstein_T * 0.5  # zero point energy
-    x = einstein_T / T
+    if np.ndim(T) == 0:
+        if T <= eps:
+            return 3. * n * constants.gas_constant * einstein_T * 0.5  # zero point energy
+        x = einstein_T / T
+    else:
+        T = np.asarray(T, dtype=float)
+        x = np.full(T.shape, np.inf)
+        np.divide(einstein_T, T, out=x, where=(T > eps))
     E_th = 3. * n * constants.gas_constant * einstein_T * \
         (0.5 + 1. / (np.exp(x) - 1.0))  # include the zero point energy
     return E_th
@@ -30,11 +35,21 @@ def thermal_energy(T, einstein_T, n):
 
 def heat_capacity_v(T, einstein_T, n):
     """
-    Heat capacity at constant volume.  In J/K/mol
+    Heat capacity at constant volume.  In J/K/mol.
+    T may be an array.
     """
-    if T <= eps:
-        return 0.
-    x = einstein_T / T
-    C_v = 3.0 * n * constants.gas_constant * \
+    if np.ndim(T) == 0:
+        if T <= eps:
+            return 0.
+        x = einstein_T / T
+        C_v = 3.0 * n * constants.gas_constant * \
+            (x * x * np.exp(x) / np.power(np.exp(x) - 1.0, 2.0))
+        return C_v
+
+    T = np.asarray(T, dtype=float)
+    mask = T > eps
+    C_v = np.zeros(T.shape)
+    x = einstein_T / T[mask]
+    C_v[mask] = 3.0 * n * constants.gas_constant * \
         (x * x * np.exp(x) / np.power(np.exp(x) - 1.0, 2.0))
     return C_v
@@ -2,6 +2,10 @@
 # Copyright (C) 2012 - 2017 by the BurnMan team, released under the GNU
 # GPL v2 or later.
 
+from __future__ import absolute_import
+
+import numpy as np
+
 
 class EquationOfState(object):
 
@@ -22,8 +26,19 @@ class EquationOfState(object):
     The functions for volume and density are just functions
     of temperature, pressure, and "params"; after all, it
     does not make sense for them to be functions of volume or density.
+
+    If all the functions also accept numpy arrays of pressures, temperatures
+    and volumes (returning arrays of the same shape), the class attribute
+    ``vectorized`` should be set to True. Minerals using such an equation
+    of state can then be evaluated at many states in one call to
+    :func:`burnman.Material.set_state`.
     """
 
+    vectorized = False
+
+    _intermediate_state = None
+    _intermediate_values = None
+
     def volume(self, pressure, temperature, params):
         """
         Parameters
@@ -313,6 +328,32 @@ class EquationOfState(object):
         """
         raise NotImplementedError("")
 
+    def reset(self):
+        """
+        Empties the cache of intermediate values (see :func:`_intermediates`).
+        This is called by :func:`burnman.Mineral.reset`, so that
+        it is typically not required for the user to call this function.
+        """
+        self._intermediate_state = None
+        self._intermediate_values = None
+
+    def _intermediates(self, temperature, volume, params):
+        """
+        Returns a dictionary in which an equation of state can store
+        intermediate values (such as the Debye temperature) which are needed
+        by more than one of its functions. The dictionary is shared by all the
+        calls made at the same temperature, volume and parameters, and is
+        replaced by an empty one as soon as any of these change or
+        :func:`reset` is called.
+        """
+        state = self._intermediate_state
+        if (state is None or not _same_values(state[0], temperature)
+                or not _same_values(state[1], volume)
+                or not _same_params(state[2], params)):
+            self._intermediate_state = (np.copy(temperature), np.copy(volume), dict(params))
+            self._intermediate_values = {}
+        return self._intermediate_values
+
     def validate_parameters(self, params):
         """
         The params object is just a dictionary associating mineral physics parameters
@@ -331,3 +372,16 @@ class EquationOfState(object):
             Dictionary containing material parameters required by the equation of state.
         """
         pass
+
+
+def _same_values(stored, value):
+    if np.ndim(stored) == 0 and np.ndim(value) == 0:
+        return stored == value
+    return np.array_equal(stored, value)
+
+
+def _same_params(stored, params):
+    # parameters are compared by identity, so that changing the value of
+    # any parameter invalidates the stored intermediate values
+    return (len(stored) == len(params) and
+            all(k in params and params[k] is v for k, v in stored.items()))
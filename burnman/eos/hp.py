@@ -26,6 +26,8 @@ class HP_TMT(eos.EquationOfState):
     equation_of_state = 'hp_tmt'
     """
 
+    vectorized = True
+
     def volume(self, pressure, temperature, params):
         """
         Returns volume [m^3] as a function of pressure [Pa] and temperature [K]
@@ -144,7 +146,12 @@ class HP_TMT(eos.EquationOfState):
         psubpth = pressure - params['P_0'] - Pth
 
         # EQ 13
-        if pressure != params['P_0']:
+        if np.ndim(pressure) > 0:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                intVdP = (pressure - params['P_0']) * params['V_0'] * (
+                    1. - a + (a * (np.power((1. - b * Pth), 1. - c) - np.power((1. + b * (psubpth)), 1. - c)) / (b * (c - 1.) * (pressure - params['P_0']))))
+            intVdP = np.where(pressure != params['P_0'], intVdP, 0.)
+        elif pressure != params['P_0']:
             intVdP = (pressure - params['P_0']) * params['V_0'] * (
                 1. - a + (a * (np.power((1. - b * Pth), 1. - c) - np.power((1. + b * (psubpth)), 1. - c)) / (b * (c - 1.) * (pressure - params['P_0']))))
         else:
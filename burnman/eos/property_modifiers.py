@@ -4,7 +4,6 @@
 
 from __future__ import absolute_import
 import numpy as np
-import scipy.optimize as opt
 from ..constants import gas_constant
 
 """
@@ -17,6 +16,16 @@ Currently includes modifications for:
 """
 
 
+def _where(condition, x, y):
+    """
+    Elementwise choice between x and y, which returns a scalar
+    if all of the arguments are scalars. Used by the modifiers
+    below so that they can be evaluated both at a single state and
+    at arrays of pressures and temperatures.
+    """
+    return np.where(condition, x, y)[()]
+
+
 def _landau_excesses(pressure, temperature, params):
     """
     Applies a tricritical Landau correction to the properties
@@ -42,11 +51,13 @@ def _landau_excesses(pressure, temperature, params):
     dGdT_disordered = -params['S_D']
     dGdP_disordered = params['V_D']
 
-    if temperature < Tc:
-        # Wolfram input to check partial differentials
-        # x = T, y = P, a = S, c = Tc0, d = V
-        # D[D[a ((x - c - d*y/a)*(1 - x/(c + d*y/a))^0.5 + c/3*(1 - x/(c +
-        # d*y/a))^1.5), x], x]
+    # Wolfram input to check partial differentials
+    # x = T, y = P, a = S, c = Tc0, d = V
+    # D[D[a ((x - c - d*y/a)*(1 - x/(c + d*y/a))^0.5 + c/3*(1 - x/(c +
+    # d*y/a))^1.5), x], x]
+    # The ordered expressions are evaluated everywhere and
+    # only used where temperature < Tc
+    with np.errstate(divide='ignore', invalid='ignore'):
         Q2 = np.sqrt(1. - temperature / Tc)
         G = ( params['S_D'] *
               ( (temperature - Tc) * Q2 +
@@ -64,13 +75,13 @@ def _landau_excesses(pressure, temperature, params):
         d2GdPdT = params['V_D'] / (2. * Tc * Q2) \
                   * (1. + (temperature / (2. * Tc) - Q2 * Q2) * (1. - params['Tc_0'] / Tc))
 
-    else:
-        G = G_disordered
-        dGdT = dGdT_disordered
-        dGdP = dGdP_disordered
-        d2GdT2 = 0.
-        d2GdP2 = 0.
-        d2GdPdT = 0.
+    ordered = temperature < Tc
+    G = _where(ordered, G, G_disordered)
+    dGdT = _where(ordered, dGdT, dGdT_disordered)
+    dGdP = _where(ordered, dGdP, dGdP_disordered)
+    d2GdT2 = _where(ordered, d2GdT2, 0.)
+    d2GdP2 = _where(ordered, d2GdP2, 0.)
+    d2GdPdT = _where(ordered, d2GdPdT, 0.)
 
     excesses = {'G': G, 'dGdT': dGdT, 'dGdP': dGdP,
                 'd2GdT2': d2GdT2, 'd2GdP2': d2GdP2, 'd2GdPdT': d2GdPdT}
@@ -78,7 +89,21 @@ def _landau_excesses(pressure, temperature, params):
     return excesses
 
 
-def _landau_hp_excesses(pressure, temperature, params):
+def _landau_hp_constants(params):
+    """
+    Returns the state-independent terms of the landau_hp modifier:
+    the order parameter at the reference state (Q_0) and the
+    corresponding reference Gibbs energy term (G_0).
+    """
+    if params['T_0'] < params['Tc_0']:
+        Q_0 = np.power((params['Tc_0'] - params['T_0']) / params['Tc_0'], 0.25)
+    else:
+        Q_0 = 0.
+    G_0 = params['Tc_0'] * params['S_D'] * (Q_0 * Q_0 - np.power(Q_0, 6.) / 3.)
+    return {'Q_0': Q_0, 'G_0': G_0}
+
+
+def _landau_hp_excesses(pressure, temperature, params, constants=None):
     """
     Applies a tricritical Landau correction to the properties
     of an endmember which undergoes a displacive phase transition.
@@ -98,22 +123,19 @@ def _landau_hp_excesses(pressure, temperature, params):
     rate of reaction.
     """
 
+    if constants is None:
+        constants = _landau_hp_constants(params)
+    Q_0 = constants['Q_0']
+
     P = pressure
     T = temperature
 
-    if params['T_0'] < params['Tc_0']:
-        Q_0 = np.power((params['Tc_0'] - params['T_0']) / params['Tc_0'], 0.25)
-    else:
-        Q_0 = 0.
-
     Tc = params['Tc_0'] + params['V_D'] * (P - params['P_0']) / params['S_D']
-    if T < Tc:
-        Q = np.power((Tc - T) / params['Tc_0'], 0.25)
-    else:
-        Q = 0.
+    with np.errstate(invalid='ignore'):
+        Q = _where(T < Tc, np.power((Tc - T) / params['Tc_0'], 0.25), 0.)
 
     # Gibbs
-    G = params['Tc_0'] * params['S_D'] * (Q_0 * Q_0 - np.power(Q_0, 6.) / 3.) \
+    G = constants['G_0'] \
         - params['S_D'] * (Tc * Q * Q - params['Tc_0'] * np.power(Q, 6.) / 3.) \
         - T * params['S_D'] * (Q_0 * Q_0 - Q * Q) + (
             P - params['P_0']) * params['V_D'] * Q_0 * Q_0
@@ -121,15 +143,16 @@ def _landau_hp_excesses(pressure, temperature, params):
     dGdT = params['S_D'] * (Q * Q - Q_0 * Q_0)
     dGdP = -params['V_D'] * (Q * Q - Q_0 * Q_0)
 
-    if Q > 1.e-12:
+    with np.errstate(divide='ignore', invalid='ignore'):
         d2GdT2 = -params['S_D'] / (2. * params['Tc_0'] * Q * Q)
         d2GdP2 = -params['V_D'] * params['V_D'] \
                  / (2. * params['S_D'] * params['Tc_0'] * Q * Q)
         d2GdPdT = params['V_D'] / (2. * params['Tc_0'] * Q * Q)
-    else:
-        d2GdT2 = 0.
-        d2GdP2 = 0.
-        d2GdPdT = 0.
+
+    ordered = Q > 1.e-12
+    d2GdT2 = _where(ordered, d2GdT2, 0.)
+    d2GdP2 = _where(ordered, d2GdP2, 0.)
+    d2GdPdT = _where(ordered, d2GdPdT, 0.)
 
     excesses = {'G': G, 'dGdT': dGdT, 'dGdP': dGdP,
                 'd2GdT2': d2GdT2, 'd2GdP2': d2GdP2, 'd2GdPdT': d2GdPdT}
@@ -167,7 +190,114 @@ def _linear_excesses(pressure, temperature, params):
     return excesses
 
 
-def _bragg_williams_excesses(pressure, temperature, params):
+def _lnxord(n, Q):
+    return np.log(1. + n * Q) + n * np.log(n + Q) - (1. + n) * np.log(1. + n)
+
+
+def _lnxdisord(n, Q):
+    return (1. / (1. + n)) * np.log(1. + n * Q) \
+        + (n / (1. + n)) * np.log(1. - Q) \
+        + (n / (1. + n)) * np.log(n * (1. - Q)) \
+        + (n * n / (1. + n)) * np.log(n + Q) - n * np.log(n)
+
+
+def _bragg_williams_constants(params):
+    """
+    Returns the state-independent configurational entropy
+    of disordering (deltaS) of the bragg_williams modifier.
+    """
+    n = params['n']
+    return {'deltaS': gas_constant * ((1. + n) * np.log(1. + n) - n * np.log(n))}
+
+
+def _bragg_williams_affinity(Q, pressure, temperature, params, constants=None):
+    """
+    Returns the derivative of the Bragg-Williams excess Gibbs energy
+    with respect to the order parameter Q (with the opposite sign),
+    and the derivative of this function with respect to Q.
+    The equilibrium order parameter is a root of this function.
+    """
+    if constants is None:
+        constants = _bragg_williams_constants(params)
+    n = params['n']
+    f = params['factor']
+    deltaS = constants['deltaS']
+    W = params['Wh'] + pressure * params['Wv']
+    gibbs_disorder = params['deltaH'] - f * \
+        temperature * deltaS + pressure * params['deltaV']
+
+    A = gibbs_disorder + (2. * Q - 1.) * W \
+        + f * gas_constant * temperature * (_lnxdisord(n, Q) - _lnxord(n, Q))
+    dAdQ = 2. * W - f * gas_constant * temperature / (1. + n) \
+        * (n * n / (1. + n * Q) + n / (n + Q) + 2. * n / (1. - Q))
+    return A, dAdQ
+
+
+def _bragg_williams_order_parameter(pressure, temperature, params,
+                                    Q_guess=None, max_iterations=100,
+                                    constants=None):
+    """
+    Returns the equilibrium order parameter Q of a Bragg-Williams model,
+    which is the largest root in [0, 1) of _bragg_williams_affinity.
+    If the affinity is negative everywhere (the mineral is fully disordered),
+    Q = 0.
+
+    The root is found with a Newton solver, safeguarded by bisection, which
+    approaches it from the ordered side (where the affinity is negative).
+    The solver starts from Q_guess (for example, the order parameter at a
+    nearby state) where this lies on the ordered side of the root, and
+    otherwise from the largest float smaller than one.
+    Pressure and temperature may be arrays.
+    """
+    if constants is None:
+        constants = _bragg_williams_constants(params)
+    pressure, temperature = np.broadcast_arrays(np.asarray(pressure, dtype=float),
+                                                np.asarray(temperature, dtype=float))
+    Q_max = 1. - np.finfo(float).epsneg
+
+    Q = np.full(pressure.shape, Q_max)
+    if Q_guess is not None and np.shape(Q_guess) == pressure.shape:
+        Q_guess = np.clip(Q_guess, 0., Q_max)
+        with np.errstate(invalid='ignore'):
+            A_guess = _bragg_williams_affinity(Q_guess, pressure, temperature,
+                                               params, constants)[0]
+        Q = np.where(A_guess < 0., Q_guess, Q)
+    A, dAdQ = _bragg_williams_affinity(Q, pressure, temperature, params, constants)
+
+    # The affinity of the disordered state is known exactly, because
+    # lnxdisord(n, 0) - lnxord(n, 0) = deltaS / R
+    A_0 = params['deltaH'] - params['Wh'] \
+        + pressure * (params['deltaV'] - params['Wv'])
+    dAdQ_0 = _bragg_williams_affinity(0., pressure, temperature, params,
+                                      constants)[1]
+    disordered = np.logical_and(A_0 <= 0., dAdQ_0 <= 0.)
+
+    # Q is fully ordered (to double precision) where A(Q_max) >= 0
+    active = np.logical_and(A < 0., np.logical_not(disordered))
+    Q = np.where(disordered, 0., Q)
+    lower = np.zeros(Q.shape)
+    upper = Q.copy()
+    for i in range(max_iterations):
+        if not np.any(active):
+            break
+        with np.errstate(divide='ignore', invalid='ignore'):
+            Q_new = Q - A / dAdQ
+        outside = np.logical_not(np.logical_and(Q_new > lower, Q_new < upper))
+        Q_new = np.where(outside, 0.5 * (lower + upper), Q_new)
+        Q_new = np.where(active, Q_new, Q)
+        converged = np.abs(Q_new - Q) <= 1.e-12 * (1. - Q_new)
+        Q = Q_new
+
+        A, dAdQ = _bragg_williams_affinity(Q, pressure, temperature, params, constants)
+        lower = np.where(np.logical_and(active, A > 0.), Q, lower)
+        upper = np.where(np.logical_and(active, A <= 0.), Q, upper)
+        active = np.logical_and(active, np.logical_not(converged))
+
+    return Q[()]
+
+
+def _bragg_williams_excesses(pressure, temperature, params, order=2, Q_guess=None,
+                             constants=None):
     """
     Applies a Bragg-Williams type correction to the thermodynamic
     properties of a mineral endmember. Used for modelling
@@ -182,74 +312,86 @@ def _bragg_williams_excesses(pressure, temperature, params):
     for slow or coupled diffusers (Si-Al, for example).
     The completely *unrelaxed* mineral (in terms of order-disorder)
     can be calculated with a solid solution model.
+
+    The equilibrium order parameter Q is found by
+    _bragg_williams_order_parameter, starting from Q_guess if given.
+    As the derivative of the Gibbs energy with respect to Q
+    is zero at equilibrium, the first derivatives are the partial
+    derivatives at constant Q. The second derivatives also include
+    the change of Q with pressure and temperature, which is found
+    by implicit differentiation of the equilibrium condition.
+    The second derivatives are only calculated if order is 2.
+    The order parameter is returned with the excesses (as 'Q').
     """
+    if constants is None:
+        constants = _bragg_williams_constants(params)
 
     R = gas_constant
     n = params['n']
     f = params['factor']
-    deltaS = gas_constant * ((1. + n) * np.log(1. + n) - n * np.log(n))
-
-    lnxord = lambda n, Q: np.log(1. + n * Q) + n * np.log(n + Q) - (1. + n) * np.log(1. + n)
-    lnxdisord = lambda n, Q: (1. / (1. + n)) * np.log(1. + n * Q) \
-        + (n / (1. + n)) * np.log(1. - Q) \
-        + (n / (1. + n)) * np.log(n * (1. - Q))\
-        + (n * n / (1. + n)) * np.log(n + Q) - n * np.log(n)
-
-    def reaction_bragg_williams(Q, gibbs_disorder, temperature, n, f, W):
-        if Q > 1.0:
-            Q = 0.9  # A simple catch to make sure the optimisation doesn't fail
-        return gibbs_disorder + (2. * Q - 1.) * W \
-            + f * R * temperature * (lnxdisord(n, Q) - lnxord(n, Q))
-
-    def order_gibbs(pressure, temperature, params):
-        W = params['Wh'] + pressure * params['Wv']
-        gibbs_disorder = params['deltaH'] - f * \
-            temperature * deltaS + pressure * params['deltaV']
-        Q = opt.fsolve(reaction_bragg_williams, 0.999995,
-                       args=(gibbs_disorder, temperature, n, f, W))[0]
-        G = (1. - Q) * (gibbs_disorder + f * R * temperature * lnxdisord(n, Q)) \
-            + f * Q * (R * temperature * lnxord(n, Q)) + (1. - Q) * Q * W
-        return Q, G
-
-    # Calculating partial differentials with respect to P and T
-    # are complicated by the fact that Q changes with P and T
-    # Since there's no analytical solution for Q(P, T), we are
-    # unfortunately driven to numerical differentiation. Schade.
-    dT = 1.
-    dP = 1000.
-
-    Q, G = order_gibbs(pressure, temperature, params)
-    Q, GsubPsubT = order_gibbs(pressure - dP, temperature - dT, params)
-    Q, GsubPaddT = order_gibbs(pressure - dP, temperature + dT, params)
-    Q, GaddPsubT = order_gibbs(pressure + dP, temperature - dT, params)
-    Q, GaddPaddT = order_gibbs(pressure + dP, temperature + dT, params)
-    Q, GsubP = order_gibbs(pressure - dP, temperature, params)
-    Q, GaddP = order_gibbs(pressure + dP, temperature, params)
-    Q, GsubT = order_gibbs(pressure, temperature - dT, params)
-    Q, GaddT = order_gibbs(pressure, temperature + dT, params)
-
-    dGdT = (GaddT - GsubT) / (2. * dT)
-    dGdP = (GaddP - GsubP) / (2. * dP)
-    d2GdT2 = (GaddT + GsubT - 2. * G) / (dT * dT)
-    d2GdP2 = (GaddP + GsubP - 2. * G) / (dP * dP)
-    d2GdPdT = (GaddPaddT - GsubPaddT - GaddPsubT + GsubPsubT) / (4. * dT * dP)
+    deltaS = constants['deltaS']
+
+    Q = _bragg_williams_order_parameter(pressure, temperature, params, Q_guess,
+                                        constants=constants)
+
+    W = params['Wh'] + pressure * params['Wv']
+    gibbs_disorder = params['deltaH'] - f * \
+        temperature * deltaS + pressure * params['deltaV']
+    lnxord = _lnxord(n, Q)
+    lnxdisord = _lnxdisord(n, Q)
+
+    G = (1. - Q) * (gibbs_disorder + f * R * temperature * lnxdisord) \
+        + f * Q * (R * temperature * lnxord) + (1. - Q) * Q * W
+    dGdT = (1. - Q) * (-f * deltaS + f * R * lnxdisord) + f * Q * R * lnxord
+    dGdP = (1. - Q) * (params['deltaV'] + Q * params['Wv'])
+
+    if order == 1:
+        return {'G': G, 'dGdT': dGdT, 'dGdP': dGdP, 'Q': Q}
+
+    # derivatives of the equilibrium condition A(Q, P, T) = 0,
+    # where A = -dG/dQ, so that dQ/dT = -dAdT / dAdQ
+    # and d2G/dT2 = -dAdT * dQ/dT
+    dAdQ = _bragg_williams_affinity(Q, pressure, temperature, params, constants)[1]
+    dAdT = -f * deltaS + f * R * (lnxdisord - lnxord)
+    dAdP = params['deltaV'] + (2. * Q - 1.) * params['Wv']
+
+    # Q does not change where the mineral is fully disordered
+    ordered = Q > 0.
+    d2GdT2 = _where(ordered, dAdT * dAdT / dAdQ, 0.)
+    d2GdP2 = _where(ordered, dAdP * dAdP / dAdQ, 0.)
+    d2GdPdT = _where(ordered, dAdP * dAdT / dAdQ, 0.)
 
     excesses = {'G': G, 'dGdT': dGdT, 'dGdP': dGdP,
-                'd2GdT2': d2GdT2, 'd2GdP2': d2GdP2, 'd2GdPdT': d2GdPdT}
+                'd2GdT2': d2GdT2, 'd2GdP2': d2GdP2, 'd2GdPdT': d2GdPdT,
+                'Q': Q}
 
     return excesses
 
 
-def _magnetic_excesses_chs(pressure, temperature, params):
+def _magnetic_chs_constants(params):
+    """
+    Returns the state-independent coefficients of the magnetic_chs
+    modifier, which only depend on the structural parameter.
+    """
+    structural_parameter = params['structural_parameter']
+    return {'A': (518. / 1125.) + (11692. / 15975.) * ((1. / structural_parameter) - 1.),
+            'B': (474. / 497.) * (1. / structural_parameter - 1.),
+            'C': 140. * structural_parameter}
+
+
+def _magnetic_excesses_chs(pressure, temperature, params, constants=None):
     """
     Applies a magnetic contribution to the thermodynamic
     properties of a mineral endmember.
     The expression for the gibbs energy contribution is that
     used by Chin, Hertzman and Sundman (1987) as reported
     in the Journal of Phase Equilibria (Sundman, 1991).
-    """
 
-    structural_parameter = params['structural_parameter']
+    The coefficients which only depend on the structural parameter
+    are taken from constants (see _magnetic_chs_constants) if given.
+    """
+    if constants is None:
+        constants = _magnetic_chs_constants(params)
     curie_temperature = params['curie_temperature'][
         0] + pressure * params['curie_temperature'][1]
     tau = temperature / curie_temperature
@@ -264,35 +406,39 @@ def _magnetic_excesses_chs(pressure, temperature, params):
         0] + pressure * params['magnetic_moment'][1]
     dmagnetic_momentdP = params['magnetic_moment'][1]
 
-    A = (518. / 1125.) + (11692. / 15975.) * ((1. / structural_parameter) - 1.)
-    if tau < 1:
-        f = 1. - (1. / A) * (79. / (140. * structural_parameter * tau)
-                             + (474. / 497.) * (1. / structural_parameter - 1.) * (np.power(tau, 3.) / 6.
-                                                                                   + np.power(
-                                                                                   tau, 9.) / 135.
-                                                                                   + np.power(tau, 15.) / 600.))
-        dfdtau = -(1. / A) * (-79. / (140. * structural_parameter * tau * tau)
-                              + (474. / 497.) * (1. / structural_parameter - 1.) * (tau * tau / 2.
-                                                                                    + np.power(
-                                                                                    tau, 8.) / 15.
-                                                                                    + np.power(tau, 14.) / 40.))
-        d2fdtau2 = -(1. / A) * (2. * 79. / (140. * structural_parameter * np.power(tau, 3.))
-                                + (474. / 497.) * (1. / structural_parameter - 1.) * (tau
-                                                                                      + 8. *
-                                                                                      np.power(
-                                                                                      tau, 7.) / 15.
-                                                                                      + 14. * np.power(tau, 13.) / 40.))
-
-    else:
-        f = - \
+    A = constants['A']
+    B = constants['B']
+    C = constants['C']
+    # Both branches are evaluated and the one corresponding
+    # to tau < 1 (or tau >= 1) is chosen elementwise
+    with np.errstate(divide='ignore', over='ignore', invalid='ignore'):
+        f_lo = 1. - (1. / A) * (79. / (C * tau)
+                                + B * (np.power(tau, 3.) / 6.
+                                       + np.power(tau, 9.) / 135.
+                                       + np.power(tau, 15.) / 600.))
+        dfdtau_lo = -(1. / A) * (-79. / (C * tau * tau)
+                                 + B * (tau * tau / 2.
+                                        + np.power(tau, 8.) / 15.
+                                        + np.power(tau, 14.) / 40.))
+        d2fdtau2_lo = -(1. / A) * (2. * 79. / (C * np.power(tau, 3.))
+                                   + B * (tau
+                                          + 8. * np.power(tau, 7.) / 15.
+                                          + 14. * np.power(tau, 13.) / 40.))
+
+        f_hi = - \
             (1. / A) * (np.power(tau, -5.) / 10. + np.power(
                 tau, -15.) / 315. + np.power(tau, -25.) / 1500.)
-        dfdtau = (1. / A) * (np.power(tau, -6.) / 2. +
+        dfdtau_hi = (1. / A) * (np.power(tau, -6.) / 2. +
                              np.power(tau, -16.) / 21. + np.power(tau, -26.) / 60.)
-        d2fdtau2 = - \
+        d2fdtau2_hi = - \
             (1. / A) * (6. * np.power(tau, -7.) / 2. + 16. *
                         np.power(tau, -17.) / 21. + 26. * np.power(tau, -27.) / 60.)
 
+    below_curie = tau < 1
+    f = _where(below_curie, f_lo, f_hi)
+    dfdtau = _where(below_curie, dfdtau_lo, dfdtau_hi)
+    d2fdtau2 = _where(below_curie, d2fdtau2_lo, d2fdtau2_hi)
+
     dfdT = dfdtau * dtaudT
     d2fdT2 = d2fdtau2 * dtaudT * dtaudT
     dfdP = dfdtau * dtaudP
@@ -321,10 +467,97 @@ def _magnetic_excesses_chs(pressure, temperature, params):
     return excesses
 
 
-def calculate_property_modifications(mineral):
+# The functions calculating the excesses of each type of modifier,
+# and the functions calculating their state-independent constants
+_modifier_functions = {'landau': (_landau_excesses, None),
+                       'landau_hp': (_landau_hp_excesses, _landau_hp_constants),
+                       'linear': (_linear_excesses, None),
+                       'bragg_williams': (_bragg_williams_excesses,
+                                          _bragg_williams_constants),
+                       'magnetic_chs': (_magnetic_excesses_chs, _magnetic_chs_constants)}
+
+_excess_names = ['G', 'dGdT', 'dGdP', 'd2GdT2', 'd2GdP2', 'd2GdPdT']
+
+
+def compile_property_modifiers(property_modifiers):
+    """
+    Resolves a list of property modifiers (pairs of a modifier type and
+    its parameters) to the functions which calculate their excesses,
+    and precomputes the state-independent constants of each modifier.
+    This is done when a :class:`burnman.Mineral` is created,
+    and again if any of its property modifiers is replaced or
+    any of their parameters is changed.
+
+    Parameters
+    ----------
+    property_modifiers : list
+        List of [type, params] pairs, where type is one of
+        'landau', 'landau_hp', 'linear', 'bragg_williams' and 'magnetic_chs'.
+
+    Returns
+    -------
+    pipeline : list of tuples
+        One (excess function, params, constants) tuple for each modifier,
+        where constants is None for modifiers without
+        state-independent constants.
+    """
+    pipeline = []
+    for modifier in property_modifiers:
+        try:
+            xs_function, constants_function = _modifier_functions[modifier[0]]
+        except KeyError:
+            raise Exception('Property modifier type {0} not recognised. '
+                            'Valid types are {1}'.format(modifier[0],
+                                                         sorted(_modifier_functions.keys())))
+        constants = None
+        if constants_function is not None:
+            constants = constants_function(modifier[1])
+        pipeline.append((xs_function, modifier[1], constants))
+    return pipeline
+
+
+def _modifiers_key(property_modifiers):
+    """
+    Returns the types and parameter values of a list of property modifiers,
+    with the values copied to lists and floats, so that modifiers
+    which have been replaced or changed in place can be detected.
+    """
+    return [(modifier[0], sorted((key, np.asarray(value).tolist())
+                                 for key, value in modifier[1].items()))
+            for modifier in property_modifiers]
+
+
+def _mineral_pipeline(mineral):
+    """
+    Returns the compiled property modifiers of a mineral,
+    compiling them again if any of its property modifiers has been
+    replaced, added or removed, or if any of their parameters has been
+    changed since they were last compiled.
+    """
+    key = _modifiers_key(mineral.property_modifiers)
+    compiled = mineral.__dict__.get('_compiled_property_modifiers')
+    if compiled is None or compiled[0] != key:
+        compiled = (key, compile_property_modifiers(mineral.property_modifiers))
+        mineral._compiled_property_modifiers = compiled
+    return compiled[1]
+
+
+def calculate_property_modifications(mineral, order=2):
     """
     Sums the excesses from all the modifiers.
 
+    If order is 1, only the excess Gibbs energy and its first derivatives
+    ('G', 'dGdT' and 'dGdP') are returned, which is sufficient for the
+    calculation of the Gibbs energy, entropy and volume (and the
+    properties derived from them). Otherwise the second derivatives
+    are also returned.
+
+    The modifiers are evaluated with the pipeline compiled by
+    :func:`compile_property_modifiers`, and their excesses are summed
+    in a preallocated array (a list for a single state).
+    Minerals without modifiers return zero excesses
+    without evaluating anything.
+
     To calculate thermodynamic properties from the outputs,
     the following functions should be used
     (the _o suffix stands for original value):
@@ -342,23 +575,36 @@ def calculate_property_modifications(mineral):
     gr = alpha*K_T*V/C_v
     K_S = K_T*C_p/C_v
     """
-    excesses = {'G': 0., 'dGdT': 0., 'dGdP': 0.,
+    if not mineral.property_modifiers:
+        if order == 1:
+            return {'G': 0., 'dGdT': 0., 'dGdP': 0.}
+        return {'G': 0., 'dGdT': 0., 'dGdP': 0.,
                 'd2GdT2': 0., 'd2GdP2': 0., 'd2GdPdT': 0.}
-    for modifier in mineral.property_modifiers:
-        if modifier[0] == 'landau':
-            xs_function = _landau_excesses
-        if modifier[0] == 'landau_hp':
-            xs_function = _landau_hp_excesses
-        if modifier[0] == 'linear':
-            xs_function = _linear_excesses
-        if modifier[0] == 'bragg_williams':
-            xs_function = _bragg_williams_excesses
-        if modifier[0] == 'magnetic_chs':
-            xs_function = _magnetic_excesses_chs
-
-        xs_component = xs_function(
-            mineral.pressure, mineral.temperature, modifier[1])
-        for key in xs_component:
-            excesses[key] += xs_component[key]
+
+    names = _excess_names[:3] if order == 1 else _excess_names
+    P = mineral.pressure
+    T = mineral.temperature
+    if isinstance(P, np.ndarray) or isinstance(T, np.ndarray):
+        # one row of the preallocated array for each excess
+        accumulated = np.zeros((len(names),) + np.broadcast(P, T).shape)
+        excesses = dict(zip(names, accumulated))
+    else:
+        excesses = dict.fromkeys(names, 0.)
+
+    order_parameters = mineral.__dict__.setdefault('_order_parameters', {})
+    for i, (xs_function, params, constants) in enumerate(_mineral_pipeline(mineral)):
+        if xs_function is _bragg_williams_excesses:
+            # the order parameter at the previous state
+            # is used as the starting guess at the new state
+            xs_component = xs_function(P, T, params, order=order,
+                                       Q_guess=order_parameters.get(i),
+                                       constants=constants)
+            order_parameters[i] = xs_component['Q']
+        elif constants is None:
+            xs_component = xs_function(P, T, params)
+        else:
+            xs_component = xs_function(P, T, params, constants)
+        for name in names:
+            excesses[name] += xs_component[name]
 
     return excesses
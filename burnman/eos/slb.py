@@ -41,9 +41,9 @@ def _delta_pressure(x, pressure, temperature, V_0, T_0, Debye_0, n, a1_ii, a2_ii
 
     f = 0.5 * (pow(V_0 / x, 2. / 3.) - 1.)
     debye_temperature = Debye_0 * np.sqrt(1. + a1_ii * f + 1. / 2. * a2_iikk * f * f)
-    E_th = debye.thermal_energy(
+    E_th = debye._thermal_energy(
         temperature, debye_temperature, n)  # thermal energy at temperature T
-    E_th_ref = debye.thermal_energy(
+    E_th_ref = debye._thermal_energy(
         T_0, debye_temperature, n)  # thermal energy at reference temperature
     nu_o_nu0_sq = 1. + a1_ii * f + (1. / 2.) * a2_iikk * f * f  # EQ 41
     gr = 1. / 6. / nu_o_nu0_sq * (2. * f + 1.) * (a1_ii + a2_iikk * f)
@@ -61,6 +61,8 @@ class SLBBase(eos.EquationOfState):
     :class:`burnman.slb.SLB3` classes.
     """
 
+    vectorized = True
+
     def _debye_temperature(self, x, params):
         """
         Finite strain approximation for Debye Temperature [K]
@@ -110,6 +112,34 @@ class SLBBase(eos.EquationOfState):
 
         return eta_s
 
+    # The following functions return intermediate values which are needed by
+    # more than one of the functions below. They are stored in the
+    # dictionary c returned by self._intermediates(temperature, volume, params),
+    # so that each of them is only calculated once per state.
+    def _cached_debye_temperature(self, c, volume, params):
+        if 'debye_T' not in c:
+            c['debye_T'] = self._debye_temperature(params['V_0'] / volume, params)
+        return c['debye_T']
+
+    def _cached_grueneisen_parameter(self, c, volume, params):
+        if 'gr' not in c:
+            c['gr'] = self.grueneisen_parameter(0., 0., volume, params)
+        return c['gr']
+
+    def _cached_thermal_energies(self, c, temperature, volume, params):
+        if 'E_th' not in c:
+            debye_T = self._cached_debye_temperature(c, volume, params)
+            c['E_th'] = debye.thermal_energy(temperature, debye_T, params['n'])
+            c['E_th_ref'] = debye.thermal_energy(params['T_0'], debye_T, params['n'])
+        return c['E_th'], c['E_th_ref']
+
+    def _cached_heat_capacities(self, c, temperature, volume, params):
+        if 'C_v' not in c:
+            debye_T = self._cached_debye_temperature(c, volume, params)
+            c['C_v'] = debye.heat_capacity_v(temperature, debye_T, params['n'])
+            c['C_v_ref'] = debye.heat_capacity_v(params['T_0'], debye_T, params['n'])
+        return c['C_v'], c['C_v_ref']
+
     # calculate isotropic thermal pressure, see
     # Matas et. al. (2007) eq B4
     def _thermal_pressure(self, T, V, params):
@@ -121,6 +151,10 @@ class SLBBase(eos.EquationOfState):
     def volume(self, pressure, temperature, params):
         """
         Returns molar volume. :math:`[m^3]`
+
+        Arrays of states are first solved with :func:`solve_volumes`,
+        and the states which have not converged are solved with
+        a bracketing solver.
         """
         T_0 = params['T_0']
         Debye_0 = params['Debye_0']
@@ -134,28 +168,128 @@ class SLBBase(eos.EquationOfState):
         b_iikk = 9. * params['K_0']  # EQ 28
         b_iikkmm = 27. * params['K_0'] * (params['Kprime_0'] - 4.)  # EQ 29z
 
+        if np.ndim(pressure) > 0 or np.ndim(temperature) > 0:
+            volumes, converged = self.solve_volumes(pressure, temperature, params)
+            # fall back to the bracketing solver wherever the
+            # Newton iteration failed
+            pressure, temperature = np.broadcast_arrays(pressure, temperature)
+            for i in zip(*np.nonzero(~converged)):
+                volumes[i] = self._volume(pressure[i], temperature[i], V_0, T_0, Debye_0,
+                                          n, a1_ii, a2_iikk, b_iikk, b_iikkmm)
+            return volumes
+
+        return self._volume(pressure, temperature, V_0, T_0, Debye_0,
+                            n, a1_ii, a2_iikk, b_iikk, b_iikkmm)
+
+    def _volume(self, pressure, temperature, V_0, T_0, Debye_0,
+                n, a1_ii, a2_iikk, b_iikk, b_iikkmm):
         # we need to have a sign change in [a,b] to find a zero. Let us start with a
         # conservative guess:
         args = (pressure, temperature, V_0, T_0,
                 Debye_0, n, a1_ii, a2_iikk, b_iikk, b_iikkmm)
         try:
-            sol = bracket(_delta_pressure, params[
-                          'V_0'], 1.e-2 * params['V_0'], args)
+            sol = bracket(_delta_pressure, V_0, 1.e-2 * V_0, args)
         except ValueError:
             raise Exception(
                 'Cannot find a volume, perhaps you are outside of the range of validity for the equation of state?')
-        return opt.brentq(_delta_pressure, sol[0], sol[1], args=args)
+        # the default absolute tolerance of brentq corresponds to a relative
+        # precision of only ~1e-7 in volume, so use a relative tolerance here
+        return opt.brentq(_delta_pressure, sol[0], sol[1], args=args,
+                          xtol=1.e-14 * V_0)
+
+    def solve_volumes(self, pressure, temperature, params, V_guess=None,
+                      rtol=1.e-12, max_iterations=100):
+        """
+        Finds the molar volumes at arrays of pressures and temperatures.
+        All the states are solved simultaneously with a safeguarded
+        Newton iteration, using the isothermal bulk modulus for the
+        derivative of the pressure with respect to volume.
+        Each step changes the volumes by at most a factor of 4/3.
+        Whenever a Newton step leaves the interval known to contain
+        the root, it is replaced by a bisection step.
+
+        Parameters
+        ----------
+        pressure : float or array of floats
+            Pressures [Pa].
+        temperature : float or array of floats
+            Temperatures [K].
+        params : dictionary
+            Parameters of the mineral.
+        V_guess : float or array of floats (optional)
+            Starting guesses for the volumes [m^3]. Defaults to V_0.
+        rtol : float (optional)
+            Relative size of the last volume update below which
+            a state is considered converged.
+        max_iterations : int (optional)
+            Maximum number of iterations.
+
+        Returns
+        -------
+        volumes : array of floats
+            Molar volumes [m^3], with the broadcast shape of pressure and temperature.
+        converged : array of bools
+            False for the states for which the iteration did not converge.
+        """
+        pressure, temperature = np.broadcast_arrays(np.asarray(pressure, dtype=float),
+                                                    np.asarray(temperature, dtype=float))
+        shape = pressure.shape
+        P = pressure.flatten()
+        T = temperature.flatten()
+
+        if V_guess is None:
+            V = np.full(P.shape, params['V_0'])
+        else:
+            V = np.array(np.broadcast_to(V_guess, shape), dtype=float).flatten()
+        V_min = np.full(P.shape, 1.e-2 * params['V_0'])
+        V_max = np.full(P.shape, np.inf)
+        converged = np.zeros(P.shape, dtype=bool)
+
+        active = np.arange(P.size)
+        for i in range(max_iterations):
+            if active.size == 0:
+                break
+
+            V_a = V[active]
+            with np.errstate(all='ignore'):
+                delta_P = self.pressure(T[active], V_a, params) - P[active]
+                K_T = self.isothermal_bulk_modulus(P[active], T[active], V_a, params)
+                V_new = V_a + delta_P * V_a / K_T
+                # limit the steps far from the root, where the Newton step
+                # can reach volumes at which the Debye temperature is undefined
+                V_new = np.clip(V_new, 0.75 * V_a, 4. / 3. * V_a)
+
+            # Pressure decreases with increasing volume. States where the
+            # pressure cannot be calculated are treated as being too large.
+            too_small = delta_P > 0.
+            V_min[active] = np.where(too_small, np.maximum(V_min[active], V_a), V_min[active])
+            V_max[active] = np.where(too_small, V_max[active], np.minimum(V_max[active], V_a))
+
+            done = (delta_P == 0.) | ((K_T > 0.) & (np.abs(V_new - V_a) <= rtol * V_a))
+
+            # safeguard: bisect (or expand the search upwards if no upper
+            # bound is known yet) if the Newton step is not acceptable
+            V_lo = V_min[active]
+            V_hi = V_max[active]
+            bad_step = ~(done | ((V_new > V_lo) & (V_new < V_hi) & (K_T > 0.)))
+            V_new = np.where(bad_step,
+                             np.where(np.isinf(V_hi), 2. * V_a, 0.5 * (V_lo + V_hi)),
+                             V_new)
+
+            V[active] = np.where(delta_P == 0., V_a, V_new)
+            converged[active[done]] = True
+            active = active[~done]
+
+        return V.reshape(shape), converged.reshape(shape)
 
     def pressure(self, temperature, volume, params):
         """
         Returns the pressure of the mineral at a given temperature and volume [Pa]
         """
-        debye_T = self._debye_temperature(params['V_0'] / volume, params)
-        gr = self.grueneisen_parameter(
-            0.0, temperature, volume, params)  # does not depend on pressure
-        E_th = debye.thermal_energy(temperature, debye_T, params['n'])
-        E_th_ref = debye.thermal_energy(
-            params['T_0'], debye_T, params['n'])  # thermal energy at reference temperature
+        c = self._intermediates(temperature, volume, params)
+        gr = self._cached_grueneisen_parameter(c, volume, params)
+        # thermal energies at temperature T and at the reference temperature
+        E_th, E_th_ref = self._cached_thermal_energies(c, temperature, volume, params)
 
         b_iikk = 9. * params['K_0']  # EQ 28
         b_iikkmm = 27. * params['K_0'] * (params['Kprime_0'] - 4.)  # EQ 29
@@ -176,19 +310,17 @@ class SLBBase(eos.EquationOfState):
         """
         Returns isothermal bulk modulus :math:`[Pa]`
         """
-        T_0 = params['T_0']
-        debye_T = self._debye_temperature(params['V_0'] / volume, params)
-        gr = self.grueneisen_parameter(pressure, temperature, volume, params)
+        c = self._intermediates(temperature, volume, params)
+        if 'K_T' in c:  # does not depend on pressure
+            return c['K_T']
 
-        E_th = debye.thermal_energy(
-            temperature, debye_T, params['n'])  # thermal energy at temperature T
-        E_th_ref = debye.thermal_energy(
-            T_0, debye_T, params['n'])  # thermal energy at reference temperature
+        T_0 = params['T_0']
+        gr = self._cached_grueneisen_parameter(c, volume, params)
 
-        C_v = debye.heat_capacity_v(
-            temperature, debye_T, params['n'])  # heat capacity at temperature T
-        C_v_ref = debye.heat_capacity_v(
-            T_0, debye_T, params['n'])  # heat capacity at reference temperature
+        # thermal energies and heat capacities at temperature T
+        # and at the reference temperature
+        E_th, E_th_ref = self._cached_thermal_energies(c, temperature, volume, params)
+        C_v, C_v_ref = self._cached_heat_capacities(c, temperature, volume, params)
 
         q = self.volume_dependent_q(params['V_0'] / volume, params)
 
@@ -196,6 +328,7 @@ class SLBBase(eos.EquationOfState):
             + (gr + 1. - q) * (gr / volume) * (E_th - E_th_ref) \
             - (pow(gr, 2.) / volume) * (C_v * temperature - C_v_ref * T_0)
 
+        c['K_T'] = K
         return K
 
     def adiabatic_bulk_modulus(self, pressure, temperature, volume, params):
@@ -205,7 +338,8 @@ class SLBBase(eos.EquationOfState):
         K_T = self.isothermal_bulk_modulus(
             pressure, temperature, volume, params)
         alpha = self.thermal_expansivity(pressure, temperature, volume, params)
-        gr = self.grueneisen_parameter(pressure, temperature, volume, params)
+        gr = self._cached_grueneisen_parameter(
+            self._intermediates(temperature, volume, params), volume, params)
         K_S = K_T * (1. + gr * alpha * temperature)
         return K_S
 
@@ -213,12 +347,10 @@ class SLBBase(eos.EquationOfState):
         """
         Returns shear modulus. :math:`[Pa]`
         """
-        T_0 = params['T_0']
-        debye_T = self._debye_temperature(params['V_0'] / volume, params)
+        c = self._intermediates(temperature, volume, params)
         eta_s = self._isotropic_eta_s(params['V_0'] / volume, params)
 
-        E_th = debye.thermal_energy(temperature, debye_T, params['n'])
-        E_th_ref = debye.thermal_energy(T_0, debye_T, params['n'])
+        E_th, E_th_ref = self._cached_thermal_energies(c, temperature, volume, params)
 
         if self.order == 2:
             return bm.shear_modulus_second_order(volume, params) - eta_s * (E_th - E_th_ref) / volume
@@ -231,16 +363,17 @@ class SLBBase(eos.EquationOfState):
         """
         Returns heat capacity at constant volume. :math:`[J/K/mol]`
         """
-        debye_T = self._debye_temperature(params['V_0'] / volume, params)
-        return debye.heat_capacity_v(temperature, debye_T, params['n'])
+        c = self._intermediates(temperature, volume, params)
+        return self._cached_heat_capacities(c, temperature, volume, params)[0]
 
     def heat_capacity_p(self, pressure, temperature, volume, params):
         """
         Returns heat capacity at constant pressure. :math:`[J/K/mol]`
         """
+        c = self._intermediates(temperature, volume, params)
         alpha = self.thermal_expansivity(pressure, temperature, volume, params)
-        gr = self.grueneisen_parameter(pressure, temperature, volume, params)
-        C_v = self.heat_capacity_v(pressure, temperature, volume, params)
+        gr = self._cached_grueneisen_parameter(c, volume, params)
+        C_v = self._cached_heat_capacities(c, temperature, volume, params)[0]
         C_p = C_v * (1. + gr * alpha * temperature)
         return C_p
 
@@ -248,8 +381,9 @@ class SLBBase(eos.EquationOfState):
         """
         Returns thermal expansivity. :math:`[1/K]`
         """
-        C_v = self.heat_capacity_v(pressure, temperature, volume, params)
-        gr = self.grueneisen_parameter(pressure, temperature, volume, params)
+        c = self._intermediates(temperature, volume, params)
+        C_v = self._cached_heat_capacities(c, temperature, volume, params)[0]
+        gr = self._cached_grueneisen_parameter(c, volume, params)
         K = self.isothermal_bulk_modulus(pressure, temperature, volume, params)
         alpha = gr * C_v / K / volume
         return alpha
@@ -274,9 +408,11 @@ class SLBBase(eos.EquationOfState):
         """
         Returns the entropy at the pressure and temperature of the mineral [J/K/mol]
         """
-        Debye_T = self._debye_temperature(params['V_0'] / volume, params)
-        S = debye.entropy(temperature, Debye_T, params['n'])
-        return S
+        c = self._intermediates(temperature, volume, params)
+        if 'S' not in c:
+            Debye_T = self._cached_debye_temperature(c, volume, params)
+            c['S'] = debye.entropy(temperature, Debye_T, params['n'])
+        return c['S']
 
     def enthalpy(self, pressure, temperature, volume, params):
         """
@@ -293,11 +429,14 @@ class SLBBase(eos.EquationOfState):
         """
         x = params['V_0'] / volume
         f = 1. / 2. * (pow(x, 2. / 3.) - 1.)
-        Debye_T = self._debye_temperature(params['V_0'] / volume, params)
 
-        F_quasiharmonic = debye.helmholtz_free_energy(temperature, Debye_T, params['n']) - \
-            debye.helmholtz_free_energy(
-                params['T_0'], Debye_T, params['n'])
+        c = self._intermediates(temperature, volume, params)
+        if 'F_qh' not in c:
+            Debye_T = self._cached_debye_temperature(c, volume, params)
+            c['F_qh'] = debye.helmholtz_free_energy(temperature, Debye_T, params['n']) - \
+                debye.helmholtz_free_energy(
+                    params['T_0'], Debye_T, params['n'])
+        F_quasiharmonic = c['F_qh']
 
         b_iikk = 9. * params['K_0']  # EQ 28
         b_iikkmm = 27. * params['K_0'] * (params['Kprime_0'] - 4.)  # EQ 29
@@ -56,7 +56,7 @@ def anderson(depths):
     return temperature
 
 
-def adiabatic(pressures, T0, rock):
+def adiabatic(pressures, T0, rock, rtol=1.e-10, max_iterations=50):
     """
     This calculates a geotherm based on an anchor temperature and a rock,
     assuming that the rock's temperature follows an adiabatic gradient with
@@ -68,30 +68,112 @@ def adiabatic(pressures, T0, rock):
     where :math:`\\gamma` is the Grueneisen parameter and :math:`K_s` is
     the adiabatic bulk modulus.
 
+    Rather than integrating this equation numerically, the temperatures are
+    found on the isentrope of the rock, by solving
+    :math:`S(P, T) = S(P_0, T_0)` at each pressure with Newton's method
+    (using :math:`\\partial S / \\partial T = C_p / T`).
+    Each iteration starts from the temperature extrapolated from the
+    previous pressure along the adiabatic gradient, so that only a few
+    evaluations of the rock are required at each pressure.
+    If the equation of state of the rock does not provide the entropy,
+    or if the minerals of the rock change between two pressures
+    (e.g. in a :class:`burnman.mineral_helpers.HelperSpinTransition`),
+    :func:`dTdP` is integrated numerically instead, so that the latent heat
+    of such transitions is not included in the adiabat.
+
+    If an array of anchor temperatures is given, one adiabat is calculated
+    for each of them. If the rock is :func:`~burnman.Material.vectorized`,
+    all the adiabats are calculated together, evaluating the rock
+    at all the anchor temperatures at once.
+
     Parameters
     ----------
 
     pressures : list of floats
         The list of pressures in :math:`[Pa]` at which to evaluate the geotherm.
 
-    T0 : float
+    T0 : float or array of floats
         An anchor temperature, corresponding to the temperature of the first
-        pressure in the list. :math:`[K]`
+        pressure in the list, or an array of anchor temperatures. :math:`[K]`
 
     rock : :class:`burnman.composite`
         Material for which we compute the adiabat.  From this material we
-        must compute average Grueneisen parameters and adiabatic bulk moduli
-        for each pressure/temperature.
+        must compute the entropy, heat capacity, thermal expansivity
+        and volume for each pressure/temperature (or the average Grueneisen
+        parameters and adiabatic bulk moduli if the entropy is not available).
+
+    rtol : float (optional)
+        Relative size of the last temperature update below which
+        the temperature at a pressure is considered converged.
+
+    max_iterations : int (optional)
+        Maximum number of Newton iterations at each pressure.
 
     Returns
     -------
 
     temperature: list of floats
         The list of temperatures for each pressure. :math:`[K]`
+        If T0 is an array, temperature[i] is the adiabat anchored at T0[i].
+    """
+    T0 = np.asarray(T0, dtype=float)
+    if T0.ndim > 0 and not rock.vectorized:
+        return np.array([adiabatic(pressures, T, rock, rtol, max_iterations)
+                         for T in T0.flat]).reshape(T0.shape + (len(pressures),))
+
+    # temperatures[i] contains the temperatures at pressures[i] for all anchors
+    temperatures = np.empty((len(pressures),) + T0.shape)
+    temperatures[0] = T0
+    rock.set_state(np.full(T0.shape, pressures[0])[()], temperatures[0])
+    try:
+        S_0 = rock.molar_entropy
+    except NotImplementedError:
+        return _integrated_adiabat(pressures, T0, rock)
+    minerals = _unrolled_minerals(rock)
+
+    for i in range(1, len(pressures)):
+        P = np.full(T0.shape, pressures[i])[()]
+        # starting guess from the adiabatic gradient
+        # dT/dP = alpha V T / C_p at the previous pressure
+        T = temperatures[i - 1] + (pressures[i] - pressures[i - 1]) * temperatures[i - 1] \
+            * rock.thermal_expansivity * rock.molar_volume / rock.heat_capacity_p
+        rock.set_state(P, T)
+        if _unrolled_minerals(rock) != minerals:
+            # the entropy jumps between the pressures
+            T = _integrated_adiabat(pressures[i - 1:i + 1], temperatures[i - 1], rock)[..., -1]
+            rock.set_state(P, T)
+            S_0 = rock.molar_entropy
+            minerals = _unrolled_minerals(rock)
+        for n in range(max_iterations):
+            delta_T = (S_0 - rock.molar_entropy) * T / rock.heat_capacity_p
+            T = T + delta_T
+            if np.all(np.abs(delta_T) <= rtol * T):
+                break
+            rock.set_state(P, T)
+        else:
+            raise Exception('The adiabat did not converge at {0:.4e} Pa'.format(pressures[i]))
+        temperatures[i] = T
+
+    return np.moveaxis(temperatures, 0, -1)
+
+
+def _unrolled_minerals(rock):
+    """
+    Returns the identities of the minerals which are present
+    in the unrolled rock in its current state.
+    """
+    return [id(mineral) for (mineral, fraction) in zip(*rock.unroll())
+            if np.any(np.asarray(fraction) > 0.)]
+
+
+def _integrated_adiabat(pressures, T0, rock):
+    """
+    Integrates :func:`dTdP` from the anchor temperature(s) T0
+    at pressures[0] over the pressures.
     """
-    temperatures = integrate.odeint(
-        lambda t, p: dTdP(t, p, rock), T0, pressures)
-    return temperatures.ravel()
+    T0 = np.asarray(T0, dtype=float)
+    return np.array([integrate.odeint(lambda t, p: dTdP(t, p, rock), T, pressures).ravel()
+                     for T in T0.flat]).reshape(T0.shape + (len(pressures),))
 
 
 def dTdP(temperature, pressure, rock):
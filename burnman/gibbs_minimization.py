@@ -0,0 +1,755 @@
+# This file is part of BurnMan - a thermoelastic and thermodynamic toolkit for the Earth and Planetary Sciences
+# Copyright (C) 2012 - 2017 by the BurnMan team, released under the GNU
+# GPL v2 or later.
+
+from __future__ import absolute_import
+
+import warnings
+
+import numpy as np
+from scipy.optimize import linprog, minimize
+
+from . import constants
+from .composite import Composite
+from .solidsolution import SolidSolution
+from .processchemistry import compositional_array, ordered_compositional_array
+
+
+def simplex_grid(n_components, n_divisions):
+    """
+    Returns the points of a regular grid on the simplex of
+    n_components molar fractions, with n_divisions intervals along each edge.
+
+    Parameters
+    ----------
+    n_components : int
+        Number of molar fractions.
+    n_divisions : int
+        Number of intervals along each edge of the simplex.
+
+    Returns
+    -------
+    points : 2D array of floats
+        Array of shape (n_points, n_components), where each row sums to one.
+    """
+    def integer_points(n_components, total):
+        if n_components == 1:
+            return [[total]]
+        return [[i] + point for i in range(total, -1, -1)
+                for point in integer_points(n_components - 1, total - i)]
+    return np.array(integer_points(n_components, n_divisions), dtype=float) / n_divisions
+
+
+class EquilibriumAssemblage(object):
+    """
+    The stable assemblage found by :class:`burnman.GibbsMinimizer`
+    at a given pressure and temperature.
+
+    Attributes
+    ----------
+    pressure : float
+        Pressure [Pa].
+    temperature : float
+        Temperature [K].
+    phases : list of :class:`burnman.Mineral`
+        The stable phases.
+    molar_amounts : array of floats
+        The number of moles of each stable phase (per formula unit of the
+        bulk composition given to the minimizer).
+    compositions : list
+        The molar fractions of the endmembers of each stable phase
+        (None for phases which are not solid solutions).
+    gibbs : float
+        The Gibbs free energy of the assemblage [J].
+    elements : list of strings
+        The elements of the bulk composition.
+    chemical_potentials : array of floats
+        The chemical potentials of the elements [J/mol]. If the stable
+        phases do not constrain all the potentials (e.g. for a bulk
+        composition on a join), the minimum norm solution is returned.
+    """
+
+    def __init__(self, pressure, temperature, phases, molar_amounts,
+                 compositions, gibbs, elements, chemical_potentials):
+        self.pressure = pressure
+        self.temperature = temperature
+        self.phases = phases
+        self.molar_amounts = molar_amounts
+        self.compositions = compositions
+        self.gibbs = gibbs
+        self.elements = elements
+        self.chemical_potentials = chemical_potentials
+
+    @property
+    def molar_fractions(self):
+        """
+        The molar fractions of the stable phases.
+        """
+        return self.molar_amounts / np.sum(self.molar_amounts)
+
+    def component_potentials(self, component_formulae):
+        """
+        Returns the chemical potentials of chemical components
+        (see also :func:`burnman.chemicalpotentials.chemical_potentials`).
+
+        Parameters
+        ----------
+        component_formulae : list of dictionaries
+            List of chemical component formula dictionaries,
+            made of the elements of the bulk composition.
+
+        Returns
+        -------
+        component_potentials : array of floats
+            Array of chemical potentials of the components [J/mol].
+        """
+        return np.dot(ordered_compositional_array(component_formulae, self.elements),
+                      self.chemical_potentials)
+
+    def composite(self):
+        """
+        Returns a :class:`burnman.Composite` of the stable phases
+        in their molar fractions. The compositions of the
+        solid solutions are set to their equilibrium compositions
+        (note that this changes the solid solution objects
+        passed to the minimizer).
+        """
+        for phase, composition in zip(self.phases, self.compositions):
+            if composition is not None:
+                phase.set_composition(composition)
+        return Composite(self.phases, self.molar_fractions)
+
+
+class GibbsMinimizer(object):
+    """
+    Finds the stable assemblage of a set of phases at a given pressure,
+    temperature and bulk composition, by minimizing the Gibbs free energy
+    over the amounts of the phases and the compositions of the solid
+    solutions, subject to the conservation of the elements.
+
+    The minimization is done in two stages:
+
+    1. A global search, in which each solid solution is represented by
+       pseudocompounds with compositions on a regular grid of molar
+       fractions (and each pure phase by itself). The assemblage
+       of pseudocompounds with the lowest Gibbs free energy is found
+       by linear programming.
+
+    2. A local refinement, in which the amounts of the endmembers of the
+       phases found by the global search are optimized with SLSQP,
+       using the analytic partial Gibbs free energies of the endmembers
+       as gradients. Phases which have a negative driving force with
+       respect to the chemical potentials of the refined assemblage
+       are added and the refinement is repeated. The result is polished
+       with Newton's method.
+
+    Along paths of pressure and temperature (see :func:`equilibrate_path`
+    and :func:`grid`), the assemblage at the previous point is updated by
+    Newton's method instead, and the global search is only done if phases
+    appear or disappear. The endmember properties, the element constraints
+    and the pseudocompound compositions are set up once. Each solid
+    solution can only be present once in an assemblage; to model a solvus,
+    pass two copies of the solution.
+
+    This class is available as ``burnman.GibbsMinimizer``.
+
+    Parameters
+    ----------
+    phases : list of :class:`burnman.Mineral`
+        The candidate phases (minerals and solid solutions). The method
+        of the minerals should already have been set.
+    bulk_composition : dictionary
+        The bulk composition, as a dictionary of elements and their
+        molar amounts (as for the formulae of minerals).
+    n_divisions : int (optional)
+        Number of intervals along each edge of the composition simplex
+        for the pseudocompounds of the solid solutions.
+    tol : float (optional)
+        Phases whose molar amounts are smaller than tol times the
+        total amount are removed from the assemblage.
+    """
+
+    def __init__(self, phases, bulk_composition, n_divisions=10, tol=1.e-8):
+        self.phases = phases
+        self.n_divisions = n_divisions
+        self.tol = tol
+
+        endmembers = []
+        for phase in phases:
+            if isinstance(phase, SolidSolution):
+                endmembers.append([e[0] for e in phase.endmembers])
+            else:
+                endmembers.append([phase])
+
+        formulae = [e.params['formula'] for phase_endmembers in endmembers
+                    for e in phase_endmembers]
+        endmember_compositions, elements = compositional_array(formulae)
+        for element in bulk_composition:
+            if element not in elements:
+                raise Exception('Element ' + element + ' of the bulk composition '
+                                'is not in any of the phases')
+        bulk = ordered_compositional_array([bulk_composition], elements)[0]
+
+        # endmembers with elements which are not in the bulk composition
+        # cannot be present
+        allowed = np.all(endmember_compositions[:, bulk < 1.e-12] < 1.e-12, axis=1)
+
+        self.elements = [e for e, b in zip(elements, bulk) if b >= 1.e-12]
+        self.bulk_composition = bulk[bulk >= 1.e-12]
+        element_indices = bulk >= 1.e-12
+
+        # the variables of the minimization are the molar amounts of the
+        # allowed endmembers of each phase
+        self._endmembers = []
+        self._indices = []
+        self._variables = []
+        start = 0
+        n_variables = 0
+        for phase, phase_endmembers in zip(phases, endmembers):
+            indices = np.arange(len(phase_endmembers))[allowed[start:start + len(phase_endmembers)]]
+            self._endmembers.append(phase_endmembers)
+            self._indices.append(indices)
+            self._variables.append(np.arange(n_variables, n_variables + len(indices)))
+            start += len(phase_endmembers)
+            n_variables += len(indices)
+        self._n_variables = n_variables
+
+        self._compositions = endmember_compositions[allowed][:, element_indices]
+
+        # independent linear combinations of the element constraints
+        u, s, v = np.linalg.svd(self._compositions.T, full_matrices=False)
+        rank = np.sum(s > 1.e-10 * s[0])
+        self._constraint_matrix = np.dot(u[:, :rank].T, self._compositions.T)
+        self._constraint_vector = np.dot(u[:, :rank].T, self.bulk_composition)
+        residual = self.bulk_composition - np.dot(u[:, :rank], self._constraint_vector)
+        if np.any(np.abs(residual) > 1.e-10 * np.max(self.bulk_composition)):
+            raise Exception('The bulk composition cannot be made '
+                            'from the endmembers of the phases')
+
+        # pseudocompounds (phase index, molar fractions of the allowed endmembers)
+        self._phase_pseudocompounds = []
+        for i, phase in enumerate(phases):
+            if len(self._indices[i]) == 0:
+                self._phase_pseudocompounds.append(np.empty((0, 0)))
+            elif isinstance(phase, SolidSolution):
+                self._phase_pseudocompounds.append(simplex_grid(len(self._indices[i]),
+                                                                n_divisions))
+            else:
+                self._phase_pseudocompounds.append(np.ones((1, 1)))
+        self._pseudocompounds = [(i, x) for i, points in enumerate(self._phase_pseudocompounds)
+                                 for x in points]
+        self._pseudocompound_constraints = np.array(
+            [np.dot(self._constraint_matrix[:, self._variables[i]], x)
+             for (i, x) in self._pseudocompounds]).T
+
+    def _molar_fractions(self, i, x):
+        """
+        Returns the molar fractions of all the endmembers of the ith phase
+        from the molar fractions of its allowed endmembers.
+        """
+        molar_fractions = np.zeros(len(self._endmembers[i]))
+        molar_fractions[self._indices[i]] = x
+        return molar_fractions
+
+    def _endmember_gibbs(self, pressure, temperature):
+        """
+        Returns the Gibbs free energies of the allowed endmembers of each phase.
+        """
+        gibbs = []
+        for phase_endmembers, indices in zip(self._endmembers, self._indices):
+            values = []
+            for j in indices:
+                phase_endmembers[j].set_state(pressure, temperature, 'thermodynamic')
+                values.append(phase_endmembers[j].gibbs)
+            gibbs.append(np.array(values))
+        return gibbs
+
+    def _phase_partial_gibbs(self, i, pressure, temperature, gibbs, x):
+        """
+        Returns the partial Gibbs free energies of the allowed endmembers
+        of the ith phase at molar fractions x of these endmembers.
+        """
+        mu = gibbs[i]
+        if isinstance(self.phases[i], SolidSolution):
+            excess = self.phases[i].solution_model.excess_partial_gibbs_free_energies(
+                pressure, temperature, self._molar_fractions(i, x))
+            mu = mu + excess[self._indices[i]]
+        return mu
+
+    def _phase_hessian(self, i, pressure, temperature, x):
+        """
+        Returns the derivatives of the partial Gibbs free energies of the
+        allowed endmembers of the ith phase (a solid solution) with respect to
+        the amounts of these endmembers, for one mole of the phase
+        with molar fractions x of these endmembers.
+        """
+        hessian = self.phases[i].solution_model.excess_gibbs_hessian(
+            pressure, temperature, self._molar_fractions(i, x))
+        return hessian[np.ix_(self._indices[i], self._indices[i])]
+
+    def _pseudocompound_gibbs(self, i, pressure, temperature, gibbs):
+        """
+        Returns the Gibbs free energies of the pseudocompounds of the ith phase.
+        """
+        x = self._phase_pseudocompounds[i]
+        mu = gibbs[i] * np.ones_like(x)
+        if isinstance(self.phases[i], SolidSolution) and len(x) > 0:
+            molar_fractions = np.zeros((len(x), len(self._endmembers[i])))
+            molar_fractions[:, self._indices[i]] = x
+            mu = mu + self.phases[i].solution_model.excess_partial_gibbs_free_energies(
+                pressure, temperature, molar_fractions)[:, self._indices[i]]
+        return np.sum(x * mu, axis=-1)
+
+    def _global_search(self, pressure, temperature, gibbs):
+        """
+        Finds the assemblage of pseudocompounds with the lowest Gibbs
+        free energy, and returns the amounts of the endmembers of this
+        assemblage and the Gibbs free energies of the pseudocompounds
+        of each phase.
+        """
+        G = [self._pseudocompound_gibbs(i, pressure, temperature, gibbs)
+             for i in range(len(self.phases))]
+        scale = constants.gas_constant * temperature
+        result = linprog(np.concatenate(G) / scale,
+                         A_eq=self._pseudocompound_constraints,
+                         b_eq=self._constraint_vector,
+                         bounds=(0., None), method='highs')
+        if result.status != 0:
+            raise Exception('The global search for the stable assemblage failed: ' +
+                            result.message)
+        amounts = np.zeros(self._n_variables)
+        for (i, x), amount in zip(self._pseudocompounds, result.x):
+            amounts[self._variables[i]] += amount * x
+        return amounts, G
+
+    def _present(self, amounts):
+        """
+        Returns a boolean array which is True for the phases
+        with molar amounts larger than tol times the total amount.
+        """
+        phase_amounts = np.array([np.sum(amounts[v]) for v in self._variables])
+        return phase_amounts > self.tol * np.sum(phase_amounts)
+
+    def _present_constraints(self, variables):
+        """
+        Returns independent linear combinations of the element constraints
+        on the amounts of the given endmembers (those of the present phases),
+        as a matrix and a vector.
+        """
+        A = self._constraint_matrix[:, variables]
+        u, s, v = np.linalg.svd(A, full_matrices=False)
+        rank = np.sum(s > 1.e-10 * s[0])
+        return np.dot(u[:, :rank].T, A), np.dot(u[:, :rank].T, self._constraint_vector)
+
+    def _local_refinement(self, pressure, temperature, gibbs, amounts, present):
+        """
+        Minimizes the Gibbs free energy of the present phases
+        with respect to the amounts of their endmembers.
+        If these amounts are fixed by the bulk composition,
+        they are found directly.
+        """
+        variables = np.concatenate([self._variables[i] for i in range(len(self.phases))
+                                    if present[i]])
+        A, b = self._present_constraints(variables)
+        if len(b) == len(variables):
+            amounts = np.zeros(self._n_variables)
+            amounts[variables] = np.linalg.solve(A, b)
+            return amounts
+
+        scale = constants.gas_constant * temperature
+        total = np.sum(amounts)
+        floor = 1.e-10 * total
+
+        bounds = []
+        for i in range(len(self.phases)):
+            if present[i]:
+                if isinstance(self.phases[i], SolidSolution):
+                    bounds.extend([(floor, None)] * len(self._variables[i]))
+                else:
+                    bounds.extend([(0., None)] * len(self._variables[i]))
+
+        def gibbs_and_gradient(m):
+            amounts = np.zeros(self._n_variables)
+            amounts[variables] = m
+            mu = self._partial_gibbs(pressure, temperature, gibbs, amounts, present)
+            return np.dot(m, mu[variables]) / scale, mu[variables] / scale
+
+        x0 = np.maximum(amounts[variables], [b[0] for b in bounds])
+        with warnings.catch_warnings():
+            # SLSQP steps may slightly overshoot the bounds
+            warnings.filterwarnings('ignore', 'Values in x were outside bounds')
+            result = minimize(gibbs_and_gradient, x0, jac=True, method='SLSQP',
+                              bounds=bounds,
+                              constraints={'type': 'eq',
+                                           'fun': lambda m: np.dot(A, m) - b,
+                                           'jac': lambda m: A},
+                              options={'ftol': 1.e-14, 'maxiter': 500})
+        if not result.success:
+            raise Exception('The local minimization of the Gibbs free energy failed: ' +
+                            result.message)
+        amounts = np.zeros(self._n_variables)
+        amounts[variables] = result.x
+        return amounts
+
+    def _partial_gibbs(self, pressure, temperature, gibbs, amounts, present):
+        """
+        Returns the partial Gibbs free energies of the allowed endmembers
+        of the present phases (zero for the other phases).
+        """
+        mu = np.zeros(self._n_variables)
+        for i in range(len(self.phases)):
+            if present[i] and len(self._variables[i]) > 0:
+                m = amounts[self._variables[i]]
+                if isinstance(self.phases[i], SolidSolution):
+                    m = m / np.sum(m)
+                mu[self._variables[i]] = self._phase_partial_gibbs(i, pressure, temperature,
+                                                                  gibbs, m)
+        return mu
+
+    def _newton(self, pressure, temperature, gibbs, amounts, present, max_iterations=50):
+        """
+        Minimizes the Gibbs free energy of the present phases with respect to
+        the amounts of their endmembers by Newton's method, solving for the
+        amounts and the Lagrange multipliers of the element constraints.
+        Returns None if the iterations do not converge, or if one of
+        the present phases disappears.
+        """
+        variables = np.concatenate([self._variables[i] for i in range(len(self.phases))
+                                    if present[i]])
+        A, b = self._present_constraints(variables)
+        n_variables = len(variables)
+        scale = constants.gas_constant * temperature
+
+        # the positions of the variables of each present phase
+        blocks = []
+        start = 0
+        for i in range(len(self.phases)):
+            if present[i]:
+                blocks.append((i, slice(start, start + len(self._variables[i]))))
+                start += len(self._variables[i])
+        solution = np.zeros(n_variables, dtype=bool)
+        for i, block in blocks:
+            solution[block] = isinstance(self.phases[i], SolidSolution)
+
+        m = np.array(amounts[variables], dtype=float)
+        m[solution] = np.maximum(m[solution], 1.e-10 * np.sum(m))
+        full_amounts = np.zeros(self._n_variables)
+        lmda = None
+        vanished = False
+        for iteration in range(max_iterations):
+            full_amounts[variables] = m
+            mu = self._partial_gibbs(pressure, temperature, gibbs,
+                                     full_amounts, present)[variables] / scale
+            if lmda is None:
+                lmda = np.linalg.lstsq(A.T, mu, rcond=None)[0]
+            residuals = np.concatenate((mu - np.dot(A.T, lmda), np.dot(A, m) - b))
+            if (np.max(np.abs(residuals[:n_variables])) < 1.e-10 and
+                    np.max(np.abs(residuals[n_variables:])) < 1.e-12 * np.max(np.abs(b))):
+                return full_amounts
+
+            jacobian = np.zeros((n_variables + len(b), n_variables + len(b)))
+            for i, block in blocks:
+                if isinstance(self.phases[i], SolidSolution):
+                    n = np.sum(m[block])
+                    jacobian[block, block] = self._phase_hessian(i, pressure, temperature,
+                                                                 m[block] / n) / (n * scale)
+            jacobian[:n_variables, n_variables:] = -A.T
+            jacobian[n_variables:, :n_variables] = A
+            try:
+                step = np.linalg.solve(jacobian, -residuals)
+            except np.linalg.LinAlgError:
+                return None
+            dm = step[:n_variables]
+
+            # phases which disappear in two successive steps have disappeared,
+            # otherwise the step is limited to halve their amounts
+            new_m = m + dm
+            alpha = 1.
+            vanishing = False
+            for i, block in blocks:
+                if np.sum(new_m[block]) <= self.tol * np.sum(new_m):
+                    if vanished:
+                        return None
+                    vanishing = True
+                    alpha = min(alpha, 0.5 * np.sum(m[block]) / -np.sum(dm[block]))
+            vanished = vanishing
+
+            # the amounts of the endmembers of the solutions stay positive
+            negative = solution & (new_m <= 0.)
+            if np.any(negative):
+                alpha = min(alpha, 0.9 * np.min(m[negative] / -dm[negative]))
+            m = m + alpha * dm
+            lmda = lmda + alpha * step[n_variables:]
+        return None
+
+    def _element_potentials(self, mu, present):
+        """
+        Returns the chemical potentials of the elements,
+        and a function which tests whether a composition lies in the
+        compositional space spanned by the present endmembers.
+        """
+        variables = np.concatenate([self._variables[i] for i in range(len(self.phases))
+                                    if present[i]])
+        compositions = self._compositions[variables]
+        potentials = np.linalg.lstsq(compositions, mu[variables], rcond=None)[0]
+
+        def spanned(composition):
+            c = np.linalg.lstsq(compositions.T, composition, rcond=None)[0]
+            return np.allclose(np.dot(compositions.T, c), composition, atol=1.e-10)
+        return potentials, spanned
+
+    def equilibrate(self, pressure, temperature, initial_guess=None):
+        """
+        Finds the stable assemblage at the given pressure and temperature.
+
+        If an initial guess is given (usually the assemblage at nearby
+        conditions), the amounts and compositions of its phases are first
+        updated with a few Newton steps. This result is returned if none of
+        its phases disappear and none of the other phases become stable;
+        otherwise the global search is done.
+
+        Parameters
+        ----------
+        pressure : float
+            Pressure [Pa].
+        temperature : float
+            Temperature [K].
+        initial_guess : :class:`burnman.EquilibriumAssemblage` (optional)
+            An assemblage from which to start the minimization.
+
+        Returns
+        -------
+        assemblage : :class:`burnman.EquilibriumAssemblage`
+            The stable assemblage.
+        """
+        gibbs = self._endmember_gibbs(pressure, temperature)
+        if initial_guess is not None:
+            assemblage = self._local_equilibrium(pressure, temperature, gibbs, initial_guess)
+            if assemblage is not None:
+                return assemblage
+        return self._global_equilibrium(pressure, temperature, gibbs)
+
+    def _local_equilibrium(self, pressure, temperature, gibbs, initial_guess):
+        """
+        Returns the equilibrium of the phases of the initial guess, or None if
+        this is not the stable assemblage.
+        """
+        amounts = self._amounts(initial_guess)
+        present = self._present(amounts)
+        amounts = self._newton(pressure, temperature, gibbs, amounts, present)
+        if amounts is None:
+            return None
+
+        mu = self._partial_gibbs(pressure, temperature, gibbs, amounts, present)
+        potentials, spanned = self._element_potentials(mu, present)
+        if len(self._new_phases(pressure, temperature, gibbs, present,
+                                potentials, spanned)) > 0:
+            return None
+        return self._assemblage(pressure, temperature, gibbs, amounts, present, potentials)
+
+    def _global_equilibrium(self, pressure, temperature, gibbs):
+        """
+        Finds the stable assemblage starting from the global search.
+        """
+        amounts, G = self._global_search(pressure, temperature, gibbs)
+        present = self._present(amounts)
+
+        for n in range(len(self.phases) + 1):
+            amounts = self._local_refinement(pressure, temperature, gibbs, amounts, present)
+            present = self._present(amounts)
+            polished_amounts = self._newton(pressure, temperature, gibbs, amounts, present)
+            if polished_amounts is not None:
+                amounts = polished_amounts
+            mu = self._partial_gibbs(pressure, temperature, gibbs, amounts, present)
+            potentials, spanned = self._element_potentials(mu, present)
+
+            new_phases = self._new_phases(pressure, temperature, gibbs, present,
+                                          potentials, spanned, G)
+            if len(new_phases) == 0:
+                break
+
+            # add the phase with the largest driving force
+            driving_force, i, x = min(new_phases, key=lambda f: f[0])
+            present[i] = True
+            amounts[self._variables[i]] = 1.e-3 * np.sum(amounts) * x
+
+        return self._assemblage(pressure, temperature, gibbs, amounts, present, potentials)
+
+    def _new_phases(self, pressure, temperature, gibbs, present, potentials, spanned, G=None):
+        """
+        Returns a list of (driving force, phase index, molar fractions)
+        for the absent phases which are more stable than the present phases.
+        """
+        scale = constants.gas_constant * temperature
+        new_phases = []
+        for i in range(len(self.phases)):
+            if not present[i] and len(self._variables[i]) > 0:
+                d, x = self._driving_force(i, pressure, temperature, gibbs, potentials,
+                                           None if G is None else G[i])
+                composition = np.dot(x, self._compositions[self._variables[i]])
+                if d < -1.e-8 * scale and spanned(composition):
+                    new_phases.append((d, i, x))
+        return new_phases
+
+    def _driving_force(self, i, pressure, temperature, gibbs, potentials, G=None):
+        """
+        Returns the minimum of the Gibbs free energy of the ith phase
+        relative to the chemical potentials of the elements
+        (which is negative if the phase is more stable than the assemblage),
+        and the molar fractions of its allowed endmembers at this minimum.
+        G are the Gibbs free energies of the pseudocompounds of the phase,
+        if these have already been calculated.
+        """
+        if G is None:
+            G = self._pseudocompound_gibbs(i, pressure, temperature, gibbs)
+        compositions = self._compositions[self._variables[i]]
+        mu_elements = np.dot(compositions, potentials)
+        driving_forces = G - np.dot(self._phase_pseudocompounds[i], mu_elements)
+        c = np.argmin(driving_forces)
+        d, x = driving_forces[c], self._phase_pseudocompounds[i][c]
+
+        # the minimum between the pseudocompounds is only searched for
+        # if the driving force of the closest pseudocompound is smaller
+        # than RT, which is much larger than the errors of the pseudocompound
+        # grid for the default number of divisions
+        scale = constants.gas_constant * temperature
+        if len(x) == 1 or d > scale:
+            return d, x
+
+        # Newton's method for the minimum, where the partial gibbs free
+        # energies relative to the chemical potentials are all equal
+        # (to the driving force)
+        y = np.maximum(x, 1.e-10)
+        y = y / np.sum(y)
+        n = len(y)
+        jacobian = np.zeros((n + 1, n + 1))
+        jacobian[:n, n] = -1.
+        jacobian[n, :n] = 1.
+        for iteration in range(50):
+            mu = (self._phase_partial_gibbs(i, pressure, temperature, gibbs, y) -
+                  mu_elements) / scale
+            residuals = mu - np.dot(y, mu)
+            if np.max(np.abs(residuals)) < 1.e-10:
+                if np.dot(y, mu) * scale < d:
+                    return np.dot(y, mu) * scale, y
+                return d, x
+            jacobian[:n, :n] = self._phase_hessian(i, pressure, temperature, y) / scale
+            try:
+                dy = np.linalg.solve(jacobian, np.concatenate((-residuals, [0.])))[:n]
+            except np.linalg.LinAlgError:
+                break
+            alpha = 1.
+            negative = y + dy <= 0.
+            if np.any(negative):
+                alpha = 0.9 * np.min(y[negative] / -dy[negative])
+            y = y + alpha * dy
+
+        # the minimum is at the edge of the composition space
+        def driving_force_and_gradient(x):
+            mu = self._phase_partial_gibbs(i, pressure, temperature, gibbs, x) - mu_elements
+            return np.dot(x, mu) / scale, mu / scale
+
+        with warnings.catch_warnings():
+            warnings.filterwarnings('ignore', 'Values in x were outside bounds')
+            result = minimize(driving_force_and_gradient, np.maximum(x, 1.e-10), jac=True,
+                              method='SLSQP', bounds=[(1.e-10, 1.)] * len(x),
+                              constraints={'type': 'eq',
+                                           'fun': lambda x: np.sum(x) - 1.,
+                                           'jac': lambda x: np.ones_like(x)},
+                              options={'ftol': 1.e-12, 'maxiter': 200})
+        if result.success and result.fun * scale < d:
+            return result.fun * scale, result.x
+        return d, x
+
+    def _amounts(self, assemblage):
+        """
+        Returns the amounts of the allowed endmembers of an assemblage.
+        """
+        amounts = np.zeros(self._n_variables)
+        for phase, n, x in zip(assemblage.phases, assemblage.molar_amounts,
+                               assemblage.compositions):
+            i = self.phases.index(phase)
+            if x is None:
+                amounts[self._variables[i]] = n
+            else:
+                amounts[self._variables[i]] = n * np.array(x)[self._indices[i]]
+        return amounts
+
+    def _assemblage(self, pressure, temperature, gibbs, amounts, present, potentials):
+        """
+        Creates an EquilibriumAssemblage from the amounts of the endmembers.
+        """
+        mu = self._partial_gibbs(pressure, temperature, gibbs, amounts, present)
+        phases = []
+        molar_amounts = []
+        compositions = []
+        for i in range(len(self.phases)):
+            if present[i]:
+                m = amounts[self._variables[i]]
+                phases.append(self.phases[i])
+                molar_amounts.append(np.sum(m))
+                if isinstance(self.phases[i], SolidSolution):
+                    compositions.append(self._molar_fractions(i, m / np.sum(m)))
+                else:
+                    compositions.append(None)
+        return EquilibriumAssemblage(pressure, temperature, phases, np.array(molar_amounts),
+                                     compositions, np.dot(amounts, mu),
+                                     self.elements, potentials)
+
+    def equilibrate_path(self, pressures, temperatures, initial_guess=None):
+        """
+        Finds the stable assemblages along a path of pressures and
+        temperatures (for example a geotherm). The minimization at each point
+        starts from the assemblage at the previous point
+        (see :func:`equilibrate`), so that the global search is only done
+        at the first point and where the assemblage changes.
+
+        Parameters
+        ----------
+        pressures : array of floats
+            Pressures along the path [Pa].
+        temperatures : array of floats
+            Temperatures along the path [K].
+        initial_guess : :class:`burnman.EquilibriumAssemblage` (optional)
+            An assemblage from which to start the minimization
+            at the first point.
+
+        Returns
+        -------
+        assemblages : list of :class:`burnman.EquilibriumAssemblage`
+            The stable assemblages at each point.
+        """
+        assert(len(pressures) == len(temperatures))
+        assemblages = []
+        guess = initial_guess
+        for pressure, temperature in zip(pressures, temperatures):
+            assemblages.append(self.equilibrate(pressure, temperature, guess))
+            guess = assemblages[-1]
+        return assemblages
+
+    def grid(self, pressures, temperatures):
+        """
+        Finds the stable assemblages on a grid of pressures and temperatures.
+        Each row of constant pressure is calculated with
+        :func:`equilibrate_path`, starting from the assemblage at
+        the first temperature of the previous row.
+
+        Parameters
+        ----------
+        pressures : array of floats
+            Pressures of the grid [Pa].
+        temperatures : array of floats
+            Temperatures of the grid [K].
+
+        Returns
+        -------
+        assemblages : list of lists of :class:`burnman.EquilibriumAssemblage`
+            assemblages[i][j] is the stable assemblage at
+            pressures[i] and temperatures[j].
+        """
+        assemblages = []
+        for pressure in pressures:
+            guess = assemblages[-1][0] if len(assemblages) > 0 else None
+            assemblages.append(self.equilibrate_path([pressure] * len(temperatures),
+                                                     temperatures, guess))
+        return assemblages
@@ -119,22 +119,55 @@ class Material(object):
             for (mineral, fraction) in zip(minerals, fractions):
                 print("  %g of phase %s" % (fraction, mineral.to_string()))
 
-    def set_state(self, pressure, temperature):
+    @property
+    def vectorized(self):
+        """
+        True if this material can be set to arrays of pressures and
+        temperatures with :func:`~burnman.Material.set_state`, in which case
+        all properties are returned as arrays of the same shape.
+        The default implementation returns False; derived classes
+        that support array-valued states override this.
+        """
+        return False
+
+    def set_state(self, pressure, temperature, properties=None):
         """
         Set the material to the given pressure and temperature.
 
         Parameters
         ----------
-        pressure : float
+        pressure : float or ndarray of float
             The desired pressure in [Pa].
-        temperature : float
+        temperature : float or ndarray of float
             The desired temperature in [K].
+        properties : string or list of strings (optional)
+            The properties which will be requested at this state.
+            Either 'thermodynamic' (the Gibbs energy, entropy, volume
+            and the properties derived from them) or a list of property
+            names (as in :func:`evaluate`). Materials may use this to
+            skip calculations which are not needed for these properties.
+            The moduli and velocities need all the second derivatives of
+            the Gibbs energy, so declaring them saves nothing over the
+            default. Other properties can still be requested, but
+            may then need additional calculations.
+            By default all properties are prepared.
+
+        Notes
+        -----
+        Arrays of pressures and temperatures (of the same shape) are only
+        supported by materials for which
+        :func:`~burnman.Material.vectorized` is True.
         """
         if not hasattr(self, "_pressure"):
             raise Exception("Material.set_state() could not find class member _pressure. "
                             "Did you forget to call Material.__init__(self) in __init___?")
         self.reset()
 
+        if np.ndim(pressure) > 0:
+            pressure = np.asarray(pressure, dtype=float)
+        if np.ndim(temperature) > 0:
+            temperature = np.asarray(temperature, dtype=float)
+
         self._pressure = pressure
         self._temperature = temperature
 
@@ -172,6 +205,10 @@ class Material(object):
         conditions. At the end it resets the set_state to the original values.
         The user needs to call set_method() before.
 
+        If the material is :func:`~burnman.Material.vectorized`, all the
+        states are evaluated in a single call to set_state. Otherwise the
+        states are evaluated one by one.
+
         Parameters
         ----------
         vars_list : list of strings
@@ -196,10 +233,17 @@ class Material(object):
         assert(pressures.shape == temperatures.shape)
         
         output = np.empty((len(vars_list),) + pressures.shape)
-        for i, p in np.ndenumerate(pressures):
-            self.set_state(p, temperatures[i])
+        if self.vectorized and pressures.size > 0:
+            # evaluate all the states at once
+            self.set_state(pressures.flatten(), temperatures.flatten())
             for j in range(len(vars_list)):
-                output[(j,) + i] = getattr(self, vars_list[j])
+                output[j] = np.broadcast_to(getattr(self, vars_list[j]),
+                                            (pressures.size,)).reshape(pressures.shape)
+        else:
+            for i, p in np.ndenumerate(pressures):
+                self.set_state(p, temperatures[i])
+                for j in range(len(vars_list)):
+                    output[(j,) + i] = getattr(self, vars_list[j])
         if old_pressure is None or old_temperature is None:
             # do not set_state if old values were None. Just reset to None
             # manually
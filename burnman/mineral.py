@@ -13,6 +13,32 @@ from .material import Material, material_property
 from . import eos
 from .tools import copy_documentation
 
+# Properties which only depend on the Gibbs energy and its first
+# derivatives (and their aliases)
+_first_order_properties = ['molar_gibbs', 'molar_helmholtz', 'molar_enthalpy',
+                           'internal_energy', 'molar_entropy', 'molar_volume',
+                           'density', 'molar_mass', 'gibbs', 'helmholtz', 'H',
+                           'energy', 'S', 'V', 'rho']
+
+
+def _excess_derivative_order(properties):
+    """
+    Returns the order of the derivatives of the excess Gibbs energy of
+    the property modifiers needed for the given property set
+    (see :func:`burnman.Material.set_state`).
+    """
+    if properties is None:
+        return 2
+    elif properties == 'thermodynamic':
+        return 1
+    elif isinstance(properties, str):
+        raise ValueError("properties must be 'thermodynamic' or a list "
+                         "of property names, not '{0}'".format(properties))
+    elif all(name in _first_order_properties for name in properties):
+        return 1
+    else:
+        return 2
+
 
 class Mineral(Material):
 
@@ -53,7 +79,10 @@ class Mineral(Material):
             self.property_modifiers = property_modifiers  
         elif 'property_modifiers' not in self.__dict__:
             self.property_modifiers = []
-            
+        # the modifiers are resolved to their functions once
+        # (see burnman.eos.compile_property_modifiers)
+        eos.property_modifiers._mineral_pipeline(self)
+
         self.method = None
         if 'equation_of_state' in self.params:
             self.set_method(self.params['equation_of_state'])
@@ -118,16 +147,49 @@ class Mineral(Material):
     def unroll(self):
         return ([self], [1.0])
 
+    @property
+    def vectorized(self):
+        """
+        True if the equation of state of this mineral can be evaluated
+        at arrays of pressures and temperatures
+        (see :func:`burnman.Material.set_state`).
+        """
+        return self.method is not None and self.method.vectorized
+
+    def reset(self):
+        """
+        Resets all cached material properties, including the intermediate
+        values cached by the equation of state.
+
+        It is typically not required for the user to call this function.
+        """
+        Material.reset(self)
+        method = getattr(self, 'method', None)
+        if isinstance(method, eos.EquationOfState):
+            method.reset()
+
     @copy_documentation(Material.set_state)
-    def set_state(self, pressure, temperature):
+    def set_state(self, pressure, temperature, properties=None):
         Material.set_state(self, pressure, temperature)
         self._property_modifiers = eos.property_modifiers.calculate_property_modifications(
-            self)
+            self, _excess_derivative_order(properties))
 
         if self.method is None:
             raise AttributeError(
                 "no method set for mineral, or equation_of_state given in mineral.params")
 
+    @property
+    def _second_order_property_modifiers(self):
+        """
+        The excesses from the property modifiers, including the second
+        derivatives, which are calculated here if set_state was only asked
+        for first order (thermodynamic) properties.
+        """
+        if 'd2GdP2' not in self._property_modifiers:
+            self._property_modifiers = eos.property_modifiers.calculate_property_modifications(
+                self)
+        return self._property_modifiers
+
     """
     Properties from equations of state
     We choose the P, T properties (e.g. Gibbs(P, T) rather than Helmholtz(V, T)),
@@ -163,14 +225,15 @@ class Mineral(Material):
             self.molar_volume, self.params)
 
         return self.molar_volume \
-            / ((self._molar_volume_unmodified / K_T_orig) - self._property_modifiers['d2GdP2'])
+            / ((self._molar_volume_unmodified / K_T_orig)
+               - self._second_order_property_modifiers['d2GdP2'])
 
     @material_property
     @copy_documentation(Material.heat_capacity_p)
     def heat_capacity_p(self):
         return self.method.heat_capacity_p(self.pressure, self.temperature,
                                            self.molar_volume, self.params) \
-            - self.temperature * self._property_modifiers['d2GdT2']
+            - self.temperature * self._second_order_property_modifiers['d2GdT2']
 
     @material_property
     @copy_documentation(Material.thermal_expansivity)
@@ -179,13 +242,13 @@ class Mineral(Material):
             (self.method.thermal_expansivity(self.pressure, self.temperature,
                                              self.molar_volume, self.params)
              * self._molar_volume_unmodified)
-            + self._property_modifiers['d2GdPdT']) / self.molar_volume
+            + self._second_order_property_modifiers['d2GdPdT']) / self.molar_volume
 
     @material_property
     @copy_documentation(Material.shear_modulus)
     def shear_modulus(self):
         G = self.method.shear_modulus(self.pressure, self.temperature, self.molar_volume, self.params)
-        if G < np.finfo('float').eps: 
+        if np.any(G < np.finfo('float').eps):
             warnings.warn('Warning, shear modulus is zero. '
                           'If this mineral is not a liquid, then shear modulus calculations '
                           'for the {0} equation of state have not been implemented.'.format(self.method.__class__.__name__), stacklevel=2)
@@ -229,7 +292,11 @@ class Mineral(Material):
     @material_property
     @copy_documentation(Material.adiabatic_bulk_modulus)
     def adiabatic_bulk_modulus(self):
-        if self.temperature < 1.e-10:
+        if np.ndim(self.temperature) > 0:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                K_S = self.isothermal_bulk_modulus * self.heat_capacity_p / self.heat_capacity_v
+            return np.where(self.temperature < 1.e-10, self.isothermal_bulk_modulus, K_S)
+        elif self.temperature < 1.e-10:
             return self.isothermal_bulk_modulus
         else:
             return self.isothermal_bulk_modulus * self.heat_capacity_p / self.heat_capacity_v
@@ -36,11 +36,14 @@ class HelperRockSwitcher(Material):
     def debug_print(self, indent=""):
         print("%sHelperRockSwitcher" % (indent))
 
-    def set_state(self, pressure, temperature):
+    def set_state(self, pressure, temperature, properties=None):
         Material.set_state(self, pressure, temperature)
 
         self.current_rock = self.select_rock()
-        self.current_rock.set_state(pressure, temperature)
+        if properties is None:
+            self.current_rock.set_state(pressure, temperature)
+        else:
+            self.current_rock.set_state(pressure, temperature, properties)
 
     def unroll(self):
         return self.current_rock.unroll()
@@ -179,10 +182,18 @@ class HelperSpinTransition(Composite):
         self.ls_mat.debug_print(indent + "  ")
         self.hs_mat.debug_print(indent + "  ")
 
-    def set_state(self, pressure, temperature):
+    @property
+    def vectorized(self):
+        """
+        The spin state is chosen for a single pressure,
+        so this material cannot be evaluated at arrays of states.
+        """
+        return False
+
+    def set_state(self, pressure, temperature, properties=None):
         if (pressure >= self.transition_pressure):
             Composite.set_fractions(self, [1.0, 0.0])
         else:
             Composite.set_fractions(self, [0.0, 1.0])
 
-        Composite.set_state(self, pressure, temperature)
+        Composite.set_state(self, pressure, temperature, properties)
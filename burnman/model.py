@@ -9,6 +9,18 @@ from .material import Material
 from .averaging_schemes import AveragingScheme
 
 
+def _average(averaging_function, vectorized, *phase_properties):
+    """
+    Applies a function of an averaging scheme to arrays of phase properties
+    of shape (n_points, n_phases). Vectorized averaging schemes are called
+    once for all the points, other schemes once for each point.
+    """
+    if vectorized:
+        return averaging_function(*phase_properties)
+    return np.array([averaging_function(*point_properties)
+                     for point_properties in zip(*phase_properties)])
+
+
 class Model(object):
 
     """
@@ -20,6 +32,16 @@ class Model(object):
 
     all computations are done automatically and lazily
 
+    The properties of the minerals in the rock are stored in contiguous arrays
+    of shape (n_points, n_phases) in the dictionary moduli, and averaged for
+    all the points at once. If the number of minerals in the rock changes
+    between the points, moduli is instead a list with one such dictionary
+    for each point, and the properties are averaged point by point.
+    If the rock is vectorized
+    (see :func:`burnman.Material.set_state`), the properties of the minerals
+    are also evaluated for all the points at once.
+    Very long profiles can be evaluated in chunks with :func:`stream`,
+    which does not store the properties of the minerals.
     """
 
     def __init__(self, rock, p, T, avgscheme):
@@ -75,13 +97,7 @@ class Model(object):
     def thermal_expansivity(self):
         if self.alpha is None:
             self.calc_moduli_()
-            n_pressures = len(self.p)
-            self.alpha = np.zeros(n_pressures)
-            for idx in range(n_pressures):
-                V = np.array([m['V'] for m in self.moduli[idx]])
-                alpha = np.array([m['alpha'] for m in self.moduli[idx]])
-                self.alpha[
-                    idx] = self.avgscheme.average_thermal_expansivity(V, alpha)
+            self.alpha = self._averaged_thermal_expansivity(self.moduli)
 
         return self.alpha
 
@@ -93,27 +109,144 @@ class Model(object):
         self.calc_heat_capacities_()
         return self.c_v
 
+    def stream(self, chunk_size):
+        """
+        Evaluates the model in chunks of consecutive points, and yields the
+        properties for each chunk in turn. Only the properties of the minerals
+        for the current chunk are held in memory, and they are not stored
+        in moduli.
+
+        Parameters
+        ----------
+        chunk_size : int
+            Number of points in each chunk.
+
+        Yields
+        ------
+        indices : slice
+            The indices of the points of the chunk.
+        properties : dictionary
+            Arrays of the averaged properties for the points of the chunk,
+            with the keys 'V', 'K', 'G', 'density', 'v_s', 'v_p', 'v_phi',
+            'thermal_expansivity', 'heat_capacity_v' and 'heat_capacity_p'.
+        """
+        p = np.asarray(self.p, dtype=float)
+        T = np.asarray(self.T, dtype=float)
+        for start in range(0, len(p), chunk_size):
+            indices = slice(start, min(start + chunk_size, len(p)))
+            moduli = self._phase_properties(p[indices], T[indices])
+
+            V, K, G, rho = self._averaged_moduli(moduli)
+            properties = {'V': V, 'K': K, 'G': G, 'density': rho,
+                          'v_s': np.sqrt(G / rho),
+                          'v_p': np.sqrt((K + 4. / 3. * G) / rho),
+                          'v_phi': np.sqrt(K / rho)}
+            properties['thermal_expansivity'] = self._averaged_thermal_expansivity(moduli)
+            (properties['heat_capacity_v'],
+             properties['heat_capacity_p']) = self._averaged_heat_capacities(moduli)
+            yield indices, properties
+
+    @property
+    def _vectorized_averages(self):
+        return getattr(self.avgscheme, 'vectorized', False)
+
+    def _phase_properties(self, p, T):
+        """
+        Returns a dictionary of arrays of shape (n_points, n_phases) with the
+        properties of the minerals of the unrolled rock
+        at the given arrays of pressures and temperatures, or a list of
+        such dictionaries for each point if the number of minerals changes.
+        """
+        names = ['molar_volume', 'adiabatic_bulk_modulus', 'shear_modulus',
+                 'molar_mass', 'thermal_expansivity', 'heat_capacity_v',
+                 'heat_capacity_p']
+
+        if self.rock.vectorized:
+            self.rock.set_state(p, T)
+            (minerals, fractions) = self.rock.unroll()
+            values = np.array([[np.broadcast_to(getattr(mineral, name), p.shape)
+                                for mineral in minerals] for name in names]).transpose(0, 2, 1)
+            fractions = np.broadcast_to(fractions, values.shape[1:])
+        else:
+            values = []
+            fractions = []
+            for idx in range(len(p)):
+                self.rock.set_state(p[idx], T[idx])
+                (minerals, point_fractions) = self.rock.unroll()
+                values.append([[getattr(mineral, name) for mineral in minerals]
+                               for name in names])
+                fractions.append(point_fractions)
+            if len(set(len(point_fractions) for point_fractions in fractions)) > 1:
+                return [self._moduli(np.array([point_values]).transpose(1, 0, 2),
+                                     np.array([point_fractions]))
+                        for point_values, point_fractions in zip(values, fractions)]
+            values = np.array(values).transpose(1, 0, 2)
+            fractions = np.array(fractions)
+
+        return self._moduli(values, fractions)
+
+    def _moduli(self, values, fractions):
+        """
+        Returns the dictionary of the properties of the minerals from
+        the array of the values of the properties of _phase_properties.
+        """
+        V, K, G, molar_mass, alpha, c_v, c_p = values
+        return {'fraction': fractions,
+                'V': fractions * V,
+                'K': K,
+                'G': G,
+                'rho': molar_mass / V,
+                'alpha': alpha,
+                'c_v': c_v,
+                'c_p': c_p}
+
+    def _averaged_moduli(self, moduli):
+        """
+        Returns the volumes, averaged moduli and densities for
+        a dictionary of properties of the minerals.
+        """
+        if isinstance(moduli, list):
+            return tuple(np.concatenate(values) for values in
+                         zip(*[self._averaged_moduli(m) for m in moduli]))
+        V_frac = moduli['V']
+        return (np.sum(V_frac, axis=1),
+                _average(self.avgscheme.average_bulk_moduli, self._vectorized_averages,
+                         V_frac, moduli['K'], moduli['G']),
+                _average(self.avgscheme.average_shear_moduli, self._vectorized_averages,
+                         V_frac, moduli['K'], moduli['G']),
+                _average(self.avgscheme.average_density, self._vectorized_averages,
+                         V_frac, moduli['rho']))
+
+    def _averaged_heat_capacities(self, moduli):
+        """
+        Returns the averaged heat capacities for
+        a dictionary of properties of the minerals.
+        """
+        if isinstance(moduli, list):
+            return tuple(np.concatenate(values) for values in
+                         zip(*[self._averaged_heat_capacities(m) for m in moduli]))
+        return (_average(self.avgscheme.average_heat_capacity_v, self._vectorized_averages,
+                         moduli['fraction'], moduli['c_v']),
+                _average(self.avgscheme.average_heat_capacity_p, self._vectorized_averages,
+                         moduli['fraction'], moduli['c_p']))
+
+    def _averaged_thermal_expansivity(self, moduli):
+        """
+        Returns the averaged thermal expansivities for
+        a dictionary of properties of the minerals.
+        """
+        if isinstance(moduli, list):
+            return np.concatenate([self._averaged_thermal_expansivity(m) for m in moduli])
+        return _average(self.avgscheme.average_thermal_expansivity, self._vectorized_averages,
+                        moduli['V'], moduli['alpha'])
+
     def calc_moduli_(self):
         """
         Internal function to compute the moduli if necessary.
         """
         if self.moduli is None:
-                self.moduli = [[] for p in self.p]
-
-                for idx in range(len(self.p)):
-                    self.rock.set_state(self.p[idx], self.T[idx])
-                    (minerals, fractions) = self.rock.unroll()
-                    for (mineral, fraction) in zip(minerals, fractions):
-                        e = {}
-                        e['fraction'] = fraction
-                        e['V'] = fraction * mineral.molar_volume
-                        e['K'] = mineral.adiabatic_bulk_modulus
-                        e['G'] = mineral.shear_modulus
-                        e['rho'] = mineral.molar_mass / mineral.molar_volume
-                        e['alpha'] = mineral.thermal_expansivity
-                        e['c_v'] = mineral.heat_capacity_v
-                        e['c_p'] = mineral.heat_capacity_p
-                        self.moduli[idx].append(e)
+            self.moduli = self._phase_properties(np.asarray(self.p, dtype=float),
+                                                 np.asarray(self.T, dtype=float))
 
     def avg_moduli_(self):
         """
@@ -121,28 +254,8 @@ class Model(object):
         """
         if self.mat_V is None:
             self.calc_moduli_()
-            n_pressures = len(self.p)
-            self.mat_V = np.zeros(len(self.p))
-            self.mat_K = np.zeros(len(self.p))
-            self.mat_G = np.zeros(len(self.p))
-            self.mat_rho = np.zeros(len(self.p))
-
-            for idx in range(n_pressures):
-                mods = self.moduli[idx]
-
-                fractions = np.array([e['fraction'] for e in mods])
-                V_frac = np.array([m['V'] for m in mods])
-                K_ph = np.array([m['K'] for m in mods])
-                G_ph = np.array([m['G'] for m in mods])
-                rho_ph = np.array([m['rho'] for m in mods])
-
-                self.mat_V[idx] = sum(V_frac)
-                self.mat_K[idx] = self.avgscheme.average_bulk_moduli(
-                    V_frac, K_ph, G_ph)
-                self.mat_G[idx] = self.avgscheme.average_shear_moduli(
-                    V_frac, K_ph, G_ph)
-                self.mat_rho[idx] = self.avgscheme.average_density(
-                    V_frac, rho_ph)
+            (self.mat_V, self.mat_K,
+             self.mat_G, self.mat_rho) = self._averaged_moduli(self.moduli)
 
     def calc_heat_capacities_(self):
         """
@@ -150,17 +263,7 @@ class Model(object):
         """
         if self.c_p is None:
             self.calc_moduli_()
-            self.c_v = np.zeros(len(self.p))
-            self.c_p = np.zeros(len(self.p))
-            for idx in range(len(self.p)):
-                fractions = np.array([m['fraction'] for m in self.moduli[idx]])
-                alphas = np.array([m['alpha'] for m in self.moduli[idx]])
-                c_v = np.array([m['c_v'] for m in self.moduli[idx]])
-                c_p = np.array([m['c_p'] for m in self.moduli[idx]])
-                self.c_v[idx] = self.avgscheme.average_heat_capacity_v(
-                    fractions, c_v)
-                self.c_p[idx] = self.avgscheme.average_heat_capacity_p(
-                    fractions, c_p)
+            self.c_v, self.c_p = self._averaged_heat_capacities(self.moduli)
 
     def compute_velocities_(self):
         """
@@ -168,12 +271,7 @@ class Model(object):
         """
         if self.mat_vp is None:
             self.avg_moduli_()
-            self.mat_vs = np.ndarray(len(self.p))
-            self.mat_vp = np.ndarray(len(self.p))
-            self.mat_vphi = np.ndarray(len(self.p))
-
-            for i in range(len(self.p)):
-                self.mat_vs[i] = np.sqrt(self.mat_G[i] / self.mat_rho[i])
-                self.mat_vp[i] = np.sqrt(
-                    (self.mat_K[i] + 4. / 3. * self.mat_G[i]) / self.mat_rho[i])
-                self.mat_vphi[i] = np.sqrt(self.mat_K[i] / self.mat_rho[i])
+            self.mat_vs = np.sqrt(self.mat_G / self.mat_rho)
+            self.mat_vp = np.sqrt(
+                (self.mat_K + 4. / 3. * self.mat_G) / self.mat_rho)
+            self.mat_vphi = np.sqrt(self.mat_K / self.mat_rho)
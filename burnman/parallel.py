@@ -0,0 +1,179 @@
+# This file is part of BurnMan - a thermoelastic and thermodynamic toolkit for the Earth and Planetary Sciences
+# Copyright (C) 2012 - 2017 by the BurnMan team, released under the GNU
+# GPL v2 or later.
+
+from __future__ import absolute_import
+
+import multiprocessing
+import pickle
+import warnings
+
+import numpy as np
+
+
+def _evaluate_chunk(args):
+    """
+    Evaluates one chunk of states in a worker process.
+    """
+    material, vars_list, pressures, temperatures = args
+    return material.evaluate(vars_list, pressures, temperatures)
+
+
+class ParallelEvaluator(object):
+    """
+    Evaluates materials at large arrays of pressures and temperatures
+    using a pool of worker processes.
+
+    The states are split into chunks of consecutive states
+    (in the order of the flattened arrays), which are evaluated with
+    :func:`burnman.Material.evaluate` by the workers. The chunks only
+    depend on the number of states, the number of processes and
+    chunk_size, so that the results do not depend on the scheduling of
+    the workers. The pool of workers is started when it is first needed
+    and reused by subsequent calls to :func:`evaluate` and :func:`map`, until
+    :func:`close` is called (which also happens when the evaluator
+    is used in a ``with`` statement).
+
+    If the material cannot be pickled (which is required for sending it
+    to the workers), if the worker processes cannot be started, or if
+    there is only one chunk of states, the states are evaluated
+    in the current process.
+
+    This class is available as ``burnman.ParallelEvaluator``.
+
+    Parameters
+    ----------
+    processes : int (optional)
+        Number of worker processes. Defaults to the number of CPUs.
+    chunk_size : int (optional)
+        Number of states in each chunk. By default, the states are
+        split into one chunk per process, as materials which are
+        :func:`~burnman.Material.vectorized` evaluate large arrays
+        of states most efficiently.
+    """
+
+    def __init__(self, processes=None, chunk_size=None):
+        if processes is None:
+            processes = multiprocessing.cpu_count()
+        self.processes = processes
+        self.chunk_size = chunk_size
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Stops the worker processes.
+        """
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def chunks(self, n_states):
+        """
+        Returns the list of slices of the flattened arrays of
+        states which are evaluated by the workers.
+        """
+        chunk_size = self.chunk_size
+        if chunk_size is None:
+            chunk_size = max(1, int(np.ceil(n_states / float(self.processes))))
+        return [slice(i, min(i + chunk_size, n_states))
+                for i in range(0, n_states, chunk_size)]
+
+    def _get_pool(self, args, description):
+        """
+        Returns the pool of worker processes, starting it if needed,
+        or None (with a warning) if the arguments cannot be pickled
+        or the worker processes cannot be started.
+        """
+        try:
+            for arg in args:
+                pickle.dumps(arg)
+        except Exception as e:
+            warnings.warn('The {0} cannot be sent to the worker processes ({1}), '
+                          'evaluating in serial instead.'.format(description, e), stacklevel=3)
+            return None
+        if self._pool is None:
+            try:
+                self._pool = multiprocessing.Pool(self.processes)
+            except (OSError, ImportError, NotImplementedError, AssertionError) as e:
+                # e.g. no support for semaphores on this platform,
+                # or a daemonic process which cannot have children
+                warnings.warn('Could not start worker processes ({0}), '
+                              'evaluating in serial instead.'.format(e), stacklevel=3)
+        return self._pool
+
+    def map(self, function, args):
+        """
+        Returns the list of the values of function for each of the
+        arguments in args, which are evaluated by the worker processes.
+        The function and the arguments must be picklable (so the function
+        must be defined at the top level of a module). If any of the
+        arguments cannot be pickled, if the worker processes cannot be
+        started, or if there is only one argument, the function is
+        evaluated in the current process.
+
+        Parameters
+        ----------
+        function : function
+            Function of a single argument.
+        args : list
+            The arguments for which the function is evaluated.
+
+        Returns
+        -------
+        values : list
+            The values of function(arg) for each arg in args.
+        """
+        pool = None
+        if self.processes > 1 and len(args) > 1:
+            pool = self._get_pool(args, 'arguments')
+        if pool is None:
+            return [function(arg) for arg in args]
+        return pool.map(function, args)
+
+    def evaluate(self, material, vars_list, pressures, temperatures):
+        """
+        Returns an array of material properties requested through a list
+        of strings at given pressure and temperature conditions, in the same
+        layout as :func:`burnman.Material.evaluate`.
+
+        Parameters
+        ----------
+        material : :class:`burnman.Material`
+            The material to evaluate.
+        vars_list : list of strings
+            Variables to be returned for given conditions
+        pressures : ndlist or ndarray of float
+            n-dimensional array of pressures in [Pa].
+        temperatures : ndlist or ndarray of float
+            n-dimensional array of temperatures in [K].
+
+        Returns
+        -------
+        output : array of array of float
+            Array returning all variables at given pressure/temperature values.
+            output[i][j] is property vars_list[i] at pressures[j] and temperatures[j].
+        """
+        pressures = np.array(pressures, dtype=float)
+        temperatures = np.array(temperatures, dtype=float)
+        assert(pressures.shape == temperatures.shape)
+
+        chunks = self.chunks(pressures.size)
+        pool = None
+        if self.processes > 1 and len(chunks) > 1:
+            pool = self._get_pool([material], 'material')
+
+        if pool is None:
+            return material.evaluate(vars_list, pressures, temperatures)
+
+        P = pressures.flatten()
+        T = temperatures.flatten()
+        results = pool.map(_evaluate_chunk,
+                           [(material, vars_list, P[c], T[c]) for c in chunks])
+        return np.concatenate(results, axis=1).reshape((len(vars_list),) + pressures.shape)
@@ -9,10 +9,12 @@ import warnings
 
 from subprocess import Popen, PIPE, STDOUT
 from os import rename
+import os
+import tempfile
 
 
 import numpy as np
-from scipy.interpolate import interp2d 
+from scipy.interpolate import RegularGridInterpolator
 
 from .material import Material, material_property
 from . import eos
@@ -87,94 +89,229 @@ class PerplexMaterial(Material):
     Properties of the material are determined by linear interpolation from
     the PerpleX grid. They are all returned in SI units on a molar basis, 
     even though the PerpleX tab file is not in these units.
+    The material can be set to arrays of pressures and temperatures,
+    in which case all the properties are interpolated in one call.
+
+    Reading large tab files is slow, so if cache is True the converted table
+    is saved in numpy format next to the tab file (with the extension .npy
+    appended to the file name), and read from there (memory-mapped) as long
+    as it is newer than the tab file and contains the same properties.
 
     This class is available as ``burnman.PerplexMaterial``.
     """
-    def __init__(self, tab_file):
+
+    # The tabulated properties, in the order in which they are stored in the
+    # converted table, and the PerpleX column names they are calculated from
+    tabulated_properties = ['rho', 'alpha', 'K_T', 'K_S', 'G_S',
+                            'bulk_sound_velocity', 'p_wave_velocity',
+                            's_wave_velocity', 'S', 'H', 'C_p', 'V']
+    perplex_properties = ['rho,kg/m3', 'alpha,1/K', 'beta,1/bar', 'Ks,bar',
+                          'Gs,bar', 'v0,km/s', 'vp,km/s', 'vs,km/s',
+                          's,J/K/kg', 'h,J/kg', 'cp,J/K/kg', 'V,J/bar/mol']
+
+    def __init__(self, tab_file, cache=False):
         self.params = {'name': tab_file}
-        self._property_interpolators, self.params['molar_mass'], self.bounds = self._read_2D_perplex_file(tab_file)
+        pressures, temperatures, self._property_table = self._load_table(tab_file, cache)
+        self._property_interpolator = RegularGridInterpolator((pressures, temperatures),
+                                                              self._property_table)
+        self._property_index = dict((name, i) for i, name
+                                    in enumerate(self.tabulated_properties))
+        i_rho = self._property_index['rho']
+        i_V = self._property_index['V']
+        self.params['molar_mass'] = np.mean(self._property_table[:, :, i_rho] *
+                                             self._property_table[:, :, i_V])
+        self.bounds = [[pressures[0], pressures[-1]],
+                       [temperatures[0], temperatures[-1]]]
         Material.__init__(self)
 
+    def _load_table(self, filename, cache):
+        """
+        Returns the pressures and temperatures of the grid and the
+        converted table (see _read_2D_perplex_file), using the cached
+        table if it is available and up to date.
+        The cached table is a structured array of shape
+        (n_pressures, n_temperatures) with the fields 'pressure',
+        'temperature' and tabulated_properties, whose values are stored
+        as a contiguous array of floats with the fields in the last axis.
+        """
+        columns = ['pressure', 'temperature'] + self.tabulated_properties
+        dtype = [(name, float) for name in columns]
+        cache_file = filename + '.npy'
+        table = None
+        if (cache and os.path.exists(cache_file) and
+                os.path.getmtime(cache_file) >= os.path.getmtime(filename)):
+            try:
+                cached_table = np.load(cache_file, mmap_mode='r')
+            except (IOError, OSError, ValueError):
+                cached_table = None
+            if cached_table is not None and cached_table.dtype == np.dtype(dtype):
+                table = cached_table.view(float).reshape(cached_table.shape + (len(columns),))
+
+        if table is None:
+            pressures, temperatures, property_table = self._read_2D_perplex_file(filename)
+            table = np.empty(property_table.shape[:2] + (len(columns),))
+            table[:, :, 0] = pressures[:, np.newaxis]
+            table[:, :, 1] = temperatures[np.newaxis, :]
+            table[:, :, 2:] = property_table
+            if cache:
+                try:
+                    # the file is renamed once it is complete, so that
+                    # other processes never read an incomplete file
+                    fd, tmp_file = tempfile.mkstemp(suffix='.npy',
+                                                    dir=os.path.dirname(os.path.abspath(cache_file)))
+                    with os.fdopen(fd, 'wb') as f:
+                        np.save(f, table.view(dtype)[:, :, 0])
+                    getattr(os, 'replace', os.rename)(tmp_file, cache_file)
+                except (IOError, OSError):
+                    warnings.warn('Could not write the PerpleX table cache ' + cache_file,
+                                  stacklevel=3)
+
+        return np.array(table[:, 0, 0]), np.array(table[0, :, 1]), table[:, :, 2:]
+
     def _read_2D_perplex_file(self, filename):
+        """
+        Reads a 2D PerpleX tab file, and returns the pressures and
+        temperatures of the grid and an array property_table, where
+        property_table[i, j, k] is the kth of tabulated_properties
+        (in SI units, on a molar basis) at the ith pressure and
+        jth temperature.
+        """
         with open(filename, 'r') as f:
-            datastream = f.read()
-
-        lines = [line.strip().split()
-                 for line in datastream.split('\n') if line.strip()]
-
-        if lines[2][0] != '2':
+            header = []
+            while len(header) < 13:
+                line = f.readline()
+                if not line:
+                    raise Exception('This is not a 2D PerpleX table')
+                if line.strip():
+                    header.append(line)
+            # parse all the values at once
+            data = np.array(f.read().split(), dtype=float)
+
+        if header[2].split()[0] != '2':
             raise Exception('This is not a 2D PerpleX table')
 
-        Pmin = float(lines[4][0])*1.e5
-        Pint = float(lines[5][0])*1.e5
-        nP = int(lines[6][0])
+        Pmin = float(header[4].split()[0])*1.e5
+        Pint = float(header[5].split()[0])*1.e5
+        nP = int(header[6].split()[0])
         Pmax = Pmin + Pint*(nP-1.)
         pressures = np.linspace(Pmin, Pmax, nP)
-        
-        Tmin = float(lines[8][0])
-        Tint = float(lines[9][0])
-        nT = int(lines[10][0])
+
+        Tmin = float(header[8].split()[0])
+        Tint = float(header[9].split()[0])
+        nT = int(header[10].split()[0])
         Tmax = Tmin + Tint*(nT-1.)
         temperatures = np.linspace(Tmin, Tmax, nT)
-        
-        n_properties = int(lines[11][0])
-        property_list = lines[12]
-        
-        # property_table[i][j][k] returns the kth property at the ith pressure and jth temperature
-        property_table = np.swapaxes(np.array([[float(string) for string in line]
-                                               for line in lines[13:13+nP*nT]]).reshape(nT, nP, n_properties),
-                                     0, 1)
-        
-        ordered_property_list = ['rho,kg/m3',
-                                 'alpha,1/K',
-                                 'beta,1/bar',
-                                 'Ks,bar',
-                                 'Gs,bar',
-                                 'v0,km/s',
-                                 'vp,km/s',
-                                 'vs,km/s',
-                                 's,J/K/kg',
-                                 'h,J/kg',
-                                 'cp,J/K/kg',
-                                 'V,J/bar/mol']
-        p_indices = [[i for i, p in enumerate(property_list) if p == ordered_p] for ordered_p in ordered_property_list]
-
-        densities = property_table[:,:,p_indices[0]][:,:,0]
-        volumes = 1.e-5 * property_table[:,:,p_indices[11]][:,:,0]
+
+        n_properties = int(header[11].split()[0])
+        property_list = header[12].split()
+
+        # raw_table[i][j][k] returns the kth property at the ith pressure and jth temperature
+        raw_table = np.swapaxes(data[:nP*nT*n_properties].reshape(nT, nP, n_properties), 0, 1)
+        columns = dict((name, raw_table[:, :, property_list.index(name)])
+                       for name in self.perplex_properties)
+
+        densities = columns['rho,kg/m3']
+        volumes = 1.e-5 * columns['V,J/bar/mol']
         molar_masses = densities*volumes
-        molar_mass = np.mean(molar_masses)
-        
-        property_interpolators = {'rho': interp2d(pressures, temperatures, densities.T),
-                                  'alpha': interp2d(pressures, temperatures, property_table[:,:,p_indices[1]][:,:,0].T),
-                                  'K_T': interp2d(pressures, temperatures, 1.e5 / property_table[:,:,p_indices[2]][:,:,0].T),
-                                  'K_S': interp2d(pressures, temperatures, 1.e5 * property_table[:,:,p_indices[3]][:,:,0].T),
-                                  'G_S': interp2d(pressures, temperatures, 1.e5 * property_table[:,:,p_indices[4]][:,:,0].T),
-                                  'bulk_sound_velocity': interp2d(pressures, temperatures, property_table[:,:,p_indices[5]][:,:,0].T),
-                                  'p_wave_velocity': interp2d(pressures, temperatures, property_table[:,:,p_indices[6]][:,:,0].T),
-                                  's_wave_velocity': interp2d(pressures, temperatures, property_table[:,:,p_indices[7]][:,:,0].T),
-                                  'S': interp2d(pressures, temperatures, property_table[:,:,p_indices[8]][:,:,0].T*molar_masses.T),
-                                  'H': interp2d(pressures, temperatures, property_table[:,:,p_indices[9]][:,:,0].T*molar_masses.T),
-                                  'C_p': interp2d(pressures, temperatures, property_table[:,:,p_indices[10]][:,:,0].T*molar_masses.T),
-                                  'V': interp2d(pressures, temperatures, volumes.T)}
-
-        bounds = [[Pmin, Pmax], [Tmin, Tmax]]
-        return property_interpolators, molar_mass, bounds
-    
+
+        property_table = np.array([densities,
+                                   columns['alpha,1/K'],
+                                   1.e5 / columns['beta,1/bar'],
+                                   1.e5 * columns['Ks,bar'],
+                                   1.e5 * columns['Gs,bar'],
+                                   columns['v0,km/s'],
+                                   columns['vp,km/s'],
+                                   columns['vs,km/s'],
+                                   columns['s,J/K/kg']*molar_masses,
+                                   columns['h,J/kg']*molar_masses,
+                                   columns['cp,J/K/kg']*molar_masses,
+                                   volumes])
+        return pressures, temperatures, np.moveaxis(property_table, 0, -1)
+
+    @property
+    def vectorized(self):
+        return True
+
+    @material_property
+    def _property_values(self):
+        """
+        All the tabulated properties, interpolated at the current state
+        in a single call to the interpolator.
+        """
+        return self._property_interpolator((self.pressure, self.temperature))
+
+    def _interpolated(self, name):
+        return self._property_values[..., self._property_index[name]][()]
+
+    def in_bounds(self, pressures, temperatures):
+        """
+        Returns an array of booleans, which are True for the states
+        which are within the pressure and temperature bounds of the table.
+        """
+        return np.logical_and(np.logical_and(self.bounds[0][0] <= pressures,
+                                             pressures <= self.bounds[0][1]),
+                              np.logical_and(self.bounds[1][0] <= temperatures,
+                                             temperatures <= self.bounds[1][1]))
+
     @copy_documentation(Material.set_state)
-    def set_state(self, pressure, temperature):
-        
-        if not np.logical_and(np.all(self.bounds[0][0] <= pressure),
-                              np.all(pressure <= self.bounds[0][1])):
-            raise ValueError("The set_state pressure ({0:.4f}) is outside the bounds of this rock ({1:.4f}-{2:.4f} GPa)".format(pressure,
+    def set_state(self, pressure, temperature, properties=None):
+        P_inside = np.logical_and(self.bounds[0][0] <= pressure, pressure <= self.bounds[0][1])
+        if not np.all(P_inside):
+            raise ValueError("The set_state pressure ({0:.4f}) is outside the bounds of this rock ({1:.4f}-{2:.4f} GPa)".format(np.asarray(pressure)[~P_inside].flat[0],
                                                                                                                                 self.bounds[0][0]/1.e9,
                                                                                                                                 self.bounds[0][1]/1.e9))
-        if not np.logical_and(np.all(self.bounds[1][0] <= temperature),
-                              np.all(temperature <= self.bounds[1][1])):
-            raise ValueError("The set_state temperature ({0:.1f}) is outside the bounds of this rock ({1:.1f}-{2:.1f} K)".format(temperature,
+        T_inside = np.logical_and(self.bounds[1][0] <= temperature, temperature <= self.bounds[1][1])
+        if not np.all(T_inside):
+            raise ValueError("The set_state temperature ({0:.1f}) is outside the bounds of this rock ({1:.1f}-{2:.1f} K)".format(np.asarray(temperature)[~T_inside].flat[0],
                                                                                                                                  self.bounds[1][0],
                                                                                                                                  self.bounds[1][1]))
         Material.set_state(self, pressure, temperature)
-        
+
+    def evaluate(self, vars_list, pressures, temperatures, out_of_bounds='raise'):
+        """
+        Returns an array of material properties requested through a list of strings at given pressure and temperature
+        conditions. At the end it resets the set_state to the original values.
+
+        All the states are checked against the bounds of the table at once,
+        and all the properties are interpolated in a single call.
+
+        Parameters
+        ----------
+        vars_list : list of strings
+            Variables to be returned for given conditions
+        pressures : ndlist or ndarray of float
+            n-dimensional array of pressures in [Pa].
+        temperatures : ndlist or ndarray of float
+            n-dimensional array of temperatures in [K].
+        out_of_bounds : string (optional)
+            What to do with states outside the bounds of the table (see
+            :func:`in_bounds`): either 'raise' (the default), which raises a
+            ValueError, or 'nan', which returns NaN for these states.
+
+        Returns
+        -------
+        output : array of array of float
+            Array returning all variables at given pressure/temperature values. output[i][j] is property vars_list[j]
+            and temperatures[i] and pressures[i].
+        """
+        if out_of_bounds not in ['raise', 'nan']:
+            raise ValueError("out_of_bounds must be either 'raise' or 'nan'")
+
+        pressures = np.array(pressures, dtype=float)
+        temperatures = np.array(temperatures, dtype=float)
+        assert(pressures.shape == temperatures.shape)
+
+        inside = self.in_bounds(pressures, temperatures)
+        if out_of_bounds == 'raise' or np.all(inside):
+            # set_state raises an error if any of the states are out of bounds
+            return Material.evaluate(self, vars_list, pressures, temperatures)
+
+        output = np.full((len(vars_list),) + pressures.shape, np.nan)
+        if np.any(inside):
+            output[:, inside] = Material.evaluate(self, vars_list,
+                                                  pressures[inside], temperatures[inside])
+        return output
+
     """
     Properties by linear interpolation of Perple_X output
     """
@@ -182,57 +319,57 @@ class PerplexMaterial(Material):
     @material_property
     @copy_documentation(Material.molar_volume)
     def molar_volume(self):
-        return self._property_interpolators['V'](self.pressure, self.temperature)[0]
+        return self._interpolated('V')
 
     @material_property
     @copy_documentation(Material.molar_enthalpy)
     def molar_enthalpy(self):
-        return self._property_interpolators['H'](self.pressure, self.temperature)[0]
+        return self._interpolated('H')
     
     @material_property
     @copy_documentation(Material.molar_entropy)
     def molar_entropy(self):
-        return self._property_interpolators['S'](self.pressure, self.temperature)[0]
+        return self._interpolated('S')
 
     @material_property
     @copy_documentation(Material.isothermal_bulk_modulus)
     def isothermal_bulk_modulus(self):
-        return self._property_interpolators['K_T'](self.pressure, self.temperature)[0]
+        return self._interpolated('K_T')
     
     @material_property
     @copy_documentation(Material.adiabatic_bulk_modulus)
     def adiabatic_bulk_modulus(self):
-        return self._property_interpolators['K_S'](self.pressure, self.temperature)[0]
+        return self._interpolated('K_S')
         
     @material_property
     @copy_documentation(Material.heat_capacity_p)
     def heat_capacity_p(self):
-        return self._property_interpolators['C_p'](self.pressure, self.temperature)[0]
+        return self._interpolated('C_p')
     
     @material_property
     @copy_documentation(Material.thermal_expansivity)
     def thermal_expansivity(self):
-        return self._property_interpolators['alpha'](self.pressure, self.temperature)[0]
+        return self._interpolated('alpha')
 
     @material_property
     @copy_documentation(Material.shear_modulus)
     def shear_modulus(self):
-        return self._property_interpolators['G_S'](self.pressure, self.temperature)[0]
+        return self._interpolated('G_S')
     
     @material_property
     @copy_documentation(Material.p_wave_velocity)
     def p_wave_velocity(self):
-        return self._property_interpolators['p_wave_velocity'](self.pressure, self.temperature)[0]
+        return self._interpolated('p_wave_velocity')
 
     @material_property
     @copy_documentation(Material.bulk_sound_velocity)
     def bulk_sound_velocity(self):
-        return self._property_interpolators['bulk_sound_velocity'](self.pressure, self.temperature)[0]
+        return self._interpolated('bulk_sound_velocity')
 
     @material_property
     @copy_documentation(Material.shear_wave_velocity)
     def shear_wave_velocity(self):
-        return self._property_interpolators['s_wave_velocity'](self.pressure, self.temperature)[0]
+        return self._interpolated('s_wave_velocity')
 
     """
     Properties from mineral parameters,
@@ -257,7 +394,7 @@ class PerplexMaterial(Material):
     @material_property
     @copy_documentation(Material.density)
     def density(self):
-        return self._property_interpolators['rho'](self.pressure, self.temperature)[0]
+        return self._interpolated('rho')
 
     @material_property
     @copy_documentation(Material.internal_energy)
@@ -3,12 +3,13 @@ from __future__ import print_function
 # Copyright (C) 2012 - 2017 by the BurnMan team, released under the GNU
 # GPL v2 or later.
 
+import warnings
+
 import numpy as np
-from scipy.integrate import odeint
-from scipy.integrate import quad
-from scipy.interpolate import UnivariateSpline
 from burnman import averaging_schemes
 from burnman import constants
+from burnman.parallel import ParallelEvaluator
+from burnman.tabulated import TabulatedMaterial
 
 
 class Planet(object):
@@ -55,63 +56,238 @@ class Planet(object):
         def temperature(self, radius):
             return self._temperature_inner + (self._temperature_outer-self._temperature_inner)*(radius-self.inner_radius)/self.thickness
 
-    def __init__(self, layers, n_max_iterations = 50, verbose = False):
+    def __init__(self, layers, n_max_iterations = 50, verbose = False,
+                 tolerance = 1.e-5, n_anderson = 5, pressures = None,
+                 mesh_tolerance = None, n_max_refinements = 20):
         """
         Generate the planet based on the given layers (List of Layer)
+
+        The pressures, gravity and densities are found self-consistently
+        by fixed point iteration: the densities are evaluated at the
+        current pressures, and the gravity and pressures are integrated
+        from the densities with cumulative quadratures on the radial slices.
+        The iterations are accelerated by Anderson mixing of the
+        pressure profiles of the last n_anderson iterations, and
+        the densities of a layer are only evaluated again if
+        its pressures have changed by more than a tenth of the tolerance.
+        The iterations stop when the largest change in pressure relative
+        to the central pressure is smaller than tolerance. If this does not
+        happen within n_max_iterations iterations, a warning is issued
+        and converged is set to False.
+        The iterations start from the given pressures at the radial slices
+        (for example the pressures of a similar planet) if pressures is
+        not None, and from a linear pressure profile otherwise.
+
+        Each layer starts with n_slices uniformly spaced radial slices.
+        If mesh_tolerance is not None, the slices are refined adaptively:
+        after the iterations have converged, the slices are added in the
+        middle of the intervals with large estimated quadrature errors
+        (where the density changes rapidly, or jumps, e.g. at the transition
+        pressure of a :class:`burnman.HelperLowHighPressureRockTransition`),
+        and the iterations are continued, until the estimated errors of the
+        mass, moment of inertia and central pressure are smaller than
+        mesh_tolerance times their values, or until n_max_refinements
+        refinements have been made. In this case, n_slices can be much
+        smaller than the number of slices needed on a uniform grid.
+        The estimated errors are stored in mass_error,
+        moment_of_inertia_error and pressure_error.
         """
 
         # sort layers
         self.layers = sorted(layers, key=lambda x: x.outer_radius)
 
         # compute thickness, slices, indices, etc.
-        self.radial_slices = np.array([])
         current_radius = 0.0
-        n = 0
         for layer in self.layers:
             layer.inner_radius = current_radius
-            slices = np.linspace(current_radius, layer.outer_radius, layer.n_slices)
             layer.thickness = layer.outer_radius - layer.inner_radius
             current_radius = layer.outer_radius
-            slices[0] += 1 # make the boundaries one meter thick
-            layer.n_start = n
-            layer.n_end = n + layer.n_slices
-            n += layer.n_slices
-            self.radial_slices = np.append(self.radial_slices, slices)
-
-        self.radial_slices[0] = 0.0  # overwrite inner-most radius to zero
+        layer_slices = _layer_slices(self.layers)
         self.radius = current_radius
-
-        # initial pressure guess: linear as a function of radius
-        max_p = 350e9
-        self.pressures = np.array([max_p * (1.0 - r / self.radius) for r in self.radial_slices])
-        self.temperatures = [self.get_layer_by_radius(r).temperature(r) for r in self.radial_slices]
-        self.densities = np.empty_like(self.pressures)
-        self.gravity = np.empty_like(self.pressures)
+        self._transition_radii = [np.array([])] * len(self.layers)
+        self._set_radial_slices(layer_slices)
+
+        if pressures is not None:
+            self.pressures = np.array(pressures, dtype=float)
+            if self.pressures.shape != self.radial_slices.shape:
+                raise ValueError('The initial pressures must be given at each of the '
+                                 '{0} radial slices of the planet'.format(len(self.radial_slices)))
+        else:
+            # initial pressure guess: linear as a function of radius
+            max_p = 350e9
+            self.pressures = max_p * (1.0 - self.radial_slices / self.radius)
 
         self.averaging_scheme = averaging_schemes.VoigtReussHill()
 
-        last_center_pressure = 0.0
+        self.n_eos_evaluations = 0
+        self.n_iterations = 0
+        self._iterate(n_max_iterations, tolerance, n_anderson, verbose)
+
+        if mesh_tolerance is not None:
+            for i in range(n_max_refinements):
+                refine = self._refinement_intervals(mesh_tolerance)
+                transitions = [self._transitions(layer) for layer in self.layers]
+                if not any(np.any(r) for r in refine) and not any(len(t[0]) for t in transitions):
+                    break
+                if verbose:
+                    print("refining %d of %d radial intervals" % (sum(np.sum(r) for r in refine),
+                                                                  len(self.radial_slices) - len(self.layers)))
+                self._refine(refine, transitions, mesh_tolerance)
+                self._iterate(n_max_iterations, tolerance, n_anderson, verbose)
+
+        self.mass = self._compute_mass()
+
+        self.moment_of_inertia = self._compute_moment_of_inertia()
+        self.moment_of_inertia_factor = self.moment_of_inertia / self.mass / self.radial_slices[-1] / self.radial_slices[-1]
+
+        errors = self._interval_errors()
+        self.mass_error, self.moment_of_inertia_error, self.pressure_error = [
+            sum(np.sum(e[j]) for e in errors) for j in range(3)]
+
+    def _set_radial_slices(self, layer_slices):
+        """
+        Sets the radial slices of the planet to the given list
+        of the radial slices of each layer, and the temperatures at the slices.
+        """
+        n = 0
+        for layer, slices in zip(self.layers, layer_slices):
+            layer.n_start = n
+            layer.n_end = n + len(slices)
+            n += len(slices)
+        self.radial_slices = np.concatenate(layer_slices)
+        self.radial_slices[0] = 0.0  # overwrite inner-most radius to zero
+
+        self.temperatures = np.array([self.get_layer_by_radius(r).temperature(r) for r in self.radial_slices])
+        self.densities = np.empty_like(self.radial_slices)
+        self.gravity = np.empty_like(self.radial_slices)
+        self._eos_pressures = [None] * len(self.layers)
+
+    def _iterate(self, n_max_iterations, tolerance, n_anderson, verbose):
+        """
+        Iterates the pressures, densities and gravity on the current radial
+        slices until they are self-consistent.
+        """
+        residuals = []
+        profiles = []
         for i in range(n_max_iterations):
             if verbose:
                 print("on iteration %d" % (i+1))
-            self._evaluate_eos()
+            self._evaluate_eos(0.1 * tolerance * self.pressures[0])
 
+            pressures = self.pressures
             self._compute_gravity(self.densities, self.radial_slices)
             self._compute_pressure(self.densities, self.gravity, self.radial_slices)
 
-            # compute relative error (pressure in the center of our planet)
-            rel_err = abs(last_center_pressure - self.pressures[0]) / self.pressures[0]
+            # compute relative error (largest change in pressure)
+            residual = self.pressures - pressures
+            rel_err = np.max(np.abs(residual)) / self.pressures[0]
             if verbose:
                 print("  relative central core pressure error between iterations: %e" % rel_err)
 
-            if rel_err < 1e-5:
+            self.n_iterations += 1
+            if rel_err < tolerance:
+                self.converged = True
                 break
-            last_center_pressure = self.pressures[0]
 
-        self.mass = self._compute_mass()
+            residuals = (residuals + [residual])[-n_anderson - 1:]
+            profiles = (profiles + [self.pressures])[-n_anderson - 1:]
+            if len(residuals) > 1:
+                self.pressures = self._anderson_mixing(residuals, profiles)
+        else:
+            self.converged = False
+            warnings.warn('The planet did not converge in {0} iterations (the relative change '
+                          'in pressure was {1:.2e})'.format(n_max_iterations, rel_err), stacklevel=3)
 
-        self.moment_of_inertia = self._compute_moment_of_inertia()
-        self.moment_of_inertia_factor = self.moment_of_inertia / self.mass / self.radial_slices[-1] / self.radial_slices[-1]
+    def _breaks(self, layer):
+        """
+        Returns the indices of the intervals between the radial slices
+        of the layer which have been added around phase transitions.
+        """
+        radii = self.radial_slices[layer.n_start: layer.n_end]
+        return np.searchsorted(radii, self._transition_radii[self.layers.index(layer)])
+
+    def _interval_errors(self):
+        """
+        Returns, for each layer, the estimated quadrature errors of the
+        integrals of the mass, the moment of inertia and the pressure
+        over each interval between the radial slices of the layer.
+        """
+        errors = []
+        for layer in self.layers:
+            radii = self.radial_slices[layer.n_start: layer.n_end]
+            density = self.densities[layer.n_start: layer.n_end]
+            gravity = self.gravity[layer.n_start: layer.n_end]
+            breaks = self._breaks(layer)
+            errors.append([_interval_errors(radii, 4.0 * np.pi * density * radii * radii, breaks),
+                           _interval_errors(radii, 8.0/3.0 * np.pi * density * radii * radii * radii * radii,
+                                            breaks),
+                           _interval_errors(radii, gravity * density, breaks)])
+        return errors
+
+    def _refinement_intervals(self, mesh_tolerance):
+        """
+        Returns, for each layer, a boolean array which is True for
+        the intervals between the radial slices which need to be refined,
+        because their estimated quadrature errors are larger than
+        mesh_tolerance times the mass, moment of inertia or central pressure,
+        multiplied by the relative thickness of the interval.
+        The intervals around phase transitions are not refined.
+        """
+        totals = [self._compute_mass(), self._compute_moment_of_inertia(), self.pressures[0]]
+        refine = []
+        for layer, layer_errors in zip(self.layers, self._interval_errors()):
+            radii = self.radial_slices[layer.n_start: layer.n_end]
+            thickness = np.diff(radii) / self.radius
+            r = np.any([e > mesh_tolerance * total * thickness
+                        for e, total in zip(layer_errors, totals)], axis=0)
+            r[self._breaks(layer)] = False
+            refine.append(r)
+        return refine
+
+    def _transitions(self, layer):
+        """
+        Returns the indices of the intervals between the radial slices
+        of the layer which contain the transition pressure of its rock
+        (if the rock has a transition_pressure, as for example
+        :class:`burnman.HelperLowHighPressureRockTransition`),
+        except for the intervals which have been added around phase
+        transitions, and the radii of the transitions in these intervals.
+        """
+        transition_pressure = getattr(layer.rock, 'transition_pressure', None)
+        if transition_pressure is None:
+            return np.array([], dtype=int), np.array([])
+        radii = self.radial_slices[layer.n_start: layer.n_end]
+        pressures = self.pressures[layer.n_start: layer.n_end]
+        i = np.nonzero((pressures[:-1] >= transition_pressure) & (pressures[1:] < transition_pressure))[0]
+        i = np.setdiff1d(i, self._breaks(layer))
+        return i, radii[i] + ((pressures[i] - transition_pressure) / (pressures[i] - pressures[i + 1]) *
+                              (radii[i + 1] - radii[i]))
+
+    def _refine(self, refine, transitions, mesh_tolerance):
+        """
+        Adds radial slices in the middle of the intervals of each layer for
+        which refine is True, and pairs of radial slices at a distance of
+        2 mesh_tolerance times the radius of the planet (at most half of
+        the interval) around the phase transitions in the intervals given
+        by transitions. The pressures are interpolated to the new slices.
+        """
+        layer_slices = []
+        layer_pressures = []
+        for j, (layer, r, (i, r_t)) in enumerate(zip(self.layers, refine, transitions)):
+            radii = self.radial_slices[layer.n_start: layer.n_end]
+            r[i] = False
+
+            h = radii[i + 1] - radii[i]
+            delta = np.minimum(mesh_tolerance * self.radius, 0.25 * h)
+            r_t = np.clip(r_t, radii[i] + 2. * delta, radii[i + 1] - 2. * delta)
+            self._transition_radii[j] = np.sort(np.concatenate((self._transition_radii[j], r_t - delta)))
+
+            slices = np.sort(np.concatenate((radii, 0.5 * (radii[:-1] + radii[1:])[r],
+                                             r_t - delta, r_t + delta)))
+            layer_pressures.append(np.interp(slices, radii, self.pressures[layer.n_start: layer.n_end]))
+            layer_slices.append(slices)
+        self._set_radial_slices(layer_slices)
+        self.pressures = np.concatenate(layer_pressures)
 
     def get_layer(self, name):
         for layer in self.layers:
@@ -125,16 +301,38 @@ class Planet(object):
                 return layer
         raise LookupError()
 
-    def _evaluate_eos(self):
-        # evaluate each layer separately
-        for layer in self.layers:
+    def _evaluate_eos(self, pressure_tolerance=0.):
+        """
+        Evaluates the densities of each layer separately. Layers whose
+        pressures have not changed by more than pressure_tolerance since
+        their densities were last evaluated keep their densities.
+        """
+        for i, layer in enumerate(self.layers):
             mypressures = self.pressures[layer.n_start: layer.n_end]
             mytemperatures = self.temperatures[layer.n_start: layer.n_end]
 
+            if (self._eos_pressures[i] is not None and
+                    np.max(np.abs(mypressures - self._eos_pressures[i])) <= pressure_tolerance):
+                continue
+
             density = layer.rock.evaluate(['density'], mypressures, mytemperatures)
+            self.n_eos_evaluations += 1
 
+            self._eos_pressures[i] = np.copy(mypressures)
             self.densities[layer.n_start: layer.n_end] = density
 
+    def _anderson_mixing(self, residuals, profiles):
+        """
+        Returns the next pressure profile from the last pressure profiles
+        and their changes in the fixed point iterations, as the combination
+        of the profiles which minimizes the combined changes
+        (Anderson mixing). Negative pressures are set to zero.
+        """
+        d_residuals = np.diff(residuals, axis=0).T
+        d_profiles = np.diff(profiles, axis=0).T
+        gamma = np.linalg.lstsq(d_residuals, residuals[-1], rcond=None)[0]
+        return np.maximum(profiles[-1] - d_profiles.dot(gamma), 0.)
+
     def _compute_gravity(self, density, radii):
         """
         Calculate the gravity of the planet, based on a density profile.  This integrates
@@ -146,12 +344,10 @@ class Planet(object):
         for layer in self.layers:
             radii = self.radial_slices[layer.n_start: layer.n_end]
             density = self.densities[layer.n_start: layer.n_end]
-            rhofunc = UnivariateSpline(radii, density)
-            #Create a spline fit of density as a function of radius
 
             #Numerically integrate Poisson's equation
-            poisson = lambda p, x: 4.0 * np.pi * constants.G * rhofunc(x) * x * x
-            grav = np.ravel(odeint( poisson, start_gravity, radii))
+            grav = start_gravity + _cumulative_integral(radii, 4.0 * np.pi * constants.G * density * radii * radii,
+                                                       self._breaks(layer))
             start_gravity = grav[-1]
             self.gravity[layer.n_start: layer.n_end] = grav
 
@@ -164,25 +360,20 @@ class Planet(object):
         the equation for hydrostatic equilibrium  P = rho g z.
         """
 
+        pressures = np.empty_like(self.pressures)
         start_pressure = 0.0
         for layer in self.layers[::-1]:
             radii = self.radial_slices[layer.n_start: layer.n_end]
             density = self.densities[layer.n_start: layer.n_end]
             gravity = self.gravity[layer.n_start: layer.n_end]
 
-            # convert radii to depths
-            depths = radii[-1]-radii
-
-            # Make a spline fit of density as a function of depth
-            rhofunc = UnivariateSpline(depths[::-1], density[::-1])
-            # Make a spline fit of gravity as a function of depth
-            gfunc = UnivariateSpline(depths[::-1], gravity[::-1])
-
-            # integrate the hydrostatic equation
-            pressure = np.ravel(odeint((lambda p, x : gfunc(x)* rhofunc(x)), start_pressure, depths[::-1]))
-            start_pressure = pressure[-1]
+            # integrate the hydrostatic equation from the top of the layer
+            integral = _cumulative_integral(radii, gravity * density, self._breaks(layer))
+            pressure = start_pressure + integral[-1] - integral
+            start_pressure = pressure[0]
 
-            self.pressures[layer.n_start: layer.n_end] = pressure[::-1]
+            pressures[layer.n_start: layer.n_end] = pressure
+        self.pressures = pressures
 
     def _compute_mass( self):
         """
@@ -192,9 +383,7 @@ class Planet(object):
         for layer in self.layers:
             radii = self.radial_slices[layer.n_start: layer.n_end]
             density = self.densities[layer.n_start: layer.n_end]
-            rhofunc = UnivariateSpline(radii, density)
-            layer.mass = quad(lambda r : 4*np.pi*rhofunc(r)*r*r,
-                            radii[0], radii[-1])[0]
+            layer.mass = _cumulative_integral(radii, 4*np.pi*density*radii*radii, self._breaks(layer))[-1]
             mass += layer.mass
         return mass
 
@@ -206,7 +395,221 @@ class Planet(object):
         for layer in self.layers:
             radii = self.radial_slices[layer.n_start: layer.n_end]
             density = self.densities[layer.n_start: layer.n_end]
-            rhofunc = UnivariateSpline(radii, density)
-            moment += quad(lambda r : 8.0/3.0*np.pi*rhofunc(r)*r*r*r*r,
-                           radii[0], radii[-1])[0]
+            moment += _cumulative_integral(radii, 8.0/3.0*np.pi*density*radii*radii*radii*radii,
+                                           self._breaks(layer))[-1]
         return moment
+
+
+def _layer_slices(layers):
+    """
+    Returns the list of the initial radial slices of each of the
+    given layers (sorted by radius), with n_slices uniformly spaced slices
+    from the outer radius of the layer below to the outer radius of the layer.
+    """
+    layer_slices = []
+    current_radius = 0.0
+    for layer in layers:
+        slices = np.linspace(current_radius, layer.outer_radius, layer.n_slices)
+        current_radius = layer.outer_radius
+        slices[0] += 1 # make the boundaries one meter thick
+        layer_slices.append(slices)
+    return layer_slices
+
+
+def _build_planets(args):
+    """
+    Builds the planets for a list of lists of layers in turn, starting the
+    iterations for each planet from the pressures of the previous planet,
+    interpolated in radius normalised by the radius of the planets.
+    Returns the stacked properties of the planets.
+    """
+    layers_list, kwargs = args
+    properties = dict((name, []) for name in PlanetFamily.properties)
+    p = None
+    for layers in layers_list:
+        pressures = None
+        if p is not None:
+            radial_slices = np.concatenate(_layer_slices(sorted(layers, key=lambda x: x.outer_radius)))
+            radial_slices[0] = 0.0
+            pressures = np.interp(radial_slices / radial_slices[-1],
+                                  p.radial_slices / p.radius, p.pressures)
+        p = Planet(layers, pressures=pressures, **kwargs)
+        for name in PlanetFamily.properties:
+            if name == 'layer_masses':
+                properties[name].append([layer.mass for layer in p.layers])
+            else:
+                properties[name].append(getattr(p, name))
+    return properties
+
+
+class PlanetFamily(object):
+    """
+    A family of self-consistent planets, for example the planets of a
+    mass-radius diagram, or of a range of core radii or layer temperatures.
+
+    The layers of each planet are returned by a function of a parameter,
+    which is called for each of the given parameters, in order. The planets
+    are built with :class:`Planet`, and the iterations for each planet
+    start from the pressures of the previous planet (interpolated in
+    radius relative to the radius of the planets), so the parameters are
+    best given in increasing or decreasing order.
+
+    The planets are built by a pool of worker processes (with
+    :func:`burnman.ParallelEvaluator.map`), each of which builds a chunk of
+    consecutive planets. The layers must be picklable for this; otherwise,
+    or if there is only one process, the chunks are built in the
+    current process.
+
+    If table_pressures and table_temperatures are given (either both
+    or neither must be given), each rock
+    of the layers (each distinct object, so that rocks which are shared by
+    the layers of several planets are tabulated once) is replaced by a
+    :class:`burnman.TabulatedMaterial` on this grid, which is calculated
+    once before the planets are built. The grid must contain all the
+    pressures and temperatures of the iterations, including those of
+    the initial linear pressure profile (up to 350 GPa).
+
+    The properties of the planets are stacked in arrays, whose first axis
+    runs over the planets: radius, mass, moment_of_inertia,
+    moment_of_inertia_factor, n_iterations, converged and layer_masses
+    (of shape (n_planets, n_layers), with the layers sorted by radius,
+    so that for example the core mass fractions are
+    layer_masses[:,0]/mass), and the profiles
+    radial_slices, pressures, temperatures, densities and gravity (of
+    shape (n_planets, n_slices), if all the planets have the same number
+    of radial slices, and lists of arrays otherwise).
+
+    Parameters
+    ----------
+    layers_function : function
+        Function of a parameter returning the list of layers of a planet.
+        New layers should be returned for each parameter.
+    parameters : list
+        The parameters of the planets.
+    processes : int (optional)
+        Number of worker processes. Defaults to the number of CPUs.
+    table_pressures : array of floats (optional)
+        Pressures of the tables of the rocks [Pa].
+    table_temperatures : array of floats (optional)
+        Temperatures of the tables of the rocks [K].
+    planet_kwargs : keyword arguments
+        Other keyword arguments are passed to :class:`Planet`
+        (for example n_max_iterations or tolerance).
+    """
+
+    properties = ['radius', 'mass', 'moment_of_inertia', 'moment_of_inertia_factor',
+                  'n_iterations', 'converged', 'layer_masses', 'radial_slices', 'pressures',
+                  'temperatures', 'densities', 'gravity']
+
+    def __init__(self, layers_function, parameters, processes=None,
+                 table_pressures=None, table_temperatures=None, **planet_kwargs):
+        if (table_pressures is None) != (table_temperatures is None):
+            raise ValueError('Both table_pressures and table_temperatures '
+                             'must be given to tabulate the rocks')
+        self.parameters = parameters
+        layers_list = [list(layers_function(parameter)) for parameter in parameters]
+
+        if table_pressures is not None:
+            # the rocks are kept in tables, so that their ids are not reused
+            tables = {}
+            for layers in layers_list:
+                for layer in layers:
+                    if id(layer.rock) not in tables:
+                        tables[id(layer.rock)] = (layer.rock, TabulatedMaterial(layer.rock, table_pressures,
+                                                                                table_temperatures,
+                                                                                ['density']))
+                    layer.rock = tables[id(layer.rock)][1]
+
+        with ParallelEvaluator(processes) as evaluator:
+            results = evaluator.map(_build_planets, [(layers_list[c], planet_kwargs)
+                                                     for c in evaluator.chunks(len(layers_list))])
+
+        for name in self.properties:
+            values = [value for result in results for value in result[name]]
+            if len(set(np.shape(value) for value in values)) == 1:
+                values = np.array(values)
+            setattr(self, name, values)
+
+
+def _stencils(n, breaks, n_points):
+    """
+    Returns, for each of the n-1 intervals between n points, the index of
+    the first of the n_points consecutive points around the interval,
+    which do not cross the intervals with the indices breaks, and
+    a boolean array which is True for the breaks and for the intervals
+    which are between fewer than n_points points without a break.
+    """
+    breaks = np.asarray(breaks, dtype=int)
+    starts = np.concatenate(([0], breaks + 1))
+    ends = np.concatenate((breaks, [n - 1]))
+    intervals = np.arange(n - 1)
+    segments = np.searchsorted(starts, intervals, side='right') - 1
+    first = np.clip(intervals - (n_points - 1) // 2, starts[segments],
+                    ends[segments] - n_points + 1)
+    too_few = (intervals >= ends[segments]) | (ends[segments] - starts[segments] + 1 < n_points)
+    return np.clip(first, 0, n - n_points), too_few
+
+
+def _cumulative_integral(x, y, breaks=()):
+    """
+    Returns the cumulative integrals of y from x[0] to each x. On each
+    interval, y is integrated exactly as the cubic polynomial through the
+    values at the ends of the interval and at the neighbouring points
+    (the two next or previous points on the first and last intervals),
+    which is fourth order accurate on non-uniform grids. At least four
+    points are needed.
+
+    The intervals with the indices breaks (across which y may jump)
+    are integrated with the trapezoidal rule, and the polynomials of the
+    other intervals do not extend across them (intervals between fewer
+    than four points without a break are also integrated with the
+    trapezoidal rule).
+    """
+    first, too_few = _stencils(len(x), breaks, 4)
+    points = first[:, np.newaxis] + np.arange(4)
+    xs = x[points]
+    ys = y[points]
+
+    # Newton's divided differences
+    d1 = (ys[:, 1:] - ys[:, :-1]) / (xs[:, 1:] - xs[:, :-1])
+    d2 = (d1[:, 1:] - d1[:, :-1]) / (xs[:, 2:] - xs[:, :-2])
+    d3 = (d2[:, 1] - d2[:, 0]) / (xs[:, 3] - xs[:, 0])
+
+    # integrals of the Newton basis polynomials over the intervals
+    h = x[1:] - x[:-1]
+    c = xs - x[:-1, np.newaxis]
+    integrals = (ys[:, 0] * h
+                 + d1[:, 0] * (h * h / 2. - c[:, 0] * h)
+                 + d2[:, 0] * (h * h * h / 3. - (c[:, 0] + c[:, 1]) * h * h / 2.
+                               + c[:, 0] * c[:, 1] * h)
+                 + d3 * (h * h * h * h / 4. - (c[:, 0] + c[:, 1] + c[:, 2]) * h * h * h / 3.
+                         + (c[:, 0] * c[:, 1] + c[:, 0] * c[:, 2] + c[:, 1] * c[:, 2]) * h * h / 2.
+                         - c[:, 0] * c[:, 1] * c[:, 2] * h))
+    integrals = np.where(too_few, 0.5 * (y[1:] + y[:-1]) * h, integrals)
+    return np.concatenate(([0.], np.cumsum(integrals)))
+
+
+def _interval_errors(x, y, breaks=()):
+    """
+    Returns estimates of the errors of the integrals of y over each
+    interval between the points x calculated by :func:`_cumulative_integral`,
+    from the fourth divided difference of y on five points around the
+    interval and the interpolation error of the cubic polynomial
+    in the middle of the interval. At least five points are needed.
+
+    The errors of the breaks, and of the intervals between fewer than
+    five points without a break, are estimated as half of the change
+    of y times the width of the interval.
+    """
+    first, too_few = _stencils(len(x), breaks, 5)
+    points = first[:, np.newaxis] + np.arange(5)
+    xs = x[points]
+    d4 = y[points]
+    for k in range(1, 5):
+        d4 = (d4[:, 1:] - d4[:, :-1]) / (xs[:, k:] - xs[:, :-k])
+
+    h = x[1:] - x[:-1]
+    middle = 0.5 * (x[1:] + x[:-1])
+    cubic_points = _stencils(len(x), breaks, 4)[0][:, np.newaxis] + np.arange(4)
+    errors = np.abs(d4[:, 0] * h * np.prod(middle[:, np.newaxis] - x[cubic_points], axis=1))
+    return np.where(too_few, 0.5 * np.abs(y[1:] - y[:-1]) * h, errors)
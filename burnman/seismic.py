@@ -5,6 +5,11 @@
 
 from __future__ import absolute_import
 
+import hashlib
+import os
+import pkgutil
+import tempfile
+
 import numpy as np
 import warnings
 import scipy.integrate
@@ -227,26 +232,198 @@ class SeismicTable(Seismic1DModel):
     Note: all tables need to be sorted by increasing depth. self.table_depth needs to be defined
     Alternatively, you can also overwrite the _lookup function if you
     want to access with something else.
+
+    When the model is first evaluated, the tables of the columns in
+    table_columns which are defined at all the depths are stacked in one
+    contiguous two-dimensional array, and the tables become views of its rows.
+    :func:`evaluate` interpolates all the requested properties at all
+    the depths in one pass, and can return the values on either side
+    of the discontinuities of the model.
+
+    The tables of the models which are included in BurnMan are read from
+    the data files only once in each process, when they are first used
+    (see :func:`burnman.seismic.model_tables`), and are shared between
+    all the instances of the models as read-only arrays.
     """
 
+    table_columns = ['depth', 'radius', 'pressure', 'gravity', 'density',
+                     'vp', 'vs', 'QG', 'QK']
+
+    # the columns needed for each of the variables of evaluate
+    _evaluate_columns = {'pressure': ['pressure'], 'gravity': ['gravity'], 'density': ['density'],
+                         'v_p': ['vp'], 'v_s': ['vs'], 'QG': ['QG'], 'QK': ['QK'],
+                         'v_phi': ['vp', 'vs'], 'G': ['vs', 'density'], 'K': ['vp', 'vs', 'density']}
+
+    # the name of the model in the registry of seismic models, whose
+    # tables are loaded when they are first needed
+    _model_name = None
+
     def __init__(self):
         Seismic1DModel.__init__(self)
 
-        self.table_depth = []
-        self.table_radius = []
-        self.table_pressure = []
-        self.table_gravity = []
-        self.table_density = []
-        self.table_vp = []
-        self.table_vs = []
-        self.table_QG = []
-        self.table_QK = []
+        self._loaded_columns = None
+        self._shared_columns = False
+        self._table = None
 
         self.earth_radius = 6371.0e3
 
+    @property
+    def _columns(self):
+        """
+        The dictionary of the tables of the columns, which are
+        loaded from the registry of seismic models on first access.
+        """
+        if self._loaded_columns is None:
+            columns = dict((name, []) for name in self.table_columns)
+            if self._model_name is not None:
+                tables = model_tables(self._model_name)
+                for name in tables.dtype.names:
+                    columns[name] = tables[name]
+                self._shared_columns = True
+            self._loaded_columns = columns
+        return self._loaded_columns
+
+    def _stacked_table(self):
+        """
+        Returns the array of shape (number of columns, number of depths)
+        with the tables which are defined at all the depths, and stores
+        the indices of the rows of the columns, the indices of the
+        discontinuities (the first of each pair of equal depths)
+        and the range of the pressures.
+        As long as none of the tables of a model from the registry of
+        seismic models has been set, these arrays are shared with the
+        registry (and all the other instances of the model).
+        """
+        if self._table is None:
+            columns = self._columns
+            if self._shared_columns:
+                if self._model_name not in _stacked_model_tables:
+                    tables = model_tables(self._model_name)
+                    names = tables.dtype.names
+                    table = tables.reshape(1).view(float).reshape(len(names), -1)
+                    stacked = _interpolation_tables(table, names)
+                    for array in stacked[2:5]:
+                        array.flags.writeable = False
+                    _stacked_model_tables[self._model_name] = stacked
+                stacked = _stacked_model_tables[self._model_name]
+            else:
+                n = len(columns['depth'])
+                names = [name for name in self.table_columns
+                         if n > 0 and len(columns[name]) == n]
+                table = np.array([columns[name] for name in names], dtype=float).reshape(len(names), n)
+                for i, name in enumerate(names):
+                    columns[name] = table[i]
+                stacked = _interpolation_tables(table, names)
+            (self._table, self._rows, self._padded_table, self._padded_depth,
+             self._slopes, self._discontinuities, self._pressure_range) = stacked
+        return self._table
+
+    @property
+    def discontinuities(self):
+        """
+        The depths of the discontinuities of the model [m],
+        at which the tables have two entries.
+        """
+        self._stacked_table()
+        return self._columns['depth'][self._discontinuities]
+
+    def _check_column(self, name):
+        """
+        Computes the pressures or gravity if they are not given
+        in the tables, and raises an exception if the densities are not given.
+        """
+        if len(self._columns[name]) > 0:
+            return
+        if name == 'pressure':
+            warnings.warn("Pressure is not given in " + self.__class__.__name__ + " and is now being computed. This will only work when density is defined for the entire planet. Use at your own risk. ")
+            self._compute_pressure()
+        elif name == 'gravity':
+            warnings.warn("Gravity is not given in " + self.__class__.__name__ + " and is now being computed. This will only work when density is defined for the entire planet.  Use at your own risk. ")
+            self._compute_gravity()
+        elif name == 'density':
+            raise ValueError(
+                "Density has not been defined for this seismic model")
+
+    def evaluate(self, vars_list, depth_list, side='below'):
+        """
+        Returns the lists of data for a Seismic1DModel for the depths provided
+
+        Parameters
+        ----------
+        vars_list : array of str
+            Available variables depend on the seismic model, and can be chosen from 'pressure','density','gravity','v_s','v_p','v_phi','G','K','QG','QK'
+        depth_list : array of floats
+            Array of depths [m] to evaluate seismic model at.
+        side : string (optional)
+            At the depths of discontinuities, the values below the
+            discontinuity are returned if side is 'below' (the default, as
+            for the methods of the individual properties), and the values
+            above the discontinuity if side is 'above'.
+
+        Returns
+        -------
+        Array of values shapes as (len(vars_list),len(depth_list)).
+
+        """
+        if type(self)._lookup is not SeismicTable._lookup:
+            return Seismic1DModel.evaluate(self, vars_list, depth_list)
+
+        names = []
+        for var in vars_list:
+            for name in self._evaluate_columns[var]:
+                if name not in names:
+                    self._check_column(name)
+                    names.append(name)
+        values = dict(zip(names, self._interpolate(names, depth_list, side)))
+        values['v_p'] = values.get('vp')
+        values['v_s'] = values.get('vs')
+
+        if 'v_phi' in vars_list or 'K' in vars_list:
+            values['v_phi'] = np.sqrt(values['vp'] * values['vp'] - 4. / 3. * values['vs'] * values['vs'])
+        if 'G' in vars_list:
+            values['G'] = np.power(values['vs'], 2.) * values['density']
+        if 'K' in vars_list:
+            values['K'] = np.power(values['v_phi'], 2.) * values['density']
+        return np.array([values[var] for var in vars_list])
+
+    def _interpolate(self, names, depth, side='below'):
+        """
+        Returns the tables with the given column names linearly interpolated
+        at the given depths, as an array of shape (len(names),) + shape of depth,
+        in one pass for all the columns. At each depth, the values are the
+        same as those of numpy.interp, except at the depths of discontinuities
+        if side is 'above'. Outside the range of depths, the values
+        at the shallowest and deepest depths are returned.
+        """
+        self._stacked_table()
+        for name in names:
+            if name not in self._rows:
+                raise ValueError("The " + name + " table is not defined at all the depths "
+                                 "of " + self.__class__.__name__)
+        rows = [self._rows[name] for name in names]
+        xp = self._padded_depth
+        x = np.maximum(np.asarray(depth, dtype=float), xp[0])
+
+        if side == 'below':
+            j = np.searchsorted(xp, x, side='right') - 1
+        elif side == 'above':
+            j = np.maximum(np.searchsorted(xp, x, side='left') - 1, 0)
+        else:
+            raise ValueError("side must be 'below' or 'above'")
+
+        # x lies in an interval of finite width starting at xp[j]
+        result = self._slopes[rows][:, j] * (x - xp[j]) + self._padded_table[rows][:, j]
+        if side == 'above':
+            result = np.where(x == xp[j + 1], self._padded_table[rows][:, j + 1], result)
+        return result
+
     def internal_depth_list(self, mindepth=0., maxdepth=1.e10):
-        depths = np.array([self.table_depth[x] for x in range(len(self.table_depth)) if self.table_depth[x] >= mindepth and self.table_depth[x] <= maxdepth])
-        discontinuities = np.where(depths[1:] - depths[:-1] == 0)[0]
+        self._stacked_table()
+        table_depth = self._columns['depth']
+        mask = np.logical_and(table_depth >= mindepth, table_depth <= maxdepth)
+        depths = table_depth[mask]
+        # the positions of the discontinuities in the depths within the bounds
+        discontinuities = (np.cumsum(mask) - 1)[self._discontinuities[mask[self._discontinuities]]]
         # Shift values at discontinities by 1 m to simplify evaluating values
         # around these.
         depths[discontinuities] = depths[discontinuities] - 1.
@@ -254,15 +431,11 @@ class SeismicTable(Seismic1DModel):
         return depths
 
     def pressure(self, depth):
-        if len(self.table_pressure) == 0:
-                warnings.warn("Pressure is not given in " + self.__class__.__name__ + " and is now being computed. This will only work when density is defined for the entire planet. Use at your own risk. ")
-                self._compute_pressure()
+        self._check_column('pressure')
         return self._lookup(depth, self.table_pressure)
 
     def gravity(self, depth):
-        if len(self.table_gravity) == 0:
-                warnings.warn("Gravity is not given in " + self.__class__.__name__ + " and is now being computed. This will only work when density is defined for the entire planet.  Use at your own risk. ")
-                self._compute_gravity()
+        self._check_column('gravity')
         return self._lookup(depth, self.table_gravity)
 
     def v_p(self, depth):
@@ -282,13 +455,14 @@ class SeismicTable(Seismic1DModel):
         return self._lookup(depth, self.table_QG)
 
     def density(self, depth):
-        if len(self.table_density) == 0:
-            raise ValueError(
-                "Density has not been defined for this seismic model")
+        self._check_column('density')
         return self._lookup(depth, self.table_density)
 
     def depth(self, pressure):
-        if max(pressure) > max(self.table_pressure) or min(pressure) < min(self.table_pressure):
+        self._check_column('pressure')
+        self._stacked_table()
+        if (np.any(np.greater(pressure, self._pressure_range[1])) or
+                np.any(np.less(pressure, self._pressure_range[0]))):
             raise ValueError("Pressure outside range of SeismicTable")
 
         depth = np.interp(pressure, self.table_pressure, self.table_depth)
@@ -329,6 +503,226 @@ class SeismicTable(Seismic1DModel):
         self.table_pressure = pressure
 
 
+def _interpolation_tables(table, names):
+    """
+    Returns the stacked table of a SeismicTable with the given names of
+    its rows, the indices of the rows of the columns, the tables padded
+    for the interpolation, the slopes of the intervals between the depths,
+    the indices of the discontinuities and the range of the pressures
+    (or None if the pressures are not given).
+    """
+    rows = dict((name, i) for i, name in enumerate(names))
+    depth = table[rows['depth']]
+    # the values at the deepest depth are repeated at an infinite depth,
+    # and the slopes of the intervals of zero width are not used
+    padded_table = np.concatenate((table, table[:, -1:]), axis=1)
+    padded_depth = np.append(depth, np.inf)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slopes = ((padded_table[:, 1:] - padded_table[:, :-1]) /
+                  (padded_depth[1:] - padded_depth[:-1]))
+    discontinuities = np.nonzero(depth[1:] - depth[:-1] == 0)[0]
+    pressure_range = None
+    if 'pressure' in rows:
+        pressure = table[rows['pressure']]
+        pressure_range = (np.min(pressure), np.max(pressure))
+    return table, rows, padded_table, padded_depth, slopes, discontinuities, pressure_range
+
+
+def _table_column(name):
+    """
+    Returns a property for the table of the column with the given name of
+    a SeismicTable, which is reset whenever any of the tables is set.
+    """
+    def get_column(self):
+        return self._columns[name]
+
+    def set_column(self, values):
+        self._columns[name] = values
+        self._shared_columns = False
+        self._table = None
+
+    return property(get_column, set_column)
+
+
+for _name in SeismicTable.table_columns:
+    setattr(SeismicTable, 'table_' + _name, _table_column(_name))
+del _name
+
+
+def _read_prem(prem):
+    # data is: depth radius pressure density V_p V_s Q_K Q_G
+    return [('depth', prem[:, 0]), ('radius', prem[:, 1]), ('pressure', prem[:, 2]),
+            ('density', prem[:, 3]), ('vp', prem[:, 4]), ('vs', prem[:, 5]),
+            ('QK', prem[:, 6]), ('QG', prem[:, 7])]
+
+
+def _read_lekic(prem, swave, pwave, earth_radius=6371.0e3):
+    # stitches the lower mantle profiles of V_s and V_p into PREM
+    min_radius = earth_radius - max(swave[:, 0])
+    max_radius = earth_radius - min(swave[:, 0])
+
+    table = np.array(list(filter(lambda x: (x[1] >= min_radius and x[1] <= max_radius), prem)))
+
+    return [('depth', table[:, 0]), ('radius', table[:, 1]), ('pressure', table[:, 2]),
+            ('density', table[:, 3]),
+            ('vp', np.interp(table[:, 0], pwave[:, 0][::-1], pwave[:, 1][::-1])),
+            ('vs', np.interp(table[:, 0], swave[:, 0][::-1], swave[:, 1][::-1]))]
+
+
+def _read_stw105(table, earth_radius=6371.0e3):
+    # data is: radius density V_pv V_sv Q_K Q_G V_ph V_sh
+    table = table[::-1]
+    vpv, vsv, vph, vsh = table[:, 2], table[:, 3], table[:, 6], table[:, 7]
+    # Voigt averages for Vs and Vp
+    return [('depth', earth_radius - table[:, 0]), ('radius', table[:, 0]),
+            ('density', table[:, 1]),
+            ('vp', np.sqrt((vpv * vpv + 4. * vph * vph) / 5.)),
+            ('vs', np.sqrt((2. * vsv * vsv + vsh * vsh) / 3.)),
+            ('QG', table[:, 5]), ('QK', table[:, 4]),
+            ('vpv', vpv), ('vsv', vsv), ('vph', vph), ('vsh', vsh)]
+
+
+def _read_iasp91(table):
+    # data is: depth radius V_p V_s
+    return [('depth', table[:, 0]), ('radius', table[:, 1]),
+            ('vp', table[:, 2]), ('vs', table[:, 3])]
+
+
+def _read_ak135(table):
+    # data is: depth radius density V_p V_s Q_G Q_K
+    return [('depth', table[:, 0]), ('radius', table[:, 1]), ('density', table[:, 2]),
+            ('vp', table[:, 3]), ('vs', table[:, 4]), ('QG', table[:, 5]), ('QK', table[:, 6])]
+
+
+# the data files in input_seismic and the function which returns the
+# columns of each seismic model from the tables of the data files
+_seismic_models = {'PREM': (['prem.txt'], _read_prem),
+                   'Slow': (['prem.txt', 'swave_slow.txt', 'pwave_slow.txt'], _read_lekic),
+                   'Fast': (['prem.txt', 'swave_fast.txt', 'pwave_fast.txt'], _read_lekic),
+                   'STW105': (['STW105.txt'], _read_stw105),
+                   'IASP91': (['iasp91.txt'], _read_iasp91),
+                   'AK135': (['ak135.txt'], _read_ak135)}
+
+# the version of the tables which are built by the readers, which is part
+# of the names of the cache files and must be increased whenever a reader changes
+_tables_version = 1
+
+# the tables of the seismic models which have been loaded in this process,
+# and the stacked tables for their interpolation
+_model_tables = {}
+_stacked_model_tables = {}
+
+_cache_directory = os.environ.get('BURNMAN_SEISMIC_CACHE')
+
+
+def set_cache_directory(directory):
+    """
+    Sets the directory of the binary cache of the tables of the seismic
+    models. The tables of each model are stored there as a .npy file when
+    the model is first loaded, and all the processes which load the model
+    afterwards map this file into memory instead of reading the data files,
+    so that the tables are shared between the processes.
+    The cache files are named after the contents of the data files and
+    the version of the readers of the models, so that they are not used
+    if either changes.
+
+    The default directory is given by the environment variable
+    BURNMAN_SEISMIC_CACHE, which is also seen by worker processes
+    which are not forked from the current process.
+    If the directory is None, the tables are not cached.
+
+    Parameters
+    ----------
+    directory : string or None
+        Path of the cache directory, which is created if needed.
+    """
+    global _cache_directory
+    _cache_directory = directory
+
+
+def _read_model_tables(name, data):
+    """
+    Reads the tables of a seismic model from the contents of its data files,
+    and returns them as a structured array with one field for each column.
+    The columns are stored one after the other, so that the array
+    can also be viewed as an array of shape (number of columns, number of depths).
+    """
+    filenames, reader = _seismic_models[name]
+    columns = reader(*[tools.read_table('input_seismic/' + filename, contents)
+                       for filename, contents in zip(filenames, data)])
+    n = len(columns[0][1])
+    tables = np.empty((), dtype=[(column, float, (n,)) for column, values in columns])
+    for column, values in columns:
+        tables[column] = values
+    return tables
+
+
+def _cached_model_tables(name, data):
+    """
+    Returns the tables of a seismic model from the binary cache,
+    which are read and stored in the cache if they are not found there.
+    """
+    key = hashlib.sha1('{0} {1}'.format(_tables_version, _seismic_models[name][1].__name__).encode('ascii'))
+    for contents in data:
+        key.update(contents)
+    path = os.path.join(_cache_directory, '{0}-{1}.npy'.format(name, key.hexdigest()[:16]))
+    try:
+        return np.load(path, mmap_mode='r')
+    except (IOError, OSError, ValueError):
+        pass
+
+    tables = _read_model_tables(name, data)
+    try:
+        if not os.path.isdir(_cache_directory):
+            os.makedirs(_cache_directory)
+        # the file is renamed once it is complete, so that other processes
+        # never map an incomplete file
+        fd, tmp_path = tempfile.mkstemp(suffix='.npy', dir=_cache_directory)
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, tables)
+        getattr(os, 'replace', os.rename)(tmp_path, path)
+        return np.load(path, mmap_mode='r')
+    except (IOError, OSError) as e:
+        warnings.warn('Could not cache the tables of {0} in {1} ({2}).'.format(
+            name, _cache_directory, e), stacklevel=3)
+        return tables
+
+
+def model_tables(name):
+    """
+    Returns the tables of one of the seismic models included in BurnMan
+    as a read-only structured array with one field for each column
+    of the model (e.g. 'depth', 'density', 'vp').
+    The data files of each model are only read once in each process,
+    and the tables are shared by all the instances of the model.
+    See also :func:`set_cache_directory`.
+
+    Parameters
+    ----------
+    name : string
+        Name of the model, one of 'PREM', 'Slow', 'Fast', 'STW105',
+        'IASP91' or 'AK135'.
+
+    Returns
+    -------
+    tables : structured array of floats
+        The tables of the model, sorted by increasing depth.
+    """
+    if name not in _model_tables:
+        if name not in _seismic_models:
+            raise ValueError('There is no seismic model called {0}'.format(name))
+        data = [pkgutil.get_data('burnman', 'data/input_seismic/' + filename)
+                for filename in _seismic_models[name][0]]
+        if _cache_directory is None:
+            tables = _read_model_tables(name, data)
+        else:
+            tables = _cached_model_tables(name, data)
+        tables = tables.view(np.ndarray)
+        tables.flags.writeable = False
+        _model_tables[name] = tables
+    return _model_tables[name]
+
+
 class PREM(SeismicTable):
 
     """
@@ -336,18 +730,7 @@ class PREM(SeismicTable):
     See also :class:`burnman.seismic.SeismicTable`.
     """
 
-    def __init__(self):
-        SeismicTable.__init__(self)
-        table = tools.read_table("input_seismic/prem.txt")
-        table = np.array(table)
-        self.table_depth = table[:, 0]
-        self.table_radius = table[:, 1]
-        self.table_pressure = table[:, 2]
-        self.table_density = table[:, 3]
-        self.table_vp = table[:, 4]
-        self.table_vs = table[:, 5]
-        self.table_QK = table[:, 6]
-        self.table_QG = table[:, 7]
+    _model_name = 'PREM'
 
 
 class Slow(SeismicTable):
@@ -358,30 +741,7 @@ class Slow(SeismicTable):
     See also :class:`burnman.seismic.SeismicTable`.
     """
 
-    def __init__(self):
-        SeismicTable.__init__(self)
-
-        # data is: depth radius pressure density V_p V_s Q_K Q_G
-        table = tools.read_table("input_seismic/prem.txt")
-        table = np.array(table)
-        table2 = tools.read_table("input_seismic/swave_slow.txt")
-        table2 = np.array(table2)
-        table3 = tools.read_table("input_seismic/pwave_slow.txt")
-        table3 = np.array(table3)
-
-        min_radius = self.earth_radius - max(table2[:, 0])
-        max_radius = self.earth_radius - min(table2[:, 0])
-
-        table = np.array(list(filter(lambda x: (x[1] >= min_radius and x[1] <= max_radius), table)))
-
-        self.table_depth = table[:, 0]
-        self.table_radius = table[:, 1]
-        self.table_pressure = table[:, 2]
-        self.table_density = table[:, 3]
-        self.table_vp = np.interp(
-            self.table_depth, table3[:, 0][::-1], table3[:, 1][::-1])
-        self.table_vs = np.interp(
-            self.table_depth, table2[:, 0][::-1], table2[:, 1][::-1])
+    _model_name = 'Slow'
 
 
 class Fast(SeismicTable):
@@ -392,30 +752,7 @@ class Fast(SeismicTable):
     See also :class:`burnman.seismic.Seismic1DModel`.
     """
 
-    def __init__(self):
-        SeismicTable.__init__(self)
-
-        # data is: radius pressure density V_p V_s Q_K Q_G
-        table = tools.read_table("input_seismic/prem.txt")
-        table = np.array(table)
-        table2 = tools.read_table("input_seismic/swave_fast.txt")
-        table2 = np.array(table2)
-        table3 = tools.read_table("input_seismic/pwave_fast.txt")
-        table3 = np.array(table3)
-
-        min_radius = self.earth_radius - max(table2[:, 0])
-        max_radius = self.earth_radius - min(table2[:, 0])
-
-        table = np.array(list(filter(lambda x: (x[1] >= min_radius and x[1] <= max_radius), table)))
-
-        self.table_depth = table[:, 0]
-        self.table_radius = table[:, 1]
-        self.table_pressure = table[:, 2]
-        self.table_density = table[:, 3]
-        self.table_vp = np.interp(
-            self.table_depth, table3[:, 0][::-1], table3[:, 1][::-1])
-        self.table_vs = np.interp(
-            self.table_depth, table2[:, 0][::-1], table2[:, 1][::-1])
+    _model_name = 'Fast'
 
 
 class STW105(SeismicTable):
@@ -425,24 +762,13 @@ class STW105(SeismicTable):
     See also :class:`burnman.seismic.SeismicTable`.
     """
 
-    def __init__(self):
-        SeismicTable.__init__(self)
-        table = tools.read_table("input_seismic/STW105.txt") # radius, pressure, density, v_p, v_s
-        table = np.array(table)
-        self.table_radius = table[:, 0][::-1]
-        self.table_density = table[:, 1][::-1]
-        self.table_vpv = table[:, 2][::-1]
-        self.table_vsv = table[:, 3][::-1]
-        self.table_QK = table[:, 4][::-1]
-        self.table_QG = table[:, 5][::-1]
-        self.table_vph = table[:, 6][::-1]
-        self.table_vsh = table[:, 7][::-1]
+    _model_name = 'STW105'
+    table_columns = SeismicTable.table_columns + ['vpv', 'vsv', 'vph', 'vsh']
 
-        self.table_depth = self.earth_radius-self.table_radius
 
-        # Voigt averages for Vs and Vp
-        self.table_vs = np.sqrt((2.*self.table_vsv*self.table_vsv+self.table_vsh*self.table_vsh)/3.)
-        self.table_vp = np.sqrt((self.table_vpv*self.table_vpv+4.*self.table_vph*self.table_vph)/5.)
+for _name in ['vpv', 'vsv', 'vph', 'vsh']:
+    setattr(STW105, 'table_' + _name, _table_column(_name))
+del _name
 
 
 class IASP91(SeismicTable):
@@ -451,15 +777,7 @@ class IASP91(SeismicTable):
     See also :class:`burnman.seismic.SeismicTable`.
     """
 
-    def __init__(self):
-        SeismicTable.__init__(self)
-        table = tools.read_table(
-            "input_seismic/iasp91.txt")  # depth, radius, v_p, v_s
-        table = np.array(table)
-        self.table_depth = table[:, 0]
-        self.table_radius = table[:, 1]
-        self.table_vp = table[:, 2]
-        self.table_vs = table[:, 3]
+    _model_name = 'IASP91'
 
 
 class AK135(SeismicTable):
@@ -468,18 +786,7 @@ class AK135(SeismicTable):
     See also :class:`burnman.seismic.SeismicTable`.
     """
 
-    def __init__(self):
-        SeismicTable.__init__(self)
-        table = tools.read_table(
-            "input_seismic/ak135.txt")  # radius, pressure, density, v_p, v_s
-        table = np.array(table)
-        self.table_depth = table[:, 0]
-        self.table_radius = table[:, 1]
-        self.table_density = table[:, 2]
-        self.table_vp = table[:, 3]
-        self.table_vs = table[:, 4]
-        self.table_QG = table[:, 5]
-        self.table_QK = table[:, 6]
+    _model_name = 'AK135'
 
 
 def attenuation_correction(v_p, v_s, v_phi, Qs, Qphi):
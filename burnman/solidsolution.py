@@ -15,6 +15,16 @@ from .averaging_schemes import reuss_average_function
 from . import constants
 
 
+class SolidSolutionMethod(object):
+
+    """Dummy class because SolidSolution needs a method to call
+    Mineral.set_state(), but should never have a method that
+    is used for minerals. Note that set_method() below will
+    not change self.method. It is defined at module level
+    so that solid solutions can be pickled."""
+    pass
+
+
 class SolidSolution(Mineral):
 
     """
@@ -55,14 +65,6 @@ class SolidSolution(Mineral):
         """
         Mineral.__init__(self)
 
-
-        class SolidSolutionMethod(object):
-
-            """Dummy class because SolidSolution needs a method to call
-            Mineral.set_state(), but should never have a method that
-            is used for minerals. Note that set_method() below will
-            not change self.method"""
-            pass
         self.method = SolidSolutionMethod()
 
         if name is not None:
@@ -181,11 +183,22 @@ class SolidSolution(Mineral):
         # note: do not set self.method here!
         self.reset()
 
-    def set_state(self, pressure, temperature):
+    @property
+    def vectorized(self):
+        """
+        True if all the endmembers of the solid solution can be
+        evaluated at arrays of pressures and temperatures.
+        """
+        return all(e[0].vectorized for e in self.endmembers)
+
+    def set_state(self, pressure, temperature, properties=None):
 
-        Mineral.set_state(self, pressure, temperature)
+        Mineral.set_state(self, pressure, temperature, properties)
         for i in range(self.n_endmembers):
-            self.endmembers[i][0].set_state(pressure, temperature)
+            if properties is None:
+                self.endmembers[i][0].set_state(pressure, temperature)
+            else:
+                self.endmembers[i][0].set_state(pressure, temperature, properties)
 
     @material_property
     def formula(self):
@@ -231,7 +244,17 @@ class SolidSolution(Mineral):
         Returns excess partial gibbs free energy [J]
         Property specific to solid solutions.
         """
-        return np.array([self.endmembers[i][0].gibbs for i in range(self.n_endmembers)]) + self.excess_partial_gibbs
+        return np.array([self.endmembers[i][0].gibbs for i in range(self.n_endmembers)]).T + self.excess_partial_gibbs
+
+    @material_property
+    def gibbs_hessian(self):
+        """
+        Returns the second derivatives of the gibbs free energy with respect
+        to the molar amounts of the endmembers, for one mole of solution [J]
+        (i.e. the derivatives of partial_gibbs).
+        Property specific to solid solutions.
+        """
+        return self.solution_model.excess_gibbs_hessian(self.pressure, self.temperature, self.molar_fractions)
 
     @material_property
     def excess_gibbs(self):
@@ -342,7 +365,11 @@ class SolidSolution(Mineral):
         Returns adiabatic bulk modulus of the solid solution [Pa]
         Aliased with self.K_S
         """
-        if self.temperature < 1e-10:
+        if np.ndim(self.temperature) > 0:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                K_S = self.isothermal_bulk_modulus * self.heat_capacity_p / self.heat_capacity_v
+            return np.where(self.temperature < 1e-10, self.isothermal_bulk_modulus, K_S)
+        elif self.temperature < 1e-10:
             return self.isothermal_bulk_modulus
         else:
             return self.isothermal_bulk_modulus * self.heat_capacity_p / self.heat_capacity_v
@@ -369,6 +396,13 @@ class SolidSolution(Mineral):
         Returns shear modulus of the solid solution [Pa]
         Aliased with self.G
         """
+        if np.ndim(self.pressure) > 0 or np.ndim(self.temperature) > 0:
+            shape = np.broadcast(self.pressure, self.temperature).shape
+            G_lists = np.array([np.broadcast_to(e[0].G, shape)
+                                for e in self.endmembers]).reshape(self.n_endmembers, -1)
+            return np.array([reuss_average_function(self.molar_fractions, G_list)
+                             for G_list in G_lists.T]).reshape(shape)
+
         G_list = np.fromiter(
             (e[0].G for e in self.endmembers), dtype=np.float, count=self.n_endmembers)
         return reuss_average_function(self.molar_fractions, G_list)
@@ -404,7 +438,11 @@ class SolidSolution(Mineral):
         Returns grueneisen parameter of the solid solution [unitless]
         Aliased with self.gr
         """
-        if self.temperature < 1e-10:
+        if np.ndim(self.temperature) > 0:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                gr = self.thermal_expansivity * self.isothermal_bulk_modulus * self.molar_volume / self.heat_capacity_v
+            return np.where(self.temperature < 1e-10, float('nan'), gr)
+        elif self.temperature < 1e-10:
             return float('nan')
         else:
             return self.thermal_expansivity * self.isothermal_bulk_modulus * self.molar_volume / self.heat_capacity_v
@@ -93,14 +93,20 @@ class SolutionModel(object):
             Temperature at which to evaluate the solution. [K]
 
         molar_fractions : list of floats
-            List of molar fractions of the different endmembers in solution
+            List of molar fractions of the different endmembers in solution.
+            Can also be an array of compositions, with the
+            endmembers along the last axis.
 
         Returns
         -------
         G_excess : float
             The excess Gibbs free energy
         """
-        return np.dot(np.array(molar_fractions), self.excess_partial_gibbs_free_energies(pressure, temperature, molar_fractions))
+        partial_G_excess = self.excess_partial_gibbs_free_energies(pressure, temperature,
+                                                                    molar_fractions)
+        if np.ndim(molar_fractions) > 1:
+            return np.sum(partial_G_excess * molar_fractions, axis=-1)
+        return np.dot(partial_G_excess, np.array(molar_fractions))
 
     def excess_partial_gibbs_free_energies(self, pressure, temperature, molar_fractions):
         """
@@ -111,22 +117,64 @@ class SolutionModel(object):
 
         Parameters
         ----------
-        pressure : float
+        pressure : float or array of floats
             Pressure at which to evaluate the solution model. [Pa]
 
-        temperature : float
+        temperature : float or array of floats
             Temperature at which to evaluate the solution. [K]
 
         molar_fractions : list of floats
-            List of molar fractions of the different endmembers in solution
+            List of molar fractions of the different endmembers in solution.
+            Can also be an array of compositions, with the
+            endmembers along the last axis.
 
         Returns
         -------
         partial_G_excess : numpy array
-            The excess Gibbs free energy of each endmember
+            The excess Gibbs free energy of each endmember. If pressure,
+            temperature or molar_fractions are arrays, the last axis of
+            the returned array corresponds to the endmembers.
+            These are also the first derivatives of the excess Gibbs
+            free energy with respect to the molar amounts of the endmembers.
         """
         return np.empty_like(np.array(molar_fractions))
 
+    def excess_gibbs_hessian(self, pressure, temperature, molar_fractions):
+        """
+        Given a list of molar fractions of different phases,
+        compute the second derivatives of the excess Gibbs free energy
+        with respect to the molar amounts of the endmembers, for one mole of
+        solution. These are the derivatives of the excess partial
+        Gibbs free energies with respect to the molar amounts.
+        The base class implementation assumes that the excess gibbs
+        free energy is zero.
+
+        Parameters
+        ----------
+        pressure : float or array of floats
+            Pressure at which to evaluate the solution model. [Pa]
+
+        temperature : float or array of floats
+            Temperature at which to evaluate the solution. [K]
+
+        molar_fractions : list of floats
+            List of molar fractions of the different endmembers in solution.
+            Can also be an array of compositions, with the
+            endmembers along the last axis.
+
+        Returns
+        -------
+        hessian : numpy array
+            The second derivatives of the excess Gibbs free energy [J/mol].
+            The last two axes of the returned array correspond to the
+            endmembers, the other axes to the pressures, temperatures
+            and compositions.
+        """
+        molar_fractions = np.asarray(molar_fractions)
+        shape = np.broadcast(np.asarray(pressure), np.asarray(temperature),
+                             molar_fractions[..., 0]).shape
+        return np.zeros(shape + (molar_fractions.shape[-1], molar_fractions.shape[-1]))
+
     def excess_volume(self, pressure, temperature, molar_fractions):
         """
         Given a list of molar fractions of different phases,
@@ -220,6 +268,9 @@ class MechanicalSolution (SolutionModel):
     def excess_partial_gibbs_free_energies(self, pressure, temperature, molar_fractions):
         return np.zeros_like(molar_fractions)
 
+    def excess_gibbs_hessian(self, pressure, temperature, molar_fractions):
+        return SolutionModel.excess_gibbs_hessian(self, pressure, temperature, molar_fractions)
+
     def activity_coefficients(self, pressure, temperature, molar_fractions):
         return np.ones_like(molar_fractions)
 
@@ -257,6 +308,9 @@ class IdealSolution (SolutionModel):
     def excess_partial_gibbs_free_energies(self, pressure, temperature, molar_fractions):
         return self._ideal_excess_partial_gibbs(temperature, molar_fractions)
 
+    def excess_gibbs_hessian(self, pressure, temperature, molar_fractions):
+        return self._ideal_excess_gibbs_hessian(temperature, molar_fractions)
+
     def _calculate_endmember_configurational_entropies(self):
         self.endmember_configurational_entropies = np.zeros(
             shape=(self.n_endmembers))
@@ -268,6 +322,11 @@ class IdealSolution (SolutionModel):
                         constants.gas_constant * self.site_multiplicities[
                             occ] * endmember_occupancy[occ] * np.log(endmember_occupancy[occ])
 
+        # the contributions of the logarithms of the site occupancies
+        # to the logarithms of the ideal activities
+        self._site_factors = np.where(self.endmember_occupancies > 1e-10,
+                                      self.endmember_occupancies * self.site_multiplicities, 0.)
+
     def _endmember_configurational_entropy_contribution(self, molar_fractions):
         return np.dot(molar_fractions, self.endmember_configurational_entropies)
 
@@ -283,25 +342,32 @@ class IdealSolution (SolutionModel):
         return conf_entropy
 
     def _ideal_excess_partial_gibbs(self, temperature, molar_fractions):
-        return constants.gas_constant * temperature * self._log_ideal_activities(molar_fractions)
+        return (np.asarray(constants.gas_constant * temperature)[..., np.newaxis] *
+                self._log_ideal_activities(molar_fractions))
 
     def _log_ideal_activities(self, molar_fractions):
         site_occupancies = np.dot(molar_fractions, self.endmember_occupancies)
-        lna = np.empty(shape=(self.n_endmembers))
+        lna = np.zeros(site_occupancies.shape[:-1] + (self.n_endmembers,))
 
-        for e in range(self.n_endmembers):
-            lna[e] = 0.0
-            for occ in range(self.n_occupancies):
-                if self.endmember_occupancies[e][occ] > 1e-10 and site_occupancies[occ] > 1e-10:
-                    lna[e] = lna[e] + self.endmember_occupancies[e][occ] * \
-                        self.site_multiplicities[
-                            occ] * np.log(site_occupancies[occ])
+        for occ in range(self.n_occupancies):
+            occupied = site_occupancies[..., occ] > 1e-10
+            log_occupancy = np.log(np.where(occupied, site_occupancies[..., occ], 1.))
+            lna = lna + np.where(occupied[..., np.newaxis],
+                                 self._site_factors[:, occ] * log_occupancy[..., np.newaxis], 0.)
 
-            normalisation_constant = self.endmember_configurational_entropies[
-                e] / constants.gas_constant
-            lna[e] = lna[e] + self.endmember_configurational_entropies[
-                e] / constants.gas_constant
-        return lna
+        return lna + self.endmember_configurational_entropies / constants.gas_constant
+
+    def _ideal_excess_gibbs_hessian(self, temperature, molar_fractions):
+        # d ln(site occupancy) / d n_j = occupancy of endmember j / site occupancy - 1
+        site_occupancies = np.dot(molar_fractions, self.endmember_occupancies)
+        occupied = site_occupancies > 1e-10
+        inverse_occupancies = np.where(occupied, 1. / np.where(occupied, site_occupancies, 1.), 0.)
+        factors = self._site_factors * occupied[..., np.newaxis, :]
+        d2lna = (np.einsum('...io,...jo->...ij', factors,
+                           self.endmember_occupancies * inverse_occupancies[..., np.newaxis, :]) -
+                 np.sum(factors, axis=-1)[..., np.newaxis])
+        return (np.asarray(constants.gas_constant * temperature)[..., np.newaxis, np.newaxis] *
+                d2lna)
 
 
     def _ideal_activities(self, molar_fractions):
@@ -372,8 +438,39 @@ class AsymmetricRegularSolution (IdealSolution):
         return _non_ideal_interactions_fct(phi, molar_fractions, self.n_endmembers, self.alpha, self.We, self.Ws, self.Wv)
 
     def _non_ideal_excess_partial_gibbs(self, pressure, temperature, molar_fractions):
+        if np.ndim(molar_fractions) > 1:
+            return self._non_ideal_excess_partial_gibbs_array(pressure, temperature,
+                                                              molar_fractions)
         Eint, Sint, Vint = self._non_ideal_interactions(molar_fractions)
-        return Eint - temperature * Sint + pressure * Vint
+        return Eint - np.multiply.outer(temperature, Sint) + np.multiply.outer(pressure, Vint)
+
+    def _non_ideal_terms(self, pressure, temperature, molar_fractions):
+        """
+        Returns the symmetric interaction matrices C = W + W^T
+        (W = We - T Ws + P Wv), the volume fractions phi and the products C.phi
+        for arrays of compositions (with the endmembers along the last axis).
+        """
+        W = (self.We - np.asarray(temperature)[..., np.newaxis, np.newaxis] * self.Ws +
+             np.asarray(pressure)[..., np.newaxis, np.newaxis] * self.Wv)
+        C = W + np.swapaxes(W, -1, -2)
+        phi = self.alpha * molar_fractions
+        phi = phi / np.sum(phi, axis=-1)[..., np.newaxis]
+        return C, phi, np.matmul(C, phi[..., np.newaxis])[..., 0]
+
+    def _non_ideal_excess_partial_gibbs_array(self, pressure, temperature, molar_fractions):
+        # mu_l = alpha_l ((C.phi)_l - phi.C.phi / 2)
+        C, phi, Cphi = self._non_ideal_terms(pressure, temperature, molar_fractions)
+        return self.alpha * (Cphi - 0.5 * np.sum(phi * Cphi, axis=-1)[..., np.newaxis])
+
+    def _non_ideal_excess_gibbs_hessian(self, pressure, temperature, molar_fractions):
+        # d mu_l / d n_j = alpha_l alpha_j / (alpha.x)
+        #                  (C_lj - (C.phi)_l - (C.phi)_j + phi.C.phi)
+        molar_fractions = np.asarray(molar_fractions)
+        C, phi, Cphi = self._non_ideal_terms(pressure, temperature, molar_fractions)
+        phiCphi = np.sum(phi * Cphi, axis=-1)[..., np.newaxis, np.newaxis]
+        scaled_alpha = (np.outer(self.alpha, self.alpha) /
+                        np.dot(molar_fractions, self.alpha)[..., np.newaxis, np.newaxis])
+        return scaled_alpha * (C - Cphi[..., :, np.newaxis] - Cphi[..., np.newaxis, :] + phiCphi)
 
     def excess_partial_gibbs_free_energies(self, pressure, temperature, molar_fractions):
         ideal_gibbs = IdealSolution._ideal_excess_partial_gibbs(
@@ -382,6 +479,10 @@ class AsymmetricRegularSolution (IdealSolution):
             pressure, temperature, molar_fractions)
         return ideal_gibbs + non_ideal_gibbs
 
+    def excess_gibbs_hessian(self, pressure, temperature, molar_fractions):
+        return (IdealSolution._ideal_excess_gibbs_hessian(self, temperature, molar_fractions) +
+                self._non_ideal_excess_gibbs_hessian(pressure, temperature, molar_fractions))
+
     def excess_volume(self, pressure, temperature, molar_fractions):
         phi = self._phi(molar_fractions)
         V_excess = np.dot(self.alpha.T, molar_fractions) * np.dot(
@@ -404,8 +505,8 @@ class AsymmetricRegularSolution (IdealSolution):
         return E_excess + pressure * self.excess_volume(pressure, temperature, molar_fractions)
 
     def activity_coefficients(self, pressure, temperature, molar_fractions):
-        if temperature > 1.e-10:
-            return np.exp(self._non_ideal_excess_partial_gibbs(pressure, temperature, molar_fractions) / (constants.gas_constant * temperature))
+        if np.all(np.asarray(temperature) > 1.e-10):
+            return np.exp(self._non_ideal_excess_partial_gibbs(pressure, temperature, molar_fractions) / (constants.gas_constant * np.asarray(temperature)[..., np.newaxis]))
         else:
             raise Exception("Activity coefficients not defined at 0 K.")
 
@@ -486,8 +587,48 @@ class SubregularSolution (IdealSolution):
         return Eint, Sint, Vint
 
     def _non_ideal_excess_partial_gibbs(self, pressure, temperature, molar_fractions):
+        if np.ndim(molar_fractions) > 1:
+            S, dS, d2S, n = self._non_ideal_sums(pressure, temperature, molar_fractions, False)
+            return 0.5 * dS / (n * n) - S / (n * n * n)
         Eint, Sint, Vint = self._non_ideal_interactions(molar_fractions)
-        return Eint - temperature * Sint + pressure * Vint
+        return Eint - np.multiply.outer(temperature, Sint) + np.multiply.outer(pressure, Vint)
+
+    def _non_ideal_sums(self, pressure, temperature, molar_fractions, hessian=True):
+        """
+        The non-ideal Gibbs free energy of an amount n of solution is
+        G = S / (2 n^2), where S = sum_ij W_ij n_i n_j (n - n_i + n_j) and
+        W = We - T Ws + P Wv. Returns S, its first derivatives and
+        (if hessian is True) its second derivatives with respect to the
+        amounts of the endmembers, and the total amounts, for arrays
+        of compositions (with the endmembers along the last axis).
+        """
+        x = np.asarray(molar_fractions)
+        W = (self.We - np.asarray(temperature)[..., np.newaxis, np.newaxis] * self.Ws +
+             np.asarray(pressure)[..., np.newaxis, np.newaxis] * self.Wv)
+        n = np.sum(x, axis=-1)[..., np.newaxis]
+        a = np.matmul(W, x[..., np.newaxis])[..., 0]
+        b = np.matmul(x[..., np.newaxis, :], W)[..., 0, :]
+        x2 = x * x
+        Q = np.sum(x * a, axis=-1)[..., np.newaxis]
+        S = n * Q - np.sum(x2 * (a - b), axis=-1)[..., np.newaxis]
+        dS = (Q + n * (a + b) - 2. * x * (a - b) -
+              np.matmul(x2[..., np.newaxis, :], W)[..., 0, :] +
+              np.matmul(W, x2[..., np.newaxis])[..., 0])
+        if not hessian:
+            return S, dS, None, n
+        WT = np.swapaxes(W, -1, -2)
+        d2S = ((a + b)[..., np.newaxis, :] + (a + b)[..., :, np.newaxis] +
+               n[..., np.newaxis] * (W + WT) +
+               2. * (W - WT) * (x[..., np.newaxis, :] - x[..., :, np.newaxis]))
+        d2S = d2S + 2. * np.einsum('...i,ij->...ij', b - a, np.eye(self.n_endmembers))
+        return S, dS, d2S, n
+
+    def _non_ideal_excess_gibbs_hessian(self, pressure, temperature, molar_fractions):
+        S, dS, d2S, n = self._non_ideal_sums(pressure, temperature, molar_fractions)
+        n2 = (n * n)[..., np.newaxis]
+        n3 = n2 * n[..., np.newaxis]
+        return (0.5 * d2S / n2 - (dS[..., :, np.newaxis] + dS[..., np.newaxis, :]) / n3 +
+                3. * S[..., np.newaxis] / (n3 * n[..., np.newaxis]))
 
     def excess_partial_gibbs_free_energies(self, pressure, temperature, molar_fractions):
         ideal_gibbs = IdealSolution._ideal_excess_partial_gibbs(
@@ -496,6 +637,10 @@ class SubregularSolution (IdealSolution):
             pressure, temperature, molar_fractions)
         return ideal_gibbs + non_ideal_gibbs
 
+    def excess_gibbs_hessian(self, pressure, temperature, molar_fractions):
+        return (IdealSolution._ideal_excess_gibbs_hessian(self, temperature, molar_fractions) +
+                self._non_ideal_excess_gibbs_hessian(pressure, temperature, molar_fractions))
+
     def excess_volume(self, pressure, temperature, molar_fractions):
         V_excess = np.dot(
             molar_fractions, self._non_ideal_function(self.Wv, molar_fractions))
@@ -515,8 +660,8 @@ class SubregularSolution (IdealSolution):
         return E_excess + pressure * self.excess_volume(pressure, temperature, molar_fractions)
 
     def activity_coefficients(self, pressure, temperature, molar_fractions):
-        if temperature > 1.e-10:
-            return np.exp(self._non_ideal_excess_partial_gibbs(pressure, temperature, molar_fractions) / (constants.gas_constant * temperature))
+        if np.all(np.asarray(temperature) > 1.e-10):
+            return np.exp(self._non_ideal_excess_partial_gibbs(pressure, temperature, molar_fractions) / (constants.gas_constant * np.asarray(temperature)[..., np.newaxis]))
         else:
             raise Exception("Activity coefficients not defined at 0 K.")
 
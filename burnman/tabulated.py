@@ -0,0 +1,306 @@
+# This file is part of BurnMan - a thermoelastic and thermodynamic toolkit for the Earth and Planetary Sciences
+# Copyright (C) 2012 - 2017 by the BurnMan team, released under the GNU
+# GPL v2 or later.
+
+from __future__ import absolute_import
+
+import numpy as np
+from scipy.interpolate import RectBivariateSpline
+
+from .material import Material, material_property
+from .tools import copy_documentation
+
+
+def _bicubic_splines(pressures, temperatures, table):
+    """
+    Returns a list of bicubic splines interpolating each of the
+    arrays table[i] (of shape (len(pressures), len(temperatures))).
+    The tables have at least four nodes along each axis, but the
+    coarse grids used for the error estimates can have three,
+    in which case quadratic splines are used along that axis.
+    """
+    kx = min(3, len(pressures) - 1)
+    ky = min(3, len(temperatures) - 1)
+    return [RectBivariateSpline(pressures, temperatures, values, kx=kx, ky=ky)
+            for values in table]
+
+
+def _coarse_indices(n):
+    """
+    Indices of every other node of a grid axis with n nodes,
+    always including the last node.
+    """
+    return np.unique(np.append(np.arange(0, n, 2), n - 1))
+
+
+class TabulatedMaterial(Material):
+    """
+    A material whose properties are interpolated from a table, which is
+    calculated once from any other :class:`burnman.Material`
+    (for example a :class:`burnman.Mineral`, a
+    :class:`burnman.SolidSolution` at fixed composition or a
+    :class:`burnman.Composite` at fixed molar fractions) on a
+    grid of pressures and temperatures.
+
+    The Gibbs energy, entropy, volume, bulk and shear moduli, heat capacities,
+    thermal expansivity and grueneisen parameter are tabulated
+    and interpolated with bicubic splines. All the other properties
+    are calculated from these. Interpolation is vectorized, so that
+    the material can be set to arrays of pressures and temperatures
+    (see :func:`burnman.Material.set_state`).
+    Estimates of the interpolation errors are provided by
+    :func:`interpolation_errors`.
+
+    This class is available as ``burnman.TabulatedMaterial``.
+
+    Parameters
+    ----------
+    material : :class:`burnman.Material`
+        The material to tabulate. Its state is not changed.
+    pressures : array of floats
+        Strictly increasing pressures of the grid [Pa].
+        At least four values are required.
+    temperatures : array of floats
+        Strictly increasing temperatures of the grid [K].
+        At least four values are required.
+    properties : list of strings (optional)
+        The properties to tabulate, which must be in tabulated_properties,
+        or 'density' (for materials whose molar mass changes with
+        the state, such as :class:`burnman.HelperSpinTransition`).
+        Defaults to all of tabulated_properties. Only these properties,
+        and the properties calculated from them alone (e.g. the density
+        from the molar_volume), are available.
+    """
+
+    tabulated_properties = ['molar_gibbs', 'molar_entropy', 'molar_volume',
+                            'isothermal_bulk_modulus', 'adiabatic_bulk_modulus',
+                            'shear_modulus', 'heat_capacity_p', 'heat_capacity_v',
+                            'thermal_expansivity', 'grueneisen_parameter']
+
+    def __init__(self, material, pressures, temperatures, properties=None):
+        if properties is not None:
+            for name in properties:
+                if name not in self.tabulated_properties + ['density']:
+                    raise ValueError(name + ' is not one of the tabulated properties')
+            self.tabulated_properties = list(properties)
+
+        pressures = np.array(pressures, dtype=float)
+        temperatures = np.array(temperatures, dtype=float)
+        for name, x in [('pressures', pressures), ('temperatures', temperatures)]:
+            if x.ndim != 1 or len(x) < 4 or np.any(np.diff(x) <= 0.):
+                raise ValueError(name + ' must be a strictly increasing '
+                                 'array with at least four values')
+
+        self.params = {'name': 'tabulated ' + material.name}
+        self.pressures = pressures
+        self.temperatures = temperatures
+        self.bounds = [[pressures[0], pressures[-1]],
+                       [temperatures[0], temperatures[-1]]]
+
+        P, T = np.meshgrid(pressures, temperatures, indexing='ij')
+        table = material.evaluate(self.tabulated_properties + ['molar_mass'], P, T)
+        self.params['molar_mass'] = table[-1][0, 0]
+
+        # table[i, j, k] is the ith property at the jth pressure and kth temperature
+        self.table = table[:-1]
+        self._splines = _bicubic_splines(pressures, temperatures, self.table)
+
+        # splines on a grid with twice the spacing, for error estimates
+        i = _coarse_indices(len(pressures))
+        j = _coarse_indices(len(temperatures))
+        self._coarse_splines = _bicubic_splines(pressures[i], temperatures[j],
+                                                self.table[:, i][:, :, j])
+        Material.__init__(self)
+        self.name = self.params['name']
+
+    @property
+    def vectorized(self):
+        return True
+
+    def _interpolate(self, pressures, temperatures, splines=None):
+        """
+        Returns an array containing all the tabulated properties
+        (in the order of tabulated_properties) interpolated at the given
+        arrays of pressures and temperatures.
+        """
+        if splines is None:
+            splines = self._splines
+        return np.array([spline.ev(pressures, temperatures) for spline in splines])
+
+    def _check_bounds(self, pressure, temperature):
+        if not np.logical_and(np.all(self.bounds[0][0] <= pressure),
+                              np.all(pressure <= self.bounds[0][1])):
+            raise ValueError("The set_state pressure is outside the bounds of this table "
+                             "({0:.4f}-{1:.4f} GPa)".format(self.bounds[0][0] / 1.e9,
+                                                            self.bounds[0][1] / 1.e9))
+        if not np.logical_and(np.all(self.bounds[1][0] <= temperature),
+                              np.all(temperature <= self.bounds[1][1])):
+            raise ValueError("The set_state temperature is outside the bounds of this table "
+                             "({0:.1f}-{1:.1f} K)".format(self.bounds[1][0],
+                                                          self.bounds[1][1]))
+
+    @copy_documentation(Material.set_state)
+    def set_state(self, pressure, temperature, properties=None):
+        self._check_bounds(pressure, temperature)
+        Material.set_state(self, pressure, temperature)
+
+    def interpolation_errors(self, vars_list, pressures, temperatures):
+        """
+        Returns estimates of the errors of the interpolated properties.
+        These are calculated from the difference between the interpolants on
+        the full grid and on a grid with twice the spacing. As the error of
+        bicubic splines scales with the fourth power of the grid spacing,
+        this difference is divided by 15.
+
+        Parameters
+        ----------
+        vars_list : list of strings
+            Properties for which the errors are estimated. These must be
+            in tabulated_properties.
+        pressures : ndlist or ndarray of float
+            n-dimensional array of pressures in [Pa].
+        temperatures : ndlist or ndarray of float
+            n-dimensional array of temperatures in [K].
+
+        Returns
+        -------
+        errors : array of floats
+            Absolute error estimates, in the same layout as the output
+            of :func:`burnman.Material.evaluate`.
+        """
+        for name in vars_list:
+            if name not in self.tabulated_properties:
+                raise ValueError('Error estimates are only available for the '
+                                 'tabulated properties, not ' + name)
+        pressures = np.array(pressures, dtype=float)
+        temperatures = np.array(temperatures, dtype=float)
+        assert(pressures.shape == temperatures.shape)
+        self._check_bounds(pressures, temperatures)
+
+        P = pressures.flatten()
+        T = temperatures.flatten()
+        errors = np.abs(self._interpolate(P, T) -
+                        self._interpolate(P, T, self._coarse_splines)) / 15.
+        indices = [self.tabulated_properties.index(name) for name in vars_list]
+        return errors[indices].reshape((len(vars_list),) + pressures.shape)
+
+    def _interpolated(self, name):
+        """
+        Returns the tabulated property with the given name,
+        interpolated at the current state.
+        """
+        if name not in self.tabulated_properties:
+            raise NotImplementedError(name + ' has not been tabulated')
+        spline = self._splines[self.tabulated_properties.index(name)]
+        return spline.ev(self.pressure, self.temperature)[()]
+
+    """
+    Tabulated properties
+    """
+
+    @material_property
+    @copy_documentation(Material.molar_gibbs)
+    def molar_gibbs(self):
+        return self._interpolated('molar_gibbs')
+
+    @material_property
+    @copy_documentation(Material.molar_entropy)
+    def molar_entropy(self):
+        return self._interpolated('molar_entropy')
+
+    @material_property
+    @copy_documentation(Material.molar_volume)
+    def molar_volume(self):
+        return self._interpolated('molar_volume')
+
+    @material_property
+    @copy_documentation(Material.isothermal_bulk_modulus)
+    def isothermal_bulk_modulus(self):
+        return self._interpolated('isothermal_bulk_modulus')
+
+    @material_property
+    @copy_documentation(Material.adiabatic_bulk_modulus)
+    def adiabatic_bulk_modulus(self):
+        return self._interpolated('adiabatic_bulk_modulus')
+
+    @material_property
+    @copy_documentation(Material.shear_modulus)
+    def shear_modulus(self):
+        return self._interpolated('shear_modulus')
+
+    @material_property
+    @copy_documentation(Material.heat_capacity_p)
+    def heat_capacity_p(self):
+        return self._interpolated('heat_capacity_p')
+
+    @material_property
+    @copy_documentation(Material.heat_capacity_v)
+    def heat_capacity_v(self):
+        return self._interpolated('heat_capacity_v')
+
+    @material_property
+    @copy_documentation(Material.thermal_expansivity)
+    def thermal_expansivity(self):
+        return self._interpolated('thermal_expansivity')
+
+    @material_property
+    @copy_documentation(Material.grueneisen_parameter)
+    def grueneisen_parameter(self):
+        return self._interpolated('grueneisen_parameter')
+
+    """
+    Properties from the tabulated properties
+    """
+
+    @material_property
+    @copy_documentation(Material.molar_mass)
+    def molar_mass(self):
+        return self.params['molar_mass']
+
+    @material_property
+    @copy_documentation(Material.density)
+    def density(self):
+        if 'density' in self.tabulated_properties:
+            return self._interpolated('density')
+        return self.molar_mass / self.molar_volume
+
+    @material_property
+    @copy_documentation(Material.internal_energy)
+    def internal_energy(self):
+        return self.molar_gibbs - self.pressure * self.molar_volume + self.temperature * self.molar_entropy
+
+    @material_property
+    @copy_documentation(Material.molar_helmholtz)
+    def molar_helmholtz(self):
+        return self.molar_gibbs - self.pressure * self.molar_volume
+
+    @material_property
+    @copy_documentation(Material.molar_enthalpy)
+    def molar_enthalpy(self):
+        return self.molar_gibbs + self.temperature * self.molar_entropy
+
+    @material_property
+    @copy_documentation(Material.isothermal_compressibility)
+    def isothermal_compressibility(self):
+        return 1. / self.isothermal_bulk_modulus
+
+    @material_property
+    @copy_documentation(Material.adiabatic_compressibility)
+    def adiabatic_compressibility(self):
+        return 1. / self.adiabatic_bulk_modulus
+
+    @material_property
+    @copy_documentation(Material.p_wave_velocity)
+    def p_wave_velocity(self):
+        return np.sqrt((self.adiabatic_bulk_modulus + 4. / 3. *
+                        self.shear_modulus) / self.density)
+
+    @material_property
+    @copy_documentation(Material.bulk_sound_velocity)
+    def bulk_sound_velocity(self):
+        return np.sqrt(self.adiabatic_bulk_modulus / self.density)
+
+    @material_property
+    @copy_documentation(Material.shear_wave_velocity)
+    def shear_wave_velocity(self):
+        return np.sqrt(self.shear_modulus / self.density)
@@ -139,8 +139,15 @@ def linear_interpol(x, x1, x2, y1, y2):
     return (1. - alpha) * y1 + alpha * y2
 
 
-def read_table(filename):
-    datastream = pkgutil.get_data('burnman', 'data/' + filename)
+def read_table(filename, datastream=None):
+    """
+    Reads a table of floats from a data file of BurnMan
+    (in burnman/data), skipping the lines which start with #.
+    The contents of the file can be passed as datastream
+    if they have already been read.
+    """
+    if datastream is None:
+        datastream = pkgutil.get_data('burnman', 'data/' + filename)
     datalines = [line.strip()
                  for line in datastream.decode('ascii').split('\n') if line.strip()]
     table = []
@@ -214,12 +221,107 @@ def molar_volume_from_unit_cell_volume(unit_cell_v, z):
     return V
 
 
-def equilibrium_pressure(minerals, stoichiometry, temperature, pressure_initial_guess=1.e5):
+def _reaction_properties(minerals, stoichiometry, pressures, temperatures):
+    """
+    Returns the changes of the Gibbs energy, entropy and volume
+    of reactions (the rows of stoichiometry) at arrays of pressures
+    and temperatures (one state for each reaction).
+    Vectorized minerals are evaluated at all the states at once.
+    """
+    delta_G = np.zeros(len(pressures))
+    delta_S = np.zeros(len(pressures))
+    delta_V = np.zeros(len(pressures))
+    for i, mineral in enumerate(minerals):
+        if mineral.vectorized:
+            mineral.set_state(pressures, temperatures, 'thermodynamic')
+            G, S, V = mineral.gibbs, mineral.S, mineral.V
+        else:
+            values = []
+            for P, T in zip(pressures, temperatures):
+                mineral.set_state(P, T, 'thermodynamic')
+                values.append([mineral.gibbs, mineral.S, mineral.V])
+            G, S, V = np.array(values).T
+        delta_G += stoichiometry[:, i] * G
+        delta_S += stoichiometry[:, i] * S
+        delta_V += stoichiometry[:, i] * V
+    return delta_G, delta_S, delta_V
+
+
+def _equilibrium_states(minerals, stoichiometry, conditions, initial_guess,
+                        variable, rtol, max_iterations):
+    """
+    Finds the equilibrium pressures (if variable is 'pressure') or
+    temperatures (if variable is 'temperature') of reactions at each of
+    the given temperatures (or pressures) in turn. The equilibrium is found
+    with Newton's method, using dG/dP = V and dG/dT = -S. Each solution
+    is the starting guess for the next condition, corrected
+    with the Clapeyron slope dP/dT = dS/dV.
+
+    Returns an array with shape (number of reactions, number of conditions).
+    """
+    stoichiometry = np.array(stoichiometry, dtype=float)
+    conditions = np.asarray(conditions, dtype=float)
+    n_reactions = len(stoichiometry)
+    equilibria = np.empty((len(conditions), n_reactions))
+
+    x = np.full(n_reactions, initial_guess, dtype=float)
+    for i, condition in enumerate(conditions):
+        if i > 0:
+            # Clapeyron predictor from the previous solution
+            if variable == 'pressure':
+                slope = delta_S / delta_V
+            else:
+                slope = delta_V / delta_S
+            x_guess = equilibria[i - 1] + slope * (condition - conditions[i - 1])
+            x = np.where(np.isfinite(x_guess), x_guess, equilibria[i - 1])
+            if variable == 'temperature':
+                x = np.where(x > 0., x, equilibria[i - 1])
+
+        fixed = np.full(n_reactions, condition)
+        for n in range(max_iterations):
+            if variable == 'pressure':
+                delta_G, delta_S, delta_V = _reaction_properties(minerals, stoichiometry,
+                                                                 x, fixed)
+                delta_x = -delta_G / delta_V
+                # pressures are compared on a scale of at least 1 bar
+                scale = np.maximum(np.abs(x), 1.e5)
+                x = x + delta_x
+            else:
+                delta_G, delta_S, delta_V = _reaction_properties(minerals, stoichiometry,
+                                                                 fixed, x)
+                delta_x = delta_G / delta_S
+                # temperatures must stay positive
+                x = np.where(x + delta_x > 0., x + delta_x, 0.5 * x)
+                scale = x
+            if np.all(np.abs(delta_x) <= rtol * scale):
+                break
+        else:
+            raise Exception('The equilibrium {0} did not converge at {1:.4e} {2}'.format(
+                variable, condition, 'K' if variable == 'pressure' else 'Pa'))
+        equilibria[i] = x
+
+    return equilibria.T
+
+
+def equilibrium_pressure(minerals, stoichiometry, temperature, pressure_initial_guess=1.e5,
+                         rtol=1.e-12, max_iterations=50):
     """
     Given a list of minerals, their reaction stoichiometries
     and a temperature of interest, compute the
     equilibrium pressure of the reaction.
 
+    The pressure is found with Newton's method, using the volume change
+    of the reaction as the derivative of its Gibbs energy change.
+    If an array of temperatures is given, the equilibrium pressures are
+    found at each temperature in turn, each starting from the
+    pressure extrapolated from the previous temperature with the
+    Clapeyron slope :math:`dP/dT = \\Delta S / \\Delta V`.
+    Several reactions between the same minerals can be solved
+    together by giving a two dimensional stoichiometry (one row for
+    each reaction); vectorized minerals are then evaluated
+    for all the reactions at once. To trace a whole phase boundary
+    which may turn back on itself, see :func:`phase_boundary`.
+
     Parameters
     ----------
     minerals : list of minerals
@@ -228,36 +330,52 @@ def equilibrium_pressure(minerals, stoichiometry, temperature, pressure_initial_
     stoichiometry : list of floats
         Reaction stoichiometry for the minerals provided.
         Reactants and products should have the opposite signs [mol]
+        A list of stoichiometries describes several reactions.
 
-    temperature : float
+    temperature : float or array of floats
         Temperature of interest [K]
 
     pressure_initial_guess : optional float
         Initial pressure guess [Pa]
 
+    rtol : optional float
+        Relative size of the last pressure update below which
+        the pressure is considered converged.
+
+    max_iterations : optional int
+        Maximum number of Newton iterations at each temperature.
+
     Returns
     -------
-    pressure : float
-        The equilibrium pressure of the reaction [Pa]
+    pressure : float or array of floats
+        The equilibrium pressure of the reaction [Pa]. For several
+        reactions, pressure[i] corresponds to the ith reaction.
     """
-    def eqm(P, T):
-        gibbs = 0.
-        for i, mineral in enumerate(minerals):
-            mineral.set_state(P[0], T)
-            gibbs = gibbs + mineral.gibbs * stoichiometry[i]
-        return gibbs
-
-    pressure = fsolve(eqm, [pressure_initial_guess], args=(temperature))[0]
+    stoichiometry = np.asarray(stoichiometry, dtype=float)
+    temperature = np.asarray(temperature, dtype=float)
+    pressures = _equilibrium_states(minerals, np.atleast_2d(stoichiometry),
+                                    temperature.flatten(), pressure_initial_guess,
+                                    'pressure', rtol, max_iterations)
+    return pressures.reshape(stoichiometry.shape[:-1] + temperature.shape)[()]
 
-    return pressure
 
-
-def equilibrium_temperature(minerals, stoichiometry, pressure, temperature_initial_guess=1000.):
+def equilibrium_temperature(minerals, stoichiometry, pressure, temperature_initial_guess=1000.,
+                            rtol=1.e-12, max_iterations=50):
     """
     Given a list of minerals, their reaction stoichiometries
     and a pressure of interest, compute the
     equilibrium temperature of the reaction.
 
+    The temperature is found with Newton's method, using the entropy change
+    of the reaction as the derivative of its Gibbs energy change.
+    If an array of pressures is given, the equilibrium temperatures are
+    found at each pressure in turn, each starting from the
+    temperature extrapolated from the previous pressure with the
+    Clapeyron slope :math:`dT/dP = \\Delta V / \\Delta S`.
+    Several reactions between the same minerals can be solved
+    together by giving a two dimensional stoichiometry
+    (see :func:`equilibrium_pressure`).
+
     Parameters
     ----------
     minerals : list of minerals
@@ -266,28 +384,188 @@ def equilibrium_temperature(minerals, stoichiometry, pressure, temperature_initi
     stoichiometry : list of floats
         Reaction stoichiometry for the minerals provided.
         Reactants and products should have the opposite signs [mol]
+        A list of stoichiometries describes several reactions.
 
-    pressure : float
+    pressure : float or array of floats
         Pressure of interest [Pa]
 
     temperature_initial_guess : optional float
         Initial temperature guess [K]
 
+    rtol : optional float
+        Relative size of the last temperature update below which
+        the temperature is considered converged.
+
+    max_iterations : optional int
+        Maximum number of Newton iterations at each pressure.
+
     Returns
     -------
-    temperature : float
-        The equilibrium temperature of the reaction [K]
+    temperature : float or array of floats
+        The equilibrium temperature of the reaction [K]. For several
+        reactions, temperature[i] corresponds to the ith reaction.
     """
-    def eqm(T, P):
-        gibbs = 0.
-        for i, mineral in enumerate(minerals):
-            mineral.set_state(P, T[0])
-            gibbs = gibbs + mineral.gibbs * stoichiometry[i]
-        return gibbs
+    stoichiometry = np.asarray(stoichiometry, dtype=float)
+    pressure = np.asarray(pressure, dtype=float)
+    temperatures = _equilibrium_states(minerals, np.atleast_2d(stoichiometry),
+                                       pressure.flatten(), temperature_initial_guess,
+                                       'temperature', rtol, max_iterations)
+    return temperatures.reshape(stoichiometry.shape[:-1] + pressure.shape)[()]
 
-    temperature = fsolve(eqm, [temperature_initial_guess], args=(pressure))[0]
 
-    return temperature
+def phase_boundary(minerals, stoichiometry, temperature_range=None, pressure_range=None,
+                   initial_guess=None, step=0.02, max_points=10000,
+                   rtol=1.e-12, max_iterations=50):
+    """
+    Traces the phase boundary of a reaction across a range of
+    temperatures (or pressures), by arc-length continuation.
+
+    The boundary starts at the equilibrium pressure (or temperature)
+    at the lower end of the range. Each following point is predicted
+    along the tangent to the boundary, which is given by the Clapeyron
+    equation :math:`\\Delta V dP = \\Delta S dT`, and corrected back onto
+    the boundary with Newton steps perpendicular to it. The steps are
+    taken in scaled coordinates, where the range has length one and
+    pressures are scaled with the Clapeyron slope at the start,
+    so that boundaries which are steep, flat or which turn back
+    on themselves are traced in the same way. The steps are halved
+    where the corrector fails. Tracing stops when the boundary leaves
+    the range (the last point lies on the end of the range which was
+    crossed) or after max_points points.
+
+    Parameters
+    ----------
+    minerals : list of minerals
+        List of minerals involved in the reaction.
+
+    stoichiometry : list of floats
+        Reaction stoichiometry for the minerals provided.
+        Reactants and products should have the opposite signs [mol]
+
+    temperature_range : optional list of two floats
+        Minimum and maximum temperatures [K]. Either this or
+        pressure_range must be given.
+
+    pressure_range : optional list of two floats
+        Minimum and maximum pressures [Pa].
+
+    initial_guess : optional float
+        Initial guess for the equilibrium pressure [Pa] (or temperature [K])
+        at the start of the range. Defaults to 1.e5 Pa (or 1000 K).
+
+    step : optional float
+        Arc length between the points, as a fraction of the range.
+
+    max_points : optional int
+        Maximum number of points on the boundary.
+
+    rtol : optional float
+        Relative tolerance of the Newton solver.
+
+    max_iterations : optional int
+        Maximum number of Newton iterations for each point.
+
+    Returns
+    -------
+    pressures : numpy array of floats
+        Pressures along the boundary [Pa]
+
+    temperatures : numpy array of floats
+        Temperatures along the boundary [K]
+    """
+    if (temperature_range is None) == (pressure_range is None):
+        raise ValueError('Exactly one of temperature_range and pressure_range must be given')
+
+    stoichiometry = np.array([stoichiometry], dtype=float)
+    if temperature_range is not None:
+        # the boundary is traced in (T, P)
+        x_range = np.asarray(temperature_range, dtype=float)
+        variable = 'pressure'
+        if initial_guess is None:
+            initial_guess = 1.e5
+    else:
+        # the boundary is traced in (P, T)
+        x_range = np.asarray(pressure_range, dtype=float)
+        variable = 'temperature'
+        if initial_guess is None:
+            initial_guess = 1000.
+
+    def properties(z):
+        # returns the Gibbs energy change and its gradient in (x, y)
+        if variable == 'pressure':
+            delta_G, delta_S, delta_V = _reaction_properties(minerals, stoichiometry,
+                                                             [z[1]], [z[0]])
+            return delta_G[0], np.array([-delta_S[0], delta_V[0]])
+        else:
+            delta_G, delta_S, delta_V = _reaction_properties(minerals, stoichiometry,
+                                                             [z[0]], [z[1]])
+            return delta_G[0], np.array([delta_V[0], -delta_S[0]])
+
+    def solve_at(x, y_guess):
+        return _equilibrium_states(minerals, stoichiometry, [x], y_guess,
+                                   variable, rtol, max_iterations)[0, 0]
+
+    z = np.array([x_range[0], solve_at(x_range[0], initial_guess)])
+    gradient = properties(z)[1]
+
+    # scale the boundary so that the range has length one,
+    # and the boundary at the start lies at 45 degrees
+    slope = np.abs(gradient[0] / gradient[1])
+    if not np.isfinite(slope) or slope == 0.:
+        slope = 1.e6 if variable == 'pressure' else 1.e-6
+    scales = (x_range[1] - x_range[0]) * np.array([1., slope])
+
+    points = [z]
+    tangent = None
+    h = step
+    while len(points) < max_points:
+        # the tangent is perpendicular to the scaled gradient
+        g = gradient * scales
+        new_tangent = np.array([g[1], -g[0]]) / np.sqrt(g.dot(g))
+        if tangent is None:
+            # start in the direction of increasing x
+            tangent = new_tangent * np.sign(new_tangent[0] if new_tangent[0] != 0. else 1.)
+        else:
+            tangent = new_tangent * np.sign(new_tangent.dot(tangent))
+
+        while True:
+            # predictor along the tangent, and corrector
+            # perpendicular to the boundary (in scaled coordinates)
+            s_predicted = z / scales + h * tangent
+            s = s_predicted
+            converged = False
+            for n in range(max_iterations):
+                delta_G, gradient = properties(s * scales)
+                g = gradient * scales
+                delta_s = -delta_G * g / g.dot(g)
+                s = s + delta_s
+                if np.sqrt(delta_s.dot(delta_s)) <= rtol * np.sqrt(s.dot(s)):
+                    converged = True
+                    break
+            # reject corrections which may have jumped to another branch
+            if converged and np.sqrt((s - s_predicted).dot(s - s_predicted)) < h:
+                break
+            h = 0.5 * h
+            if h < 1.e-6 * step:
+                raise Exception('The phase boundary could not be traced '
+                                'beyond {0}'.format(z))
+
+        z = s * scales
+        h = min(2. * h, step)
+        if z[0] > x_range[1] or z[0] < x_range[0]:
+            # finish on the end of the range which has been crossed
+            x_end = x_range[1] if z[0] > x_range[1] else x_range[0]
+            y_guess = points[-1][1] + (z[1] - points[-1][1]) \
+                * (x_end - points[-1][0]) / (z[0] - points[-1][0])
+            points.append(np.array([x_end, solve_at(x_end, y_guess)]))
+            break
+        points.append(z)
+
+    points = np.array(points)
+    if variable == 'pressure':
+        return points[:, 1], points[:, 0]
+    else:
+        return points[:, 0], points[:, 1]
 
 
 def invariant_point(minerals_r1, stoichiometry_r1,
@@ -334,23 +612,38 @@ def invariant_point(minerals_r1, stoichiometry_r1,
     return pressure, temperature
 
 
-def hugoniot(mineral, P_ref, T_ref, pressures, reference_mineral=None):
+def hugoniot(mineral, P_ref, T_ref, pressures, reference_mineral=None,
+             porosity=0., rtol=1.e-10, max_iterations=50):
     """
     Calculates the temperatures (and volumes) along a Hugoniot
     as a function of pressure according to the Hugoniot equation
     U2-U1 = 0.5*(p2 - p1)(V1 - V2) where U and V are the
     internal energies and volumes (mass or molar) and U = F + TS
 
+    The Hugoniot is followed by continuation: the temperature at each
+    pressure is found with Newton's method, starting from the temperature
+    extrapolated from the previous two pressures. The derivative of the
+    Hugoniot equation with respect to temperature at constant pressure
+    is calculated analytically from :math:`dU/dT = C_p - P \\alpha V` and
+    :math:`dV/dT = \\alpha V`, so that only a few evaluations of the
+    mineral are required at each pressure.
+
+    If arrays of reference states (P_ref, T_ref and porosity, which are
+    broadcast against each other) are given, one Hugoniot is calculated
+    for each of them. If the minerals are
+    :func:`~burnman.Material.vectorized`, all the Hugoniots are
+    calculated together, evaluating the minerals at all the
+    reference states at once.
 
     Parameters
     ----------
     mineral : mineral
         Mineral for which the Hugoniot is to be calculated.
 
-    P_ref : float
+    P_ref : float or array of floats
         Reference pressure [Pa]
 
-    T_ref : float
+    T_ref : float or array of floats
         Reference temperature [K]
 
     pressures : numpy array of floats
@@ -363,38 +656,82 @@ def hugoniot(mineral, P_ref, T_ref, pressures, reference_mineral=None):
         mineral transforms to the mineral of interest at some
         (unspecified) pressure.
 
+    porosity : float or array of floats (optional)
+        Porosity of the sample at the reference state.
+        The reference volume is that of the mineral divided by
+        (1 - porosity), while the reference internal energy is
+        that of the mineral.
+
+    rtol : float (optional)
+        Relative size of the last temperature update below which
+        the temperature at a pressure is considered converged.
+
+    max_iterations : int (optional)
+        Maximum number of Newton iterations at each pressure.
+
     Returns
     -------
     temperatures : numpy array of floats
-        The Hugoniot temperatures at pressure
+        The Hugoniot temperatures at pressure.
+        For arrays of reference states, temperatures[i] is the
+        Hugoniot of the ith reference state.
 
     volumes : numpy array of floats
         The Hugoniot volumes at pressure
     """
-
-    def Ediff(T, mineral, P, P_ref, U_ref, V_ref):
-        mineral.set_state(P, T[0])
-        U = mineral.helmholtz + T[0] * mineral.S
-        V = mineral.V
-
-        return (U - U_ref) - 0.5 * (P - P_ref) * (V_ref - V)
-
     if reference_mineral is None:
         reference_mineral = mineral
 
+    P_ref, T_ref, porosity = np.broadcast_arrays(np.asarray(P_ref, dtype=float),
+                                                 np.asarray(T_ref, dtype=float),
+                                                 np.asarray(porosity, dtype=float))
+    pressures = np.asarray(pressures, dtype=float)
+    shape = P_ref.shape
+    if len(shape) > 0 and not (mineral.vectorized and reference_mineral.vectorized):
+        hugoniots = [hugoniot(mineral, P, T, pressures, reference_mineral,
+                              phi, rtol, max_iterations)
+                     for P, T, phi in zip(P_ref.flat, T_ref.flat, porosity.flat)]
+        return tuple(np.array(values).reshape(shape + pressures.shape)
+                     for values in zip(*hugoniots))
+
+    P_ref = P_ref[()]
+    T_ref = T_ref[()]
     reference_mineral.set_state(P_ref, T_ref)
     U_ref = reference_mineral.helmholtz + T_ref * reference_mineral.S
-    V_ref = reference_mineral.V
+    V_ref = reference_mineral.V / (1. - porosity[()])
 
-    temperatures = np.empty_like(pressures)
-    volumes = np.empty_like(pressures)
+    # temperatures[i] contains the temperatures at pressures[i]
+    # for all the reference states
+    temperatures = np.empty(pressures.shape + shape)
+    volumes = np.empty(pressures.shape + shape)
 
+    T = T_ref
     for i, P in enumerate(pressures):
-        temperatures[i] = fsolve(
-            Ediff, [T_ref], args=(mineral, P, P_ref, U_ref, V_ref))[0]
-        volumes[i] = mineral.V
+        if i > 1 and pressures[i - 1] != pressures[i - 2]:
+            # starting guess extrapolated from the previous two pressures
+            T_guess = temperatures[i - 1] + (P - pressures[i - 1]) \
+                * (temperatures[i - 1] - temperatures[i - 2]) \
+                / (pressures[i - 1] - pressures[i - 2])
+            T = np.where(T_guess > 0., T_guess, temperatures[i - 1])[()]
+
+        P_state = np.full(shape, P)[()]
+        for n in range(max_iterations):
+            mineral.set_state(P_state, T)
+            V = mineral.V
+            Ediff = (mineral.helmholtz + T * mineral.S - U_ref) \
+                - 0.5 * (P - P_ref) * (V_ref - V)
+            dEdiffdT = mineral.C_p - 0.5 * (P + P_ref) * mineral.alpha * V
+            delta_T = -Ediff / dEdiffdT
+            # temperatures must stay positive
+            T = np.where(T + delta_T > 0., T + delta_T, 0.5 * T)[()]
+            if np.all(np.abs(delta_T) <= rtol * T):
+                break
+        else:
+            raise Exception('The Hugoniot did not converge at {0:.4e} Pa'.format(P))
+        temperatures[i] = T
+        volumes[i] = V
 
-    return temperatures, volumes
+    return np.moveaxis(temperatures, 0, -1), np.moveaxis(volumes, 0, -1)
 
 
 def convert_fractions(composite, phase_fractions, input_type, output_type):
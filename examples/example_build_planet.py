@@ -72,7 +72,8 @@ if __name__ == "__main__":
 
     This example allows the user to define layers of planets of known outer radius and self-
     consistently solve for the density, pressure and gravity profiles. The calculation will
-    iterate until the difference between central pressure calculations are less than 1e-5.
+    iterate until the largest change in the pressure profile between iterations, relative
+    to the central pressure, is less than the tolerance of the planet (1e-5 by default).
     The planet class in BurnMan (../burnman/planet.py) allows users to call multiple
     properties of the model planet after calculations, such as the mass of an individual layer,
     the total mass of the planet and the moment if inertia. See planets.py for information
@@ -45,9 +45,6 @@ if __name__ == "__main__":
     mg_perovskite = burnman.minerals.HP_2011_ds62.mpv()
 
     temperatures = np.linspace(1000., 2000., 21)
-    pressures_fo_wd = np.empty_like(temperatures)
-    pressures_wd_rw = np.empty_like(temperatures)
-    pressures_rw_perpv = np.empty_like(temperatures)
 
     # Here's one example where we find the equilibrium temperature:
     P = 14.e9
@@ -58,23 +55,17 @@ if __name__ == "__main__":
           "GPa is reached at", round_to_n(T, T, 4), "K")
     print('')
 
-    # Now let's make the whole diagram using equilibrium_pressure
-    for i, T in enumerate(temperatures):
-        P = burnman.tools.equilibrium_pressure([forsterite, mg_wadsleyite],
-                                               [1.0, -1.0],
-                                               T)
-        pressures_fo_wd[i] = P
-
-        P = burnman.tools.equilibrium_pressure([mg_wadsleyite, mg_ringwoodite],
-                                               [1.0, -1.0],
-                                               T)
-        pressures_wd_rw[i] = P
-
-        P = burnman.tools.equilibrium_pressure(
-            [mg_ringwoodite, periclase, mg_perovskite],
-            [1.0, -1.0, -1.0],
-            T)
-        pressures_rw_perpv[i] = P
+    # Now let's make the whole diagram using equilibrium_pressure.
+    # Each row of the stoichiometry is one of the three reactions
+    # between the five minerals, and the boundaries are traced
+    # through the array of temperatures.
+    pressures_fo_wd, pressures_wd_rw, pressures_rw_perpv = \
+        burnman.tools.equilibrium_pressure([forsterite, mg_wadsleyite, mg_ringwoodite,
+                                            periclase, mg_perovskite],
+                                           [[1.0, -1.0, 0.0, 0.0, 0.0],
+                                            [0.0, 1.0, -1.0, 0.0, 0.0],
+                                            [0.0, 0.0, 1.0, -1.0, -1.0]],
+                                           temperatures)
 
     plt.plot(temperatures, pressures_fo_wd / 1.e9, label='fo -> wd')
     plt.plot(temperatures, pressures_wd_rw / 1.e9, label='wd -> rw')
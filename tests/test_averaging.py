@@ -3,6 +3,7 @@ import unittest
 import os
 import sys
 import warnings
+import numpy as np
 sys.path.insert(1, os.path.abspath('..'))
 
 import burnman
@@ -394,5 +395,37 @@ class HSAverage(BurnManTest):
         self.assertFloatEqual(278.893, K[0] / 1.e9)
         self.assertFloatEqual(153.461, G[0] / 1.e9)
 
+
+class ArrayAverages(BurnManTest):
+
+    def test_arrays_of_states(self):
+        volumes = np.array([[1.0, 2.0, 0.5], [0.0, 2.0, 1.0], [1.0, 1.0, 1.0]])
+        K = np.array([[100.e9, 200.e9, 150.e9], [120.e9, 250.e9, 80.e9],
+                      [160.e9, 160.e9, 130.e9]])
+        G = np.array([[60.e9, 120.e9, 90.e9], [70.e9, 150.e9, 40.e9],
+                      [90.e9, 100.e9, 90.e9]])
+        rho = np.array([[3000., 4000., 3500.], [3300., 4100., 2900.],
+                        [3200., 3200., 3600.]])
+        for scheme in [avg.Voigt(), avg.Reuss(), avg.VoigtReussHill(),
+                       avg.HashinShtrikmanUpper(), avg.HashinShtrikmanLower(),
+                       avg.HashinShtrikmanAverage()]:
+            self.assertTrue(scheme.vectorized)
+            K_avg, G_avg, rho_avg = scheme.average_elastic_properties(volumes, K, G, rho)
+            self.assertEqual(K_avg.shape, (3,))
+            for i in range(3):
+                self.assertFloatEqual(K_avg[i], scheme.average_bulk_moduli(
+                    list(volumes[i]), list(K[i]), list(G[i])))
+                self.assertFloatEqual(G_avg[i], scheme.average_shear_moduli(
+                    list(volumes[i]), list(K[i]), list(G[i])))
+                self.assertFloatEqual(rho_avg[i], scheme.average_density(
+                    list(volumes[i]), list(rho[i])))
+
+    def test_reference_phase_bounds(self):
+        # a single phase is its own Hashin-Shtrikman bound
+        K, G = avg.HashinShtrikmanUpper().average_elastic_properties(
+            [[2.0]], [[100.e9]], [[50.e9]], [[3000.]])[0:2]
+        self.assertArraysAlmostEqual(K, [100.e9])
+        self.assertArraysAlmostEqual(G, [50.e9])
+
 if __name__ == '__main__':
     unittest.main()
@@ -5,6 +5,8 @@ import sys
 sys.path.insert(1, os.path.abspath('..'))
 import warnings
 
+import numpy as np
+
 import burnman
 from burnman import minerals
 
@@ -300,5 +302,40 @@ class composite(BurnManTest):
         self.assertFloatEqual(rock1.heat_capacity_v, min1.C_v)
         self.assertFloatEqual(rock1.heat_capacity_p, min1.C_p)
 
+    def test_evaluate_vectorized(self):
+        ol = minerals.SLB_2011.mg_fe_olivine()
+        ol.set_composition([0.9, 0.1])
+        rock = burnman.Composite([ol, minerals.SLB_2011.periclase(),
+                                  minerals.SLB_2011.stishovite()],
+                                 [0.5, 0.3, 0.2])
+        self.assertTrue(rock.vectorized)
+        pressures = np.array([1.e5, 5.e9, 10.e9])
+        temperatures = np.array([300., 1500., 2000.])
+        properties = ['gibbs', 'V', 'rho', 'K_S', 'G', 'C_p', 'alpha', 'v_p', 'v_s']
+        values = rock.evaluate(properties, pressures, temperatures)
+        for i in range(len(pressures)):
+            rock.set_state(pressures[i], temperatures[i])
+            for j, prop in enumerate(properties):
+                self.assertFloatEqual(values[j][i], getattr(rock, prop))
+
+    def test_phase_state_matrix(self):
+        rock = burnman.Composite([minerals.SLB_2011.periclase(),
+                                  minerals.SLB_2011.stishovite()], [0.4, 0.6])
+        pressures, temperatures = np.meshgrid([10.e9, 20.e9, 30.e9], [1000., 2000.])
+        rock.set_state(pressures, temperatures)
+        volumes, = rock._phase_state(['molar_volume'])
+        self.assertEqual(volumes.shape, (6, 2))
+        self.assertEqual(rock.K_S.shape, (2, 3))
+        rock.set_state(20.e9, 2000.)
+        self.assertArraysAlmostEqual(rock._phase_state(['molar_volume'])[0], volumes[4])
+        self.assertFloatEqual(rock.molar_volume, np.dot(volumes[4], [0.4, 0.6]))
+
+    def test_not_vectorized(self):
+        rock = burnman.Composite([minerals.Murakami_etal_2012.fe_periclase(),
+                                  minerals.SLB_2011.periclase()], [0.5, 0.5])
+        self.assertFalse(rock.vectorized)
+        values = rock.evaluate(['V'], [30.e9, 60.e9], [2000., 2000.])
+        self.assertEqual(values.shape, (1, 2))
+
 if __name__ == '__main__':
     unittest.main()
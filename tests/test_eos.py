@@ -7,6 +7,8 @@ import sys
 sys.path.insert(1, os.path.abspath('..'))
 import warnings
 
+import numpy as np
+
 import burnman
 from burnman import minerals
 
@@ -153,6 +155,87 @@ class eos(BurnManTest):
             Density_test, rock.params['molar_mass'] / rock.params['V_0'])
 
 
+class test_slb_volume_solver(BurnManTest):
+
+    def test_solve_volumes(self):
+        rock = mypericlase()
+        eos = burnman.eos.SLB3()
+        pressures = np.linspace(1.e5, 100.e9, 11)
+        temperatures = np.linspace(300., 3000., 11)
+        volumes, converged = eos.solve_volumes(
+            pressures, temperatures, rock.params)
+        self.assertTrue(np.all(converged))
+        for P, T, V in zip(pressures, temperatures, volumes):
+            self.assertFloatEqual(V, eos.volume(P, T, rock.params))
+            self.assertFloatEqual(eos.pressure(T, V, rock.params) + 1.e5,
+                                  P + 1.e5)
+
+    def test_large_compression(self):
+        # the first Newton step from V_0 would reach volumes at which
+        # the Debye temperature of forsterite is undefined
+        fo = burnman.minerals.SLB_2011.forsterite()
+        eos = burnman.eos.SLB3()
+        volumes, converged = eos.solve_volumes([107.e9, 117.e9], [300., 300.], fo.params)
+        self.assertTrue(np.all(converged))
+        self.assertFloatEqual(volumes[1], eos.volume(117.e9, 300., fo.params))
+
+    def test_convergence_flags(self):
+        rock = mypericlase()
+        eos = burnman.eos.SLB3()
+        pressures = np.array([0., 50.e9])
+        temperatures = np.array([300., 2000.])
+        volumes, converged = eos.solve_volumes(
+            pressures, temperatures, rock.params, max_iterations=2)
+        self.assertFalse(np.all(converged))
+        # the bracketing solver used by the volume function for
+        # these states finds the root
+        for i in np.nonzero(~converged)[0]:
+            volume = eos.volume(pressures[i], temperatures[i], rock.params)
+            self.assertFloatEqual(eos.pressure(temperatures[i], volume, rock.params),
+                                  pressures[i])
+        self.assertArraysAlmostEqual(eos.volume(pressures, temperatures, rock.params),
+                                     [eos.volume(P, T, rock.params)
+                                      for P, T in zip(pressures, temperatures)])
+
+
+class test_intermediate_cache(BurnManTest):
+
+    def test_state_change(self):
+        params = mypericlase().params
+        eos = burnman.eos.SLB3()
+        V = 10.e-6
+        K1 = eos.isothermal_bulk_modulus(0., 1000., V, params)
+        K2 = eos.isothermal_bulk_modulus(0., 2000., V, params)
+        self.assertFloatEqual(K2, burnman.eos.SLB3().isothermal_bulk_modulus(
+            0., 2000., V, params))
+        self.assertTrue(K1 != K2)
+
+        # changing a parameter must invalidate the cached values
+        params = dict(params)
+        params['Debye_0'] = 500.
+        S = eos.entropy(0., 2000., V, params)
+        self.assertFloatEqual(S, burnman.eos.SLB3().entropy(
+            0., 2000., V, params))
+
+    def test_array_mutation(self):
+        params = mypericlase().params
+        eos = burnman.eos.SLB3()
+        T = np.array([1000., 2000.])
+        V = np.array([10.e-6, 10.e-6])
+        eos.heat_capacity_v(0., T, V, params)
+        T[0] = 3000.
+        self.assertArraysAlmostEqual(eos.heat_capacity_v(0., T, V, params),
+                                     burnman.eos.SLB3().heat_capacity_v(0., T, V, params))
+
+    def test_mineral_reset(self):
+        per = minerals.SLB_2011.periclase()
+        per.set_state(10.e9, 1500.)
+        per.isothermal_bulk_modulus
+        self.assertTrue(per.method._intermediate_values)
+        per.reset()
+        self.assertTrue(per.method._intermediate_values is None)
+
+
 class test_eos_validation(BurnManTest):
 
     def test_no_shear_error(self):
@@ -2,12 +2,15 @@ from __future__ import absolute_import
 import unittest
 import os
 import sys
+import numpy as np
+import scipy.integrate
 
 sys.path.insert(1, os.path.abspath('..'))
 import warnings
 
 import burnman
 from burnman import minerals
+from burnman.mineral_helpers import HelperSpinTransition
 
 from util import BurnManTest
 
@@ -45,6 +48,59 @@ class geotherm(BurnManTest):
         test_K_adiabat = burnman.geotherm.adiabatic(pressure, T0, rock)
         self.assertArraysAlmostEqual(test_K_adiabat, [1500, 1650.22034002])
 
+    def test_adiabat_isentrope(self):
+        rock = burnman.Composite([minerals.SLB_2011.mg_perovskite(),
+                                  minerals.SLB_2011.periclase()], [0.7, 0.3])
+        pressures = np.linspace(25.e9, 125.e9, 11)
+        temperatures = burnman.geotherm.adiabatic(pressures, 2000., rock)
+        entropies = rock.evaluate(['S'], pressures, temperatures)[0]
+        self.assertArraysAlmostEqual(entropies, [entropies[0]] * 11)
+
+        # the temperature gradient agrees with dT/dP
+        T_up = burnman.geotherm.adiabatic([75.e9, 75.1e9], 2000., rock)[1]
+        T_down = burnman.geotherm.adiabatic([75.e9, 74.9e9], 2000., rock)[1]
+        dTdP = burnman.geotherm.dTdP(2000., 75.e9, rock)
+        self.assertFloatEqual((T_up - T_down) / 0.2e9, dTdP)
+
+    def test_adiabat_anchors(self):
+        rock = mypericlase()
+        pressures = [25.e9, 50.e9, 100.e9]
+        T0 = [1500., 2000., 2500.]
+        temperatures = burnman.geotherm.adiabatic(pressures, T0, rock)
+        self.assertEqual(temperatures.shape, (3, 3))
+        for i in range(3):
+            self.assertArraysAlmostEqual(temperatures[i],
+                                         burnman.geotherm.adiabatic(pressures, T0[i], rock))
+
+
+    def test_adiabat_methods(self):
+        pressures = np.linspace(25.e9, 125.e9, 101)
+        rocks = [(minerals.SLB_2011.periclase(), ['slb2', 'slb3', 'mgd2', 'mgd3',
+                                                  'bm2', 'bm3', 'vinet']),
+                 (minerals.HP_2011_ds62.per(), ['hp_tmt', 'mt', 'bm4'])]
+        rocks[1][0].params['Kprime_prime_0'] = -rocks[1][0].params['Kprime_0'] / rocks[1][0].params['K_0']
+        for rock, methods in rocks:
+            for method in methods:
+                rock.set_method(method)
+                temperatures = burnman.geotherm.adiabatic(pressures, 1600., rock)
+                # the temperature gradient agrees with dT/dP
+                self.assertEqual(temperatures[0], 1600.)
+                dTdP = burnman.geotherm.dTdP(temperatures[50], pressures[50], rock)
+                self.assertFloatEqual((temperatures[51] - temperatures[49]) / 2.e9, dTdP, tol=1.e-4)
+
+        # CORK provides no thermal properties
+        fluid = minerals.HP_2011_fluids.CO2()
+        self.assertEqual(len(burnman.geotherm.adiabatic([1.e8, 1.e9], 1600., fluid)), 2)
+
+    def test_adiabat_spin_transition(self):
+        # no latent heat is released by the transition
+        rock = HelperSpinTransition(63.e9, minerals.SLB_2011.wuestite(), minerals.SLB_2011.periclase())
+        pressures = np.linspace(25.e9, 125.e9, 11)
+        temperatures = burnman.geotherm.adiabatic(pressures, 2000., rock)
+        reference = scipy.integrate.odeint(lambda T, P: burnman.geotherm.dTdP(T, P, rock),
+                                           2000., pressures).ravel()
+        self.assertArraysAlmostEqual(temperatures, reference)
+
 
 if __name__ == '__main__':
     unittest.main()
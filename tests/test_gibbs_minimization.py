@@ -0,0 +1,144 @@
+from __future__ import absolute_import
+import unittest
+import os
+import sys
+import numpy as np
+
+sys.path.insert(1, os.path.abspath('..'))
+
+import burnman
+from burnman import minerals
+from burnman.gibbs_minimization import simplex_grid
+
+from util import BurnManTest
+
+
+class GibbsMinimization(BurnManTest):
+
+    def setUp(self):
+        self.ol = minerals.SLB_2011.mg_fe_olivine()
+        self.wad = minerals.SLB_2011.mg_fe_wadsleyite()
+        self.rw = minerals.SLB_2011.mg_fe_ringwoodite()
+        self.minimizer = burnman.GibbsMinimizer([self.ol, self.wad, self.rw],
+                                                {'Mg': 1.8, 'Fe': 0.2, 'Si': 1., 'O': 4.})
+
+    def test_simplex_grid(self):
+        points = simplex_grid(3, 4)
+        self.assertEqual(len(points), 15)
+        self.assertArraysAlmostEqual(np.sum(points, axis=1), np.ones(15))
+        self.assertArraysAlmostEqual(points[0], [1., 0., 0.])
+
+    def test_single_phase(self):
+        assemblage = self.minimizer.equilibrate(10.e9, 1673.)
+        self.assertEqual(assemblage.phases, [self.ol])
+        self.assertArraysAlmostEqual(assemblage.compositions[0], [0.9, 0.1])
+        self.ol.set_composition([0.9, 0.1])
+        self.ol.set_state(10.e9, 1673.)
+        self.assertFloatEqual(assemblage.gibbs, self.ol.gibbs)
+
+    def test_two_phase_loop(self):
+        P = 13.4e9
+        T = 1673.
+        assemblage = self.minimizer.equilibrate(P, T)
+        self.assertEqual(assemblage.phases, [self.ol, self.wad])
+
+        # the bulk composition is conserved
+        x_Fe = [x[1] for x in assemblage.compositions]
+        self.assertFloatEqual(np.sum(assemblage.molar_amounts), 1.)
+        self.assertFloatEqual(np.dot(assemblage.molar_amounts, x_Fe), 0.1)
+
+        # the partial gibbs free energies of the endmembers are equal
+        # in both phases
+        composite = assemblage.composite()
+        composite.set_state(P, T)
+        self.assertArraysAlmostEqual(self.ol.partial_gibbs, self.wad.partial_gibbs)
+
+        # and are given by the chemical potentials of the elements
+        mu = dict(zip(assemblage.elements, assemblage.chemical_potentials))
+        self.assertArraysAlmostEqual(self.ol.partial_gibbs,
+                                     [2. * mu['Mg'] + mu['Si'] + 4. * mu['O'],
+                                      2. * mu['Fe'] + mu['Si'] + 4. * mu['O']])
+
+    def test_component_potentials(self):
+        assemblage = self.minimizer.equilibrate(13.4e9, 1673.)
+        mu = assemblage.component_potentials([{'Mg': 2., 'Si': 1., 'O': 4.},
+                                              {'Fe': 2., 'Si': 1., 'O': 4.}])
+        self.ol.set_composition(assemblage.compositions[0])
+        self.ol.set_state(13.4e9, 1673.)
+        self.assertArraysAlmostEqual(mu, self.ol.partial_gibbs)
+
+    def test_equilibrate_path(self):
+        pressures = np.linspace(12.e9, 21.e9, 31)
+        temperatures = np.linspace(1600., 1700., 31)
+
+        global_searches = []
+        global_equilibrium = self.minimizer._global_equilibrium
+
+        def counted_global_equilibrium(*args):
+            global_searches.append(args)
+            return global_equilibrium(*args)
+        self.minimizer._global_equilibrium = counted_global_equilibrium
+        path = self.minimizer.equilibrate_path(pressures, temperatures)
+        self.minimizer._global_equilibrium = global_equilibrium
+
+        for assemblage, P, T in zip(path, pressures, temperatures):
+            reference = self.minimizer.equilibrate(P, T)
+            self.assertEqual(assemblage.phases, reference.phases)
+            self.assertArraysAlmostEqual(assemblage.molar_amounts, reference.molar_amounts)
+            self.assertFloatEqual(assemblage.gibbs, reference.gibbs)
+
+        # the phases appear and disappear along the path
+        names = [[phase.name for phase in a.phases] for a in path]
+        self.assertEqual(names[0], ['olivine'])
+        self.assertTrue(['olivine', 'wadsleyite'] in names)
+        self.assertTrue(['wadsleyite', 'ringwoodite'] in names)
+        self.assertEqual(names[-1], ['ringwoodite'])
+
+        # the global search is only done at the first point
+        # and where the assemblage changes
+        n_changes = sum(1 for a, b in zip(names[:-1], names[1:]) if a != b)
+        self.assertTrue(n_changes >= 4)
+        self.assertEqual(len(global_searches), 1 + n_changes)
+        self.assertEqual(global_searches[0][:2], (pressures[0], temperatures[0]))
+
+    def test_grid(self):
+        pressures = [12.e9, 15.e9, 22.e9]
+        temperatures = [1473., 1673.]
+        assemblages = self.minimizer.grid(pressures, temperatures)
+        names = [[[phase.name for phase in a.phases] for a in row] for row in assemblages]
+        self.assertEqual(names[0], [['olivine'], ['olivine']])
+        self.assertEqual(names[1], [['wadsleyite'], ['wadsleyite']])
+        self.assertEqual(names[2], [['ringwoodite'], ['ringwoodite']])
+        for row, P in zip(assemblages, pressures):
+            for assemblage, T in zip(row, temperatures):
+                self.assertFloatEqual(assemblage.pressure, P)
+                self.assertFloatEqual(assemblage.temperature, T)
+
+    def test_pure_phases(self):
+        # on the MgO-SiO2 join, the amounts of the stable phases
+        # are fixed by the bulk composition
+        fo = minerals.SLB_2011.forsterite()
+        wad = minerals.SLB_2011.mg_wadsleyite()
+        per = minerals.SLB_2011.periclase()
+        stv = minerals.SLB_2011.stishovite()
+        minimizer = burnman.GibbsMinimizer([fo, wad, per, stv], {'Mg': 2., 'Si': 1., 'O': 4.})
+        assemblage = minimizer.equilibrate(10.e9, 1600.)
+        self.assertEqual(assemblage.phases, [fo])
+        self.assertArraysAlmostEqual(assemblage.molar_amounts, [1.])
+        assemblage = minimizer.equilibrate(15.e9, 1600.)
+        self.assertEqual(assemblage.phases, [wad])
+
+        minimizer = burnman.GibbsMinimizer([fo, wad, per, stv], {'Mg': 3., 'Si': 1., 'O': 5.})
+        assemblage = minimizer.equilibrate(10.e9, 1600.)
+        self.assertEqual(assemblage.phases, [fo, per])
+        self.assertArraysAlmostEqual(assemblage.molar_amounts, [1., 1.])
+
+    def test_bulk_composition(self):
+        self.assertRaises(Exception, burnman.GibbsMinimizer,
+                          [self.ol], {'Mg': 1., 'Ca': 1., 'Si': 1., 'O': 4.})
+        self.assertRaises(Exception, burnman.GibbsMinimizer,
+                          [self.ol], {'Mg': 1., 'Si': 1., 'O': 4.})
+
+
+if __name__ == '__main__':
+    unittest.main()
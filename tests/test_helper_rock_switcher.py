@@ -97,7 +97,7 @@ class RockSwitcher(BurnManTest):
         output1 = self.min_lm.evaluate(vars, [20e9], [300])
         output2 = self.min_um.evaluate(vars, [40e9], [300])
         ref = np.concatenate((output1, output2), axis=1)
-        assert(np.array_equal(output, ref))
+        self.assertArraysAlmostEqual(output.flatten(), ref.flatten())
 
 
 
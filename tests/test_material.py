@@ -124,6 +124,27 @@ class test_material_name(BurnManTest):
                         np.array([[300., 300., 300], [300., 300., 300]]))
         self.assertEqual(Ss[0].shape, (2, 3))
 
+    def test_evaluate_vectorized(self):
+        m = self.min_with_name()
+        self.assertTrue(m.vectorized)
+        pressures = np.array([[1.e5, 10.e9, 25.e9], [50.e9, 75.e9, 100.e9]])
+        temperatures = np.array([[300., 1000., 1500.], [2000., 2500., 3000.]])
+        properties = ['V', 'S', 'K_T', 'K_S', 'G', 'C_p', 'alpha', 'gr']
+        values = m.evaluate(properties, pressures, temperatures)
+        for i, P in np.ndenumerate(pressures):
+            m.set_state(P, temperatures[i])
+            for j, prop in enumerate(properties):
+                self.assertFloatEqual(values[(j,) + i], getattr(m, prop))
+
+    def test_set_state_arrays(self):
+        m = self.min_with_name()
+        m.set_state(np.array([1.e5, 10.e9]), np.array([300., 2000.]))
+        self.assertEqual(m.V.shape, (2,))
+        self.assertEqual(m.v_p.shape, (2,))
+        V = m.V
+        m.set_state(10.e9, 2000.)
+        self.assertFloatEqual(V[1], m.V)
+
         
 if __name__ == '__main__':
     unittest.main()
@@ -3,9 +3,11 @@ import unittest
 import os
 import sys
 sys.path.insert(1, os.path.abspath('..'))
+import numpy as np
 
 import burnman
 from burnman import minerals
+from burnman.mineral_helpers import HelperLowHighPressureRockTransition
 from util import BurnManTest
 
 
@@ -118,6 +120,49 @@ class test_model(BurnManTest):
         self.assertArraysAlmostEqual(m2.density(), [4619.86433138])
         self.assertArraysAlmostEqual(m12.density(), [4512.8331140])
 
+    def test_stream(self):
+        rock = burnman.Composite([min1(), min2()], [0.2, 0.8])
+        p = np.linspace(30.e9, 60.e9, 7)
+        T = np.linspace(1500., 2500., 7)
+        m = burnman.Model(rock, p, T, burnman.averaging_schemes.HashinShtrikmanLower())
+        self.assertTrue(m.moduli is None)
+        for indices, properties in m.stream(3):
+            self.assertArraysAlmostEqual(properties['v_s'], m.v_s()[indices])
+            self.assertArraysAlmostEqual(properties['density'], m.density()[indices])
+            self.assertArraysAlmostEqual(properties['heat_capacity_p'],
+                                         m.heat_capacity_p()[indices])
+        self.assertEqual(m.moduli['K'].shape, (7, 2))
+
+    def test_not_vectorized(self):
+        rock = minerals.Murakami_etal_2012.fe_periclase()
+        p = [50.e9, 70.e9]
+        T = [2000., 2000.]
+        m = burnman.Model(rock, p, T, burnman.averaging_schemes.VoigtReussHill())
+        v_s = m.v_s()
+        rho = m.density()
+        for i in range(2):
+            rock.set_state(p[i], T[i])
+            self.assertFloatEqual(v_s[i], rock.v_s)
+            self.assertFloatEqual(rho[i], rock.density)
+
+
+    def test_changing_minerals(self):
+        lower = burnman.Composite([minerals.SLB_2011.forsterite(),
+                                   minerals.SLB_2011.periclase()], [0.5, 0.5])
+        rock = HelperLowHighPressureRockTransition(25.e9, lower, minerals.SLB_2011.mg_bridgmanite())
+        p = np.linspace(20.e9, 30.e9, 5)
+        T = np.full(5, 2000.)
+        m = burnman.Model(rock, p, T, burnman.averaging_schemes.VoigtReussHill())
+        v_s = m.v_s()
+        rho = m.density()
+        alpha = m.thermal_expansivity()
+        self.assertEqual(len(m.moduli), 5)
+        for i in range(5):
+            rock.set_state(p[i], T[i])
+            self.assertFloatEqual(v_s[i], rock.v_s)
+            self.assertFloatEqual(rho[i], rock.density)
+            self.assertFloatEqual(alpha[i], rock.thermal_expansivity)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -5,7 +5,11 @@ import sys
 sys.path.insert(1, os.path.abspath('..'))
 import warnings
 
+import numpy as np
+
+import burnman
 import burnman.eos.property_modifiers as pm
+from burnman.minerals import HP_2011_ds62
 
 import unittest
 from util import BurnManTest
@@ -103,5 +107,89 @@ class Modifiers(BurnManTest):
 
         self.assertArraysAlmostEqual(numerical, analytical)
 
+    def test_set_state_properties(self):
+        sill = HP_2011_ds62.sill()
+        reference = HP_2011_ds62.sill()
+        reference.set_state(1.e9, 1000.)
+        for properties in ['thermodynamic', ['gibbs', 'S', 'V'], ['K_S', 'v_p']]:
+            sill.set_state(1.e9, 1000., properties)
+            for prop in ['gibbs', 'S', 'V', 'K_T', 'C_p', 'alpha']:
+                self.assertFloatEqual(getattr(sill, prop), getattr(reference, prop))
+
+        # only the first derivatives of the excesses are calculated
+        sill.set_state(1.e9, 1000., 'thermodynamic')
+        self.assertTrue('d2GdP2' not in sill._property_modifiers)
+        sill.set_state(1.e9, 1000., ['gibbs', 'K_S'])
+        self.assertTrue('d2GdP2' in sill._property_modifiers)
+
+        self.assertRaises(ValueError, sill.set_state, 1.e9, 1000., 'gibbs')
+        self.assertRaises(ValueError, sill.set_state, 1.e9, 1000., 'elastic')
+
+    def test_bragg_williams_order_parameter(self):
+        params = {'n': 1., 'factor': 0.8, 'Wh': 13000., 'Wv': 1.e-7,
+                  'deltaH': 13000., 'deltaV': 1.e-7}
+        # the transition temperature is 2 W / (f R (1 + n))
+        Tc = 13000. / (0.8 * burnman.constants.gas_constant)
+        Q = pm._bragg_williams_order_parameter(0., [300., 0.9 * Tc, 1.1 * Tc], params)
+        self.assertTrue(Q[0] > 0.99)
+        self.assertTrue(0. < Q[1] < Q[0])
+        self.assertEqual(Q[2], 0.)
+
+        # the Gibbs energy is minimised with respect to Q
+        for T in [300., 0.9 * Tc]:
+            xs = pm._bragg_williams_excesses(1.e9, T, params)
+            Q_guess = np.array(xs['Q']) * 0.999
+            self.assertTrue(pm._bragg_williams_affinity(Q_guess, 1.e9, T, params)[0] > 0.)
+            self.assertFloatEqual(pm._bragg_williams_excesses(1.e9, T, params, Q_guess=Q_guess)['G'],
+                                  xs['G'])
+
+    def test_bragg_williams_arrays(self):
+        crd = HP_2011_ds62.crd()
+        pressures = np.array([1.e5, 1.e9, 5.e9])
+        temperatures = np.array([500., 1500., 2300.])
+        values = crd.evaluate(['gibbs', 'S', 'K_T', 'C_p'], pressures, temperatures)
+        for i in range(3):
+            crd.set_state(pressures[i], temperatures[i])
+            self.assertArraysAlmostEqual(values[:, i], [crd.gibbs, crd.S, crd.K_T, crd.C_p])
+
+    def test_compiled_modifiers(self):
+        linear = ['linear', {'delta_E': 1200., 'delta_S': 5., 'delta_V': 1.e-7}]
+        landau_hp = ['landau_hp', {'P_0': 1.e5, 'T_0': 298.15, 'Tc_0': 800.,
+                                   'S_D': 5., 'V_D': 1.e-7}]
+        pipeline = burnman.eos.compile_property_modifiers([linear, landau_hp])
+        self.assertTrue(pipeline[0][0] is pm._linear_excesses)
+        self.assertTrue(pipeline[0][2] is None)
+        self.assertFloatEqual(pipeline[1][2]['Q_0'], np.power((800. - 298.15) / 800., 0.25))
+        self.assertRaises(Exception, burnman.eos.compile_property_modifiers,
+                          [['not_a_modifier', {}]])
+
+        fo = HP_2011_ds62.fo()
+        fo.set_state(1.e9, 1000.)
+        gibbs = fo.gibbs
+        # replacing the modifiers compiles them again
+        fo.property_modifiers = [linear, landau_hp]
+        fo.set_state(1.e9, 1000.)
+        xs = [pm._linear_excesses(1.e9, 1000., linear[1]),
+              pm._landau_hp_excesses(1.e9, 1000., landau_hp[1])]
+        self.assertFloatEqual(fo.gibbs, gibbs + xs[0]['G'] + xs[1]['G'])
+
+        values = fo.evaluate(['gibbs', 'C_p'], [1.e9, 1.e9], [500., 1000.])
+        self.assertArraysAlmostEqual(values[:, 1], [fo.gibbs, fo.C_p])
+
+        # so does replacing a modifier in place
+        fo.property_modifiers[1] = ['linear', {'delta_E': 200., 'delta_S': 1., 'delta_V': 0.}]
+        fo.set_state(1.e9, 1000.)
+        self.assertFloatEqual(fo.gibbs, gibbs + xs[0]['G'] + 200. - 1000.)
+
+        # and changing the parameters of a modifier in place
+        q = HP_2011_ds62.q()
+        q.set_state(1.e9, 1000.)
+        q.property_modifiers[0][1]['Tc_0'] = 900.
+        q.set_state(1.e9, 1000.)
+        ref = HP_2011_ds62.q()
+        ref.property_modifiers = [['landau_hp', dict(q.property_modifiers[0][1])]]
+        ref.set_state(1.e9, 1000.)
+        self.assertFloatEqual(q.gibbs, ref.gibbs)
+
 if __name__ == '__main__':
     unittest.main()
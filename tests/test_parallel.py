@@ -0,0 +1,73 @@
+from __future__ import absolute_import
+import unittest
+import os
+import sys
+import numpy as np
+
+sys.path.insert(1, os.path.abspath('..'))
+import warnings
+
+import burnman
+from burnman import minerals
+from burnman import parallel
+
+from util import BurnManTest
+
+
+class ParallelEvaluator(BurnManTest):
+
+    def setUp(self):
+        fper = minerals.SLB_2011.ferropericlase()
+        fper.set_composition([0.9, 0.1])
+        self.rock = burnman.Composite([minerals.SLB_2011.mg_perovskite(), fper],
+                                      [0.7, 0.3])
+        self.P = np.linspace(30.e9, 120.e9, 12).reshape(3, 4)
+        self.T = np.linspace(1500., 2500., 12).reshape(3, 4)
+
+    def test_chunks(self):
+        evaluator = burnman.ParallelEvaluator(processes=3)
+        self.assertEqual(evaluator.chunks(10),
+                         [slice(0, 4), slice(4, 8), slice(8, 10)])
+        evaluator = burnman.ParallelEvaluator(processes=3, chunk_size=5)
+        self.assertEqual(evaluator.chunks(10), [slice(0, 5), slice(5, 10)])
+
+    def test_evaluate(self):
+        properties = ['V', 'gibbs', 'v_s']
+        reference = self.rock.evaluate(properties, self.P, self.T)
+        with burnman.ParallelEvaluator(processes=2, chunk_size=5) as evaluator:
+            for i in range(2):  # the second call reuses the workers
+                values = evaluator.evaluate(self.rock, properties, self.P, self.T)
+                self.assertEqual(values.shape, reference.shape)
+                self.assertArraysAlmostEqual(values.flatten(), reference.flatten())
+
+    def test_serial_fallback(self):
+        self.rock.unpicklable = lambda x: x
+        with burnman.ParallelEvaluator(processes=2, chunk_size=5) as evaluator:
+            with warnings.catch_warnings(record=True) as w:
+                warnings.simplefilter('always')
+                values = evaluator.evaluate(self.rock, ['V'], self.P, self.T)
+                self.assertEqual(len(w), 1)
+        self.assertArraysAlmostEqual(values.flatten(),
+                                     self.rock.evaluate(['V'], self.P, self.T).flatten())
+
+    def test_map(self):
+        args = [(self.rock, ['V'], self.P[i], self.T[i]) for i in range(3)]
+        reference = [self.rock.evaluate(['V'], self.P[i], self.T[i]) for i in range(3)]
+        with burnman.ParallelEvaluator(processes=2) as evaluator:
+            values = evaluator.map(parallel._evaluate_chunk, args)
+        self.assertEqual(len(values), 3)
+        for value, ref in zip(values, reference):
+            self.assertArraysAlmostEqual(value.flatten(), ref.flatten())
+
+        # unpicklable arguments are evaluated in serial
+        self.rock.unpicklable = lambda x: x
+        with burnman.ParallelEvaluator(processes=2) as evaluator:
+            with warnings.catch_warnings(record=True) as w:
+                warnings.simplefilter('always')
+                values = evaluator.map(parallel._evaluate_chunk, args)
+                self.assertEqual(len(w), 1)
+        self.assertArraysAlmostEqual(values[2].flatten(), reference[2].flatten())
+
+
+if __name__ == '__main__':
+    unittest.main()
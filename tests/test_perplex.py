@@ -2,6 +2,8 @@ from __future__ import absolute_import
 import unittest
 import os
 import sys
+import shutil
+import tempfile
 import numpy as np
 
 sys.path.insert(1, os.path.abspath('..'))
@@ -45,6 +47,52 @@ class PerpleX(BurnManTest):
             self.assertRaises(Exception, fnLT)
             self.assertRaises(Exception, fnHT)
 
+    def test_evaluate_out_of_bounds(self):
+        P = np.array([[10.e9, 30.e9], [10.e9, 20.e9]])
+        T = np.array([[1500., 1500.], [1300., 1900.]])
+        inside = np.array([[True, False], [False, True]])
+        self.assertTrue(np.all(rock.in_bounds(P, T) == inside))
+        self.assertRaises(ValueError, rock.evaluate, ['V'], P, T)
+
+        V, G = rock.evaluate(['V', 'gibbs'], P, T, out_of_bounds='nan')
+        self.assertTrue(np.all(np.isnan(V) == ~inside))
+        self.assertArraysAlmostEqual(G[inside],
+                                     rock.evaluate(['gibbs'], P[inside], T[inside])[0])
+
+    def test_table_cache(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            tab_file = os.path.join(tmpdir, 'in23_1.tab')
+            shutil.copy('../burnman/data/input_perplex/in23_1.tab', tab_file)
+            burnman.PerplexMaterial(tab_file)
+            self.assertFalse(os.path.exists(tab_file + '.npy'))
+
+            burnman.PerplexMaterial(tab_file, cache=True)
+            self.assertEqual(os.listdir(tmpdir), ['in23_1.tab', 'in23_1.tab.npy'])
+            self.assertEqual(np.load(tab_file + '.npy').dtype.names[:3],
+                             ('pressure', 'temperature', 'rho'))
+            cached_rock = burnman.PerplexMaterial(tab_file, cache=True)
+
+            P = [10.e9, 11.e9]
+            T = [1500., 2000.]
+            properties = ['V', 'gibbs', 'K_S', 'v_s', 'C_p']
+            self.assertArraysAlmostEqual(cached_rock.evaluate(properties, P, T).flatten(),
+                                         rock.evaluate(properties, P, T).flatten())
+            self.assertEqual(cached_rock.bounds, rock.bounds)
+
+            # a cache with other properties is not used, and is replaced
+            cached_table = np.load(tab_file + '.npy')
+            names = list(cached_table.dtype.names)
+            names[2:] = names[:1:-1]
+            cached_table.dtype.names = names
+            np.save(tab_file + '.npy', cached_table)
+            rebuilt_rock = burnman.PerplexMaterial(tab_file, cache=True)
+            self.assertArraysAlmostEqual(rebuilt_rock.evaluate(properties, P, T).flatten(),
+                                         rock.evaluate(properties, P, T).flatten())
+            self.assertEqual(np.load(tab_file + '.npy').dtype.names[2], 'rho')
+        finally:
+            shutil.rmtree(tmpdir)
+
         
 if __name__ == '__main__':
     unittest.main()
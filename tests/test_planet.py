@@ -6,6 +6,8 @@ import sys
 sys.path.insert(1, os.path.abspath('..'))
 import warnings
 
+import numpy as np
+
 import burnman
 from burnman import minerals
 from burnman import seismic
@@ -56,6 +58,137 @@ class test_planet(BurnManTest):
 
         self.assertArraysAlmostEqual(myplanet.temperatures, ref)
 
+    def test_cumulative_integral(self):
+        # cubic polynomials are integrated exactly on non-uniform grids
+        x = np.array([0., 0.3, 0.5, 1.2, 1.3, 2.])
+        integral = planet._cumulative_integral(x, x * x * x - 2. * x + 1.)
+        self.assertArraysAlmostEqual(integral, x * x * x * x / 4. - x * x + x)
+
+    def test_cumulative_integral_breaks(self):
+        # the polynomials do not extend across the breaks, where the function jumps
+        x = np.array([0., 0.3, 0.5, 1.2, 1.3, 2., 2.01, 2.5, 2.6, 3., 3.5])
+        y = x * x * x - 2. * x + 1. + np.where(x > 2.005, 5., 0.)
+        integral = planet._cumulative_integral(x, y, [5])
+        exact = x * x * x * x / 4. - x * x + x + np.where(x > 2.005, 5. * (x - 2.005), 0.)
+        self.assertArraysAlmostEqual(integral[:6], exact[:6])
+        self.assertFloatEqual(integral[-1], exact[-1], tol=1.e-4)
+        errors = planet._interval_errors(x, y, [5])
+        self.assertTrue(np.all(errors[:5] < 1.e-12))
+        self.assertTrue(errors[5] > 5. * 0.005)
+
+    def test_adaptive_mesh(self):
+        def layers(n_slices):
+            return [planet.Planet.Layer("core", burnman.minerals.other.Liquid_Fe_Anderson(), 3485e3, n_slices=n_slices),
+                    planet.Planet.Layer("mantle", burnman.minerals.SLB_2011.mg_bridgmanite(), 6371.e3,
+                                        n_slices=n_slices)]
+        uniform = planet.Planet(layers(200), tolerance=1.e-8)
+        adaptive = planet.Planet(layers(8), tolerance=1.e-8, mesh_tolerance=1.e-6)
+        self.assertTrue(len(adaptive.radial_slices) < 100)
+        self.assertFloatEqual(adaptive.mass, uniform.mass, tol=1.e-5)
+        self.assertFloatEqual(adaptive.moment_of_inertia_factor, uniform.moment_of_inertia_factor, tol=1.e-5)
+        self.assertFloatEqual(adaptive.pressures[0], uniform.pressures[0], tol=1.e-5)
+        self.assertTrue(adaptive.mass_error < 1.e-6 * adaptive.mass)
+        self.assertTrue(adaptive.moment_of_inertia_error < 1.e-6 * adaptive.moment_of_inertia)
+        # the errors on the coarse grid are larger
+        coarse = planet.Planet(layers(8), tolerance=1.e-8)
+        self.assertTrue(coarse.mass_error > adaptive.mass_error)
+
+    def test_adaptive_mesh_transition(self):
+        LM = burnman.minerals.SLB_2011.mg_bridgmanite()
+        UM = burnman.minerals.SLB_2011.forsterite()
+
+        def layers():
+            mantle_rock = helpers.HelperLowHighPressureRockTransition(25.0e9, UM, LM)
+            return [planet.Planet.Layer("core", burnman.minerals.other.Liquid_Fe_Anderson(), 3485e3, n_slices=8),
+                    planet.Planet.Layer("mantle", mantle_rock, 6371.e3, n_slices=8)]
+        fine = planet.Planet(layers(), mesh_tolerance=1.e-6)
+        adaptive = planet.Planet(layers(), mesh_tolerance=1.e-5)
+        self.assertTrue(len(adaptive.radial_slices) < 100)
+        self.assertFloatEqual(adaptive.mass, fine.mass, tol=1.e-5)
+        self.assertFloatEqual(adaptive.moment_of_inertia, fine.moment_of_inertia, tol=2.e-5)
+
+        # the transition is between a pair of radial slices
+        mantle = adaptive.get_layer("mantle")
+        breaks = adaptive._breaks(mantle)
+        pressures = adaptive.pressures[mantle.n_start: mantle.n_end]
+        self.assertTrue(np.any((pressures[breaks] >= 25.e9) & (pressures[breaks + 1] < 25.e9)))
+        self.assertEqual(len(adaptive._transitions(mantle)[0]), 0)
+
+    def test_self_consistent(self):
+        core = planet.Planet.Layer("core", burnman.minerals.other.Liquid_Fe_Anderson(), 3485e3, 20)
+        LM = burnman.minerals.SLB_2011.mg_bridgmanite()
+        UM = burnman.minerals.SLB_2011.forsterite()
+        mantle_rock = helpers.HelperLowHighPressureRockTransition(25.0e9, UM, LM)
+        mantle = planet.Planet.Layer("mantle", mantle_rock, 6371.e3, 20)
+        myplanet = planet.Planet([core, mantle], tolerance=1.e-8)
+        self.assertTrue(myplanet.n_iterations < 15)
+        self.assertTrue(myplanet.converged)
+        self.assertFloatEqual(core.mass + mantle.mass, myplanet.mass)
+
+        # the pressures are in hydrostatic equilibrium with the densities
+        densities = np.concatenate([layer.rock.evaluate(['density'], myplanet.pressures[layer.n_start: layer.n_end],
+                                                        myplanet.temperatures[layer.n_start: layer.n_end])[0]
+                                    for layer in myplanet.layers])
+        self.assertArraysAlmostEqual(densities, myplanet.densities)
+        pressures = myplanet.pressures
+        myplanet._compute_gravity(myplanet.densities, myplanet.radial_slices)
+        myplanet._compute_pressure(myplanet.densities, myplanet.gravity, myplanet.radial_slices)
+        self.assertArraysAlmostEqual(pressures[:-1], myplanet.pressures[:-1])
+
+    def test_not_converged(self):
+        core = planet.Planet.Layer("core", burnman.minerals.other.Liquid_Fe_Anderson(), 3485e3, n_slices=20)
+        mantle = planet.Planet.Layer("mantle", burnman.minerals.SLB_2011.mg_bridgmanite(), 6371.e3, n_slices=20)
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always')
+            myplanet = planet.Planet([core, mantle], n_max_iterations=2)
+        self.assertEqual(myplanet.n_iterations, 2)
+        self.assertFalse(myplanet.converged)
+        self.assertTrue(any('did not converge' in str(warning.message) for warning in w))
+
+    def test_planet_family(self):
+        core_rock = burnman.minerals.other.Liquid_Fe_Anderson()
+        mantle_rock = burnman.minerals.SLB_2011.forsterite()
+
+        def layers(core_radius):
+            return [planet.Planet.Layer("core", core_rock, core_radius, n_slices=20),
+                    planet.Planet.Layer("mantle", mantle_rock, 6371.e3, n_slices=20)]
+
+        core_radii = [3000.e3, 3200.e3, 3400.e3, 3600.e3]
+        family = planet.PlanetFamily(layers, core_radii, processes=1)
+        self.assertEqual(family.pressures.shape, (4, 40))
+        self.assertEqual(family.layer_masses.shape, (4, 2))
+        for i, core_radius in enumerate(core_radii):
+            myplanet = planet.Planet(layers(core_radius))
+            self.assertFloatEqual(family.mass[i], myplanet.mass)
+            self.assertFloatEqual(family.moment_of_inertia_factor[i], myplanet.moment_of_inertia_factor)
+            self.assertArraysAlmostEqual(family.layer_masses[i], [layer.mass for layer in myplanet.layers])
+            self.assertArraysAlmostEqual(family.densities[i], myplanet.densities)
+        # the core mass fraction increases with the core radius
+        self.assertTrue(np.all(np.diff(family.layer_masses[:, 0] / family.mass) > 0.))
+
+        # the results do not depend on the number of processes,
+        # apart from the starting pressures of the first planets of each chunk
+        parallel_family = planet.PlanetFamily(layers, core_radii, processes=2)
+        self.assertArraysAlmostEqual(parallel_family.mass, family.mass)
+
+        tabulated_family = planet.PlanetFamily(layers, core_radii, processes=1,
+                                               table_pressures=np.linspace(0., 500.e9, 101),
+                                               table_temperatures=[250., 275., 325., 350.])
+        for i in range(4):
+            self.assertFloatEqual(tabulated_family.mass[i], family.mass[i], tol=1.e-4)
+        self.assertRaises(ValueError, planet.PlanetFamily, layers, core_radii,
+                          table_pressures=np.linspace(0., 500.e9, 101))
+
+        self.assertRaises(ValueError, planet.Planet, layers(3000.e3), pressures=[1.e9, 2.e9])
+
+        # the pressures of the previous planet are interpolated to the
+        # radial slices of the next one, also if they are refined
+        refined_family = planet.PlanetFamily(layers, core_radii, processes=1, mesh_tolerance=1.e-5)
+        for i, core_radius in enumerate(core_radii[1:]):
+            myplanet = planet.Planet(layers(core_radius), mesh_tolerance=1.e-5)
+            self.assertFloatEqual(refined_family.mass[i + 1], myplanet.mass, tol=1.e-5)
+            self.assertTrue(refined_family.n_iterations[i + 1] < myplanet.n_iterations)
+
 
 if __name__ == '__main__':
     unittest.main()
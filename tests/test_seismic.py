@@ -1,11 +1,15 @@
 from __future__ import absolute_import
 import unittest
 import os
+import shutil
 import sys
+import tempfile
 
 sys.path.insert(1, os.path.abspath('..'))
 import warnings
 
+import numpy as np
+
 import burnman
 from burnman import minerals
 from burnman import seismic
@@ -59,5 +63,88 @@ class test_seismic(BurnManTest):
             self.assertArraysAlmostEqual(result, ref[name])
 
 
+    def test_evaluate_properties(self):
+        model = burnman.seismic.PREM()
+        depths = np.linspace(0., 6000.e3, 37)
+        vars = ['pressure', 'density', 'v_p', 'v_s', 'v_phi', 'G', 'K', 'QG', 'QK']
+        values = model.evaluate(vars, depths)
+        for i, var in enumerate(vars):
+            self.assertArraysAlmostEqual(values[i], getattr(model, var)(depths))
+
+        # the shape of the depths is kept
+        values = model.evaluate(vars, depths.reshape(37, 1))
+        self.assertEqual(values.shape, (len(vars), 37, 1))
+        self.assertRaises(ValueError, model.evaluate, vars, depths, 'inside')
+
+    def test_evaluate_discontinuities(self):
+        model = burnman.seismic.PREM()
+        discontinuities = model.discontinuities
+        self.assertFloatEqual(discontinuities[-2], 2891.e3)
+        below = model.evaluate(['v_s', 'density'], discontinuities)
+        above = model.evaluate(['v_s', 'density'], discontinuities, side='above')
+        self.assertArraysAlmostEqual(below[0], model.v_s(discontinuities + 1.))
+        self.assertArraysAlmostEqual(above[0], model.v_s(discontinuities - 1.))
+        # no shear waves in the outer core
+        self.assertEqual(below[0][-2], 0.)
+        self.assertTrue(above[0][-2] > 7000.)
+        self.assertTrue(np.all(below[1] >= above[1]))
+
+    def test_depth(self):
+        model = burnman.seismic.PREM()
+        depths = np.array([100.e3, 1000.e3, 3000.e3])
+        self.assertArraysAlmostEqual(model.depth(model.pressure(depths)), depths)
+        self.assertFloatEqual(model.depth(model.pressure(1000.e3)), 1000.e3)
+        self.assertRaises(ValueError, model.depth, 1.e13)
+
+
+    def test_model_tables(self):
+        tables = seismic.model_tables('PREM')
+        self.assertFalse(tables.flags.writeable)
+        self.assertTrue(seismic.model_tables('PREM') is tables)
+        # the tables are shared between the instances, also when evaluated
+        models = [seismic.PREM(), seismic.PREM()]
+        self.assertTrue(np.shares_memory(models[0].table_vs, tables))
+        models[0].evaluate(['v_s'], [1000.e3])
+        models[1].evaluate(['v_s'], [1000.e3])
+        self.assertTrue(models[0]._table is models[1]._table)
+        self.assertTrue(np.shares_memory(models[0]._table, tables))
+        self.assertTrue(np.shares_memory(models[0].table_vs, tables))
+        # setting a table gives the instance its own tables
+        models[1].table_vs = 2. * tables['vs']
+        self.assertArraysAlmostEqual(models[1].evaluate(['v_s'], [1000.e3])[0],
+                                     2. * models[0].evaluate(['v_s'], [1000.e3])[0])
+        self.assertFalse(np.shares_memory(models[1]._table, tables))
+        self.assertArraysAlmostEqual(seismic.PREM().v_s([1000.e3]), np.interp([1000.e3], tables['depth'], tables['vs']))
+        self.assertRaises(ValueError, seismic.model_tables, 'not_a_model')
+
+    def test_cache_directory(self):
+        directory = tempfile.mkdtemp()
+        model_tables = dict(seismic._model_tables)
+        cache_directory = seismic._cache_directory
+        tables_version = seismic._tables_version
+        try:
+            seismic.set_cache_directory(directory)
+            seismic._model_tables.clear()
+            tables = seismic.model_tables('STW105')
+            self.assertEqual(len(os.listdir(directory)), 1)
+            # the tables are mapped from the cache by the other processes
+            seismic._model_tables.clear()
+            cached = seismic.model_tables('STW105')
+            self.assertFalse(cached.flags.owndata)
+            for name in tables.dtype.names:
+                self.assertArraysAlmostEqual(cached[name], tables[name])
+            # the cache files of other versions of the readers are not used
+            seismic._model_tables.clear()
+            seismic._tables_version += 1
+            seismic.model_tables('STW105')
+            self.assertEqual(len(os.listdir(directory)), 2)
+        finally:
+            seismic._tables_version = tables_version
+            seismic.set_cache_directory(cache_directory)
+            seismic._model_tables.clear()
+            seismic._model_tables.update(model_tables)
+            shutil.rmtree(directory)
+
+
 if __name__ == '__main__':
     unittest.main()
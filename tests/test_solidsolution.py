@@ -156,6 +156,41 @@ class two_site_ss_subregular(burnman.SolidSolution):
         burnman.SolidSolution.__init__(self, molar_fractions)
 
 
+# Three-endmember, two site solid solutions with asymmetric interactions
+
+
+class two_site_ss_asymmetric(burnman.SolidSolution):
+
+    def __init__(self, molar_fractions=None):
+        self.name = 'two_site_ss (asymmetric)'
+        self.solution_type = 'asymmetric'
+        self.endmembers = [[forsterite(), '[Mg]3[Al]2Si3O12'], [
+                           forsterite(), '[Fe]3[Al]2Si3O12'], [forsterite(), '[Mg]3[Mg1/2Si1/2]2Si3O12']]
+        self.alphas = [1., 1.5, 2.5]
+        self.energy_interaction = [[10.0e3, 5.0e3], [-10.0e3]]
+        self.volume_interaction = [[1.e-6, 2.e-7], [0.]]
+        self.entropy_interaction = [[1., -2.], [0.5]]
+
+        burnman.SolidSolution.__init__(self, molar_fractions)
+
+
+class two_site_ss_subregular_asymmetric(burnman.SolidSolution):
+
+    def __init__(self, molar_fractions=None):
+        self.name = 'two_site_ss (subregular asymmetric)'
+        self.solution_type = 'subregular'
+        self.endmembers = [[forsterite(), '[Mg]3[Al]2Si3O12'], [
+                           forsterite(), '[Fe]3[Al]2Si3O12'], [forsterite(), '[Mg]3[Mg1/2Si1/2]2Si3O12']]
+        self.energy_interaction = [
+            [[10.e3, -5.e3], [5.e3, 20.e3]], [[-10.e3, 3.e3]]]
+        self.volume_interaction = [
+            [[1.e-6, 0.], [2.e-7, 1.e-7]], [[0., 1.e-7]]]
+        self.entropy_interaction = [
+            [[1., 2.], [-2., 0.]], [[0.5, 0.]]]
+
+        burnman.SolidSolution.__init__(self, molar_fractions)
+
+
 class test_solidsolution(BurnManTest):
 
     def setup_1min_ss(self):
@@ -290,5 +325,65 @@ class test_solidsolution(BurnManTest):
         self.assertArraysAlmostEqual(
             opx.activity_coefficients, [np.exp(1.), 1.])
 
+    def test_vectorized_state(self):
+        ss = two_site_ss_subregular()
+        ss.set_composition([0.3, 0.3, 0.4])
+        self.assertTrue(ss.vectorized)
+        pressures = np.array([1.e5, 1.e9, 1.e10])
+        temperatures = np.array([300., 1000., 1500.])
+        ss.set_state(pressures, temperatures)
+        gibbs = ss.gibbs
+        partial_gibbs = ss.partial_gibbs
+        activities = ss.activities
+        self.assertEqual(partial_gibbs.shape, (3, 3))
+        for i in range(len(pressures)):
+            ss.set_state(pressures[i], temperatures[i])
+            self.assertFloatEqual(gibbs[i], ss.gibbs)
+            self.assertArraysAlmostEqual(partial_gibbs[i], ss.partial_gibbs)
+            self.assertArraysAlmostEqual(activities[i], ss.activities)
+
+    def test_vectorized_compositions(self):
+        compositions = np.array([[0.3, 0.3, 0.4], [0.1, 0.6, 0.3], [0.8, 0.1, 0.1]])
+        for ss in [two_site_ss(), two_site_ss_subregular(), two_site_ss_asymmetric(),
+                   two_site_ss_subregular_asymmetric(), olivine_ideal_ss()]:
+            n = ss.n_endmembers
+            model = ss.solution_model
+            x = compositions[:, :n] / np.sum(compositions[:, :n], axis=1)[:, np.newaxis]
+            partial_gibbs = model.excess_partial_gibbs_free_energies(1.e9, 1000., x)
+            gibbs = model.excess_gibbs_free_energy(1.e9, 1000., x)
+            hessian = model.excess_gibbs_hessian(1.e9, 1000., x)
+            self.assertEqual(partial_gibbs.shape, (3, n))
+            self.assertEqual(hessian.shape, (3, n, n))
+            for i in range(3):
+                self.assertArraysAlmostEqual(partial_gibbs[i],
+                                             model.excess_partial_gibbs_free_energies(1.e9, 1000., x[i]))
+                self.assertFloatEqual(gibbs[i], model.excess_gibbs_free_energy(1.e9, 1000., x[i]))
+                self.assertArraysAlmostEqual(hessian[i].flatten(),
+                                             model.excess_gibbs_hessian(1.e9, 1000., x[i]).flatten())
+
+    def test_gibbs_hessian(self):
+        x = np.array([0.3, 0.25, 0.45])
+        dn = 1.e-6
+        for ss in [two_site_ss(), two_site_ss_subregular(), two_site_ss_asymmetric(),
+                   two_site_ss_subregular_asymmetric()]:
+            ss.set_composition(x)
+            ss.set_state(1.e9, 1000.)
+            hessian = ss.gibbs_hessian
+
+            # derivatives of the partial gibbs free energies
+            # with respect to the molar amounts of the endmembers
+            numerical = np.empty((3, 3))
+            for j in range(3):
+                partial_gibbs = []
+                for sign in [1., -1.]:
+                    n = np.copy(x)
+                    n[j] += sign * dn
+                    ss.set_composition(n / np.sum(n))
+                    ss.set_state(1.e9, 1000.)
+                    partial_gibbs.append(ss.partial_gibbs)
+                numerical[:, j] = (partial_gibbs[0] - partial_gibbs[1]) / (2. * dn)
+            self.assertArraysAlmostEqual(hessian.flatten(), numerical.flatten())
+            self.assertArraysAlmostEqual(hessian.flatten(), hessian.T.flatten())
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,71 @@
+from __future__ import absolute_import
+import unittest
+import os
+import sys
+import numpy as np
+
+sys.path.insert(1, os.path.abspath('..'))
+import warnings
+
+import burnman
+from burnman import minerals
+
+from util import BurnManTest
+
+pressures = np.linspace(10.e9, 100.e9, 31)
+temperatures = np.linspace(1000., 3000., 21)
+
+
+class TabulatedMaterial(BurnManTest):
+
+    def setUp(self):
+        self.rock = burnman.Composite([minerals.SLB_2011.mg_perovskite(),
+                                       minerals.SLB_2011.periclase()], [0.7, 0.3])
+        self.table = burnman.TabulatedMaterial(self.rock, pressures, temperatures)
+
+    def test_grid_values(self):
+        self.table.set_state(pressures[3], temperatures[5])
+        self.rock.set_state(pressures[3], temperatures[5])
+        for prop in ['V', 'gibbs', 'S', 'K_S', 'G', 'C_p', 'alpha', 'gr',
+                     'v_p', 'rho', 'H', 'helmholtz']:
+            self.assertFloatEqual(getattr(self.table, prop),
+                                  getattr(self.rock, prop))
+
+    def test_interpolation(self):
+        P = np.array([[12.3e9, 45.6e9], [78.9e9, 99.e9]])
+        T = np.array([[1234., 2345.], [2999., 1001.]])
+        properties = ['V', 'K_S', 'G', 'v_s', 'S']
+        self.assertArraysAlmostEqual(self.table.evaluate(properties, P, T).flatten(),
+                                     self.rock.evaluate(properties, P, T).flatten())
+
+        self.table.set_state(P, T)
+        self.assertEqual(self.table.V.shape, (2, 2))
+
+    def test_error_estimates(self):
+        P = np.linspace(11.e9, 99.e9, 20)
+        T = np.linspace(1010., 2990., 20)
+        errors = self.table.interpolation_errors(['molar_volume'], P, T)
+        self.assertEqual(errors.shape, (1, 20))
+        V = self.rock.evaluate(['V'], P, T)
+        self.assertTrue(np.all(errors < 1.e-5 * V))
+        self.assertRaises(ValueError, self.table.interpolation_errors,
+                          ['v_p'], P, T)
+
+    def test_tabulated_properties(self):
+        table = burnman.TabulatedMaterial(self.rock, pressures, temperatures, ['density'])
+        self.assertArraysAlmostEqual(table.evaluate(['density'], [12.3e9, 45.6e9], [1234., 2345.])[0],
+                                     self.rock.evaluate(['density'], [12.3e9, 45.6e9], [1234., 2345.])[0])
+        table.set_state(12.3e9, 1234.)
+        self.assertRaises(NotImplementedError, lambda: table.K_S)
+        self.assertRaises(ValueError, burnman.TabulatedMaterial,
+                          self.rock, pressures, temperatures, ['v_p'])
+
+    def test_bounds(self):
+        self.assertRaises(ValueError, self.table.set_state, 5.e9, 2000.)
+        self.assertRaises(ValueError, self.table.set_state, 50.e9, [2000., 3500.])
+        self.assertRaises(ValueError, burnman.TabulatedMaterial,
+                          self.rock, [1.e9, 2.e9, 3.e9], temperatures)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -41,6 +41,39 @@ class test_tools(BurnManTest):
         P_calc = equilibrium_pressure([fo, fo2], [1.0, -1.0], fo.params['T_0'])
         self.assertArraysAlmostEqual([P], [P_calc])
 
+    def test_eqm_P_reactions(self):
+        fo = burnman.minerals.HP_2011_ds62.fo()
+        wad = burnman.minerals.HP_2011_ds62.mwd()
+        rw = burnman.minerals.HP_2011_ds62.mrw()
+        temperatures = np.linspace(1000., 2000., 6)
+        pressures = equilibrium_pressure([fo, wad, rw], [[1., -1., 0.], [0., 1., -1.]],
+                                         temperatures, 10.e9)
+        self.assertEqual(pressures.shape, (2, 6))
+        for i, T in enumerate(temperatures):
+            self.assertFloatEqual(pressures[0, i],
+                                  equilibrium_pressure([fo, wad], [1., -1.], T, 10.e9))
+            self.assertFloatEqual(pressures[1, i],
+                                  equilibrium_pressure([wad, rw], [1., -1.], T, 10.e9))
+
+    def test_phase_boundary(self):
+        fo = burnman.minerals.HP_2011_ds62.fo()
+        fo2 = burnman.minerals.HP_2011_ds62.fo()
+        # the volume change of the reaction changes sign at high pressure,
+        # so that the boundary turns back to lower temperatures
+        fo2.params['H_0'] = fo.params['H_0'] + 2.e3
+        fo2.params['S_0'] = fo.params['S_0'] + 2.
+        fo2.params['V_0'] = fo.params['V_0'] * 1.01
+        fo2.params['K_0'] = fo.params['K_0'] * 0.8
+
+        pressures, temperatures = phase_boundary([fo, fo2], [1., -1.],
+                                                 temperature_range=[1000., 2000.])
+        self.assertFloatEqual(temperatures[0], 1000.)
+        self.assertFloatEqual(temperatures[-1], 1000.)
+        self.assertTrue(pressures[-1] > 10.e9)
+        self.assertTrue(max(temperatures) > 1500.)
+        self.assertArraysAlmostEqual(temperatures,
+                                     equilibrium_temperature([fo, fo2], [1., -1.], pressures))
+
     def test_hugoniot(self):
         fo = burnman.minerals.HP_2011_ds62.fo()
         T_ref = 298.15
@@ -50,6 +83,31 @@ class test_tools(BurnManTest):
 
         self.assertArraysAlmostEqual(temperatures, np.array([T_ref]))
 
+    def test_hugoniot_reference_states(self):
+        per = burnman.minerals.SLB_2011.periclase()
+        pressures = np.linspace(1.e5, 50.e9, 11)
+        T_refs = np.array([298.15, 1000.])
+        porosities = np.array([[0.], [0.05]])
+        temperatures, volumes = hugoniot(per, 1.e5, T_refs, pressures,
+                                         porosity=porosities)
+        self.assertEqual(temperatures.shape, (2, 2, 11))
+        for i, phi in enumerate(porosities[:, 0]):
+            for j, T_ref in enumerate(T_refs):
+                T, V = hugoniot(per, 1.e5, T_ref, pressures, porosity=phi)
+                self.assertArraysAlmostEqual(T, temperatures[i, j])
+                self.assertArraysAlmostEqual(V, volumes[i, j])
+
+                # the Rankine-Hugoniot energy balance is satisfied
+                per.set_state(1.e5, T_ref)
+                U_ref = per.internal_energy
+                V_ref = per.V / (1. - phi)
+                per.set_state(pressures[-1], T[-1])
+                self.assertFloatEqual(per.internal_energy - U_ref,
+                                      0.5 * (pressures[-1] - 1.e5) * (V_ref - per.V))
+
+        # porous samples are heated more by the shock
+        self.assertTrue(np.all(temperatures[1, :, 1:] > temperatures[0, :, 1:]))
+
     def test_fraction_conversion_mass(self):
         pv = burnman.minerals.HP_2011_ds62.mpv()
         en = burnman.minerals.HP_2011_ds62.en()
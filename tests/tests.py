@@ -14,17 +14,20 @@ from test_eos import *
 from test_eos_consistency import *
 from test_fitting import *
 from test_geotherm import *
+from test_gibbs_minimization import *
 from test_helper_rock_switcher import *
 from test_material import *
 from test_minerals import *
 from test_model import *
 from test_modifiers import *
+from test_parallel import *
 from test_partitioning import *
 from test_perplex import *
 from test_planet import *
 from test_seismic import *
 from test_solidsolution import *
 from test_spin import *
+from test_tabulated import *
 from test_tools import *
 
 import os